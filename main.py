@@ -1,9 +1,9 @@
 import argparse
 import logging
+import os
 import sys
 import signal
-from src.application import Application
-from src.utils.logging_config import setup_logging
+from src.utils.startup_profiler import StartupProfiler
 
 def parse_args():
     """解析命令行参数"""
@@ -32,7 +32,8 @@ def parse_args():
 
 def signal_handler(sig, frame):
     """处理Ctrl+C信号"""
-    logger.info("接收到中断信号，正在关闭...")
+    from src.application import Application
+    logging.getLogger("Main").info("接收到中断信号，正在关闭...")
     app = Application.get_instance()
     app.shutdown()
     sys.exit(0)
@@ -46,9 +47,18 @@ def main():
                       help='通信协议：websocket 或 mqtt')
     parser.add_argument('--debug', action='store_true',
                       help='启用调试模式')
+    parser.add_argument('--startup-report', action='store_true',
+                      help='输出启动耗时报告（模块导入耗时和启动阶段）')
     
     # 解析命令行参数
     args = parser.parse_args()
+
+    # 启动耗时分析需要在导入应用模块之前开启
+    if args.startup_report or os.environ.get('XIAOZHI_STARTUP_REPORT') == '1':
+        StartupProfiler.get_instance().enable()
+
+    # 应用模块在解析参数后再导入，--help 等不必加载全部依赖
+    from src.application import Application
     
     # 配置日志
     logging_level = logging.DEBUG if args.debug else logging.INFO
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+应用程序索引性能测试
+
+生成一个模拟的 .desktop 目录树（也可以用 --real 测试本机的目录），统计:
+    首次构建        没有索引文件时扫描全部目录
+    无变化刷新      目录都没有修改时的增量刷新
+    单目录变化刷新  一个目录新增程序后的增量刷新
+    加载索引        启动时读取索引文件
+    查询            精确查询、模糊查询和缓存命中的平均耗时
+    旧实现          每次查询 os.walk 全部目录并对每个名称计算相似度
+
+    python scripts/app_index_benchmark.py
+    python scripts/app_index_benchmark.py --apps 5000 --dirs 100
+    python scripts/app_index_benchmark.py --real
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.app_index import AppIndex, default_roots, get_name_similarity  # noqa: E402
+
+_WORDS = ["Office", "Studio", "Player", "Browser", "Editor", "Manager", "Viewer", "Music",
+          "Video", "Photo", "Cloud", "Terminal", "音乐", "视频", "浏览器", "编辑器", "助手",
+          "网盘", "输入法", "管理器", "播放器", "阅读器"]
+
+
+def _make_tree(base: str, apps: int, dirs: int) -> list:
+    """生成 apps 个 .desktop 文件，分布在 dirs 个子目录中，返回程序名称"""
+    rng = random.Random(0)
+    names = []
+    for i in range(apps):
+        name = f"{rng.choice(_WORDS)}{rng.choice(_WORDS)} {i}"
+        names.append(name)
+        directory = os.path.join(base, f"group{i % dirs}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"app{i}.desktop"), "w", encoding="utf-8") as f:
+            f.write(f"[Desktop Entry]\nType=Application\nName={name}\nExec=app{i} %U\n")
+    return names
+
+
+def _legacy_search(roots, app_name, min_score=60):
+    """旧实现：每次查询遍历全部目录并计算相似度"""
+    best = None
+    for root, _, recursive in roots:
+        for directory, _, files in os.walk(root):
+            for file in files:
+                score = get_name_similarity(app_name, os.path.splitext(file)[0])
+                if score >= min_score and (best is None or score > best[0]):
+                    best = (score, file)
+            if not recursive:
+                break
+    return best
+
+
+def _timed(func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def _query_time(index, query, repeat, cached):
+    def run():
+        if not cached:
+            index._query_cache.clear()
+        return index.search(query)
+    index.search(query)
+    return _timed(run, repeat)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="应用程序索引性能测试")
+    parser.add_argument("--apps", type=int, default=2000, help="模拟的程序数量")
+    parser.add_argument("--dirs", type=int, default=50, help="程序分布的子目录数量")
+    parser.add_argument("--repeat", type=int, default=200, help="每个查询重复次数")
+    parser.add_argument("--real", action="store_true", help="使用本机的开始菜单/.desktop 目录和 PATH")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index_path = os.path.join(tmp_dir, "app_index.json")
+        if args.real:
+            roots = default_roots()
+            queries = ["python", "终端", "浏览器", "pyhton3", "text editor"]
+        else:
+            tree = os.path.join(tmp_dir, "applications")
+            names = _make_tree(tree, args.apps, args.dirs)
+            roots = [(tree, "desktop_file", True)]
+            queries = [names[0], names[len(names) // 2], "音乐播放器", "Photo Viewr", "网盘助手"]
+
+        index = AppIndex(path=index_path, roots=roots, scan_registry=False)
+        build, _ = _timed(index.refresh)
+        print(f"索引名称数:     {len(index)}  ({index.last_refresh['dirs']} 个目录)")
+        print(f"首次构建:       {build * 1000:8.2f} ms")
+
+        unchanged, _ = _timed(index.refresh, 10)
+        print(f"无变化刷新:     {unchanged * 1000:8.2f} ms")
+
+        if not args.real:
+            directory = os.path.join(tree, "group0")
+            with open(os.path.join(directory, "new.desktop"), "w", encoding="utf-8") as f:
+                f.write("[Desktop Entry]\nType=Application\nName=New App\nExec=new\n")
+            future = time.time() + 10
+            os.utime(directory, (future, future))
+            one_change, rescanned = _timed(index.refresh)
+            print(f"单目录变化刷新: {one_change * 1000:8.2f} ms  (重新扫描 {rescanned} 个目录)")
+
+        loaded = AppIndex(path=index_path, roots=roots, scan_registry=False)
+        load, _ = _timed(loaded.load)
+        print(f"加载索引:       {load * 1000:8.2f} ms")
+
+        print("\n查询                      索引(无缓存)      缓存命中      旧实现")
+        for query in queries:
+            uncached = _query_time(index, query, args.repeat, cached=False)
+            cached = _query_time(index, query, args.repeat, cached=True)
+            legacy, _ = _timed(lambda: _legacy_search(roots, query))
+            print(f"{query[:24]:<24}  {uncached * 1e6:10.1f} µs  {cached * 1e6:8.1f} µs  "
+                  f"{legacy * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
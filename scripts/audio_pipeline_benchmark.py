@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+音频编解码管线吞吐量测试
+
+使用文件音频后端驱动 AudioCodec，无需声卡即可在任意 Linux 机器上运行：
+    python scripts/audio_pipeline_benchmark.py --input 录音.wav --output 回放.wav
+不指定 --input 时使用静音输入，--seconds 控制测试时长。
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.system_info import setup_opus  # noqa: E402
+
+setup_opus()
+
+from src.audio_codecs.audio_backend import FileAudioBackend  # noqa: E402
+from src.audio_codecs.audio_codec import AudioCodec  # noqa: E402
+from src.constants.constants import AudioConfig  # noqa: E402
+
+
+def run_benchmark(input_path=None, output_path=None, seconds=30.0,
+                  realtime=False):
+    """编码输入音频，再把编码结果解码播放，统计各阶段耗时"""
+    backend = FileAudioBackend(
+        input_path=input_path,
+        output_path=output_path,
+        realtime=realtime
+    )
+    codec = AudioCodec(backend=backend)
+    input_stream = codec.input_stream
+    max_frames = int(seconds * 1000 / AudioConfig.FRAME_DURATION)
+
+    # 1. 编码
+    packets = []
+    encode_start = time.perf_counter()
+    while len(packets) < max_frames and not input_stream.at_eof():
+        packet = codec.read_audio()
+        if packet:
+            packets.append(packet)
+    encode_time = time.perf_counter() - encode_start
+
+    # 2. 解码并写入输出设备
+    # 编码端为16kHz，解码端按输出采样率还原，这里只关注吞吐量
+    decode_start = time.perf_counter()
+    for packet in packets:
+        codec.write_audio(packet)
+        if codec.audio_decode_queue.qsize() >= 10:
+            codec.play_audio()
+    while codec.has_pending_audio():
+        codec.play_audio()
+    decode_time = time.perf_counter() - decode_start
+
+    codec.close()
+
+    audio_seconds = len(packets) * AudioConfig.FRAME_DURATION / 1000
+    encoded_bytes = sum(len(p) for p in packets)
+    print("\n===== 音频管线吞吐量 =====")
+    print(f"帧长: {AudioConfig.FRAME_DURATION}ms, 帧数: {len(packets)}, "
+          f"音频时长: {audio_seconds:.2f}s")
+    print(f"编码后大小: {encoded_bytes} 字节 "
+          f"({encoded_bytes * 8 / max(audio_seconds, 1e-9) / 1000:.1f} kbps)")
+    for name, elapsed in (("编码", encode_time), ("解码+播放", decode_time)):
+        speed = audio_seconds / elapsed if elapsed > 0 else float("inf")
+        per_frame = elapsed * 1e6 / max(len(packets), 1)
+        print(f"{name}: {elapsed:.3f}s, {per_frame:.1f}us/帧, {speed:.1f}x 实时")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="音频编解码管线吞吐量测试")
+    parser.add_argument("--input", help="输入WAV或s16le裸PCM文件，默认静音")
+    parser.add_argument("--output", help="解码结果输出文件，默认丢弃")
+    parser.add_argument("--seconds", type=float, default=30.0,
+                        help="最多处理的音频时长（秒）")
+    parser.add_argument("--realtime", action="store_true",
+                        help="按实时速度读写，而不是尽可能快")
+    args = parser.parse_args()
+    run_benchmark(args.input, args.output, args.seconds, args.realtime)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+音乐解码器对比测试
+
+分别用进程内解码（PyAV）和 ffmpeg 子进程解码同一个 MP3 文件，统计:
+    首个采样延迟    从创建解码器到拿到第一块 PCM 的时间
+    每分钟音频CPU   解码一分钟音频消耗的 CPU 时间（ffmpeg 包含子进程）
+
+    python scripts/music_decoder_benchmark.py 歌曲.mp3
+    python scripts/music_decoder_benchmark.py --generate 60   # 生成测试用的 MP3
+--pipe 模拟边下载边播放，数据通过 read() 送入解码器而不是直接读文件。
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio_codecs.music_decoder import DECODERS  # noqa: E402
+from src.constants.constants import AudioConfig  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块，只统计本进程
+    resource = None
+
+
+def cpu_time() -> float:
+    """本进程与已结束子进程的 CPU 时间之和"""
+    total = time.process_time()
+    if resource:
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def generate_mp3(seconds: float) -> str:
+    """用 PyAV 生成一段正弦波 MP3"""
+    import av
+    import numpy as np
+
+    path = os.path.join(tempfile.mkdtemp(), "benchmark.mp3")
+    rate = 44100
+    with av.open(path, "w") as container:
+        stream = container.add_stream("mp3", rate=rate)
+        stream.layout = "stereo"
+        frame_samples = 1152
+        t = np.arange(int(seconds * rate)) / rate
+        wave = (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16)
+        for start in range(0, len(wave), frame_samples):
+            chunk = wave[start:start + frame_samples]
+            samples = np.repeat(chunk, 2).reshape(1, -1)
+            frame = av.AudioFrame.from_ndarray(samples, format="s16", layout="stereo")
+            frame.rate = rate
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return path
+
+
+def run_decoder(name: str, path: str, pipe: bool):
+    decoder_cls = DECODERS[name]
+    if pipe:
+        with open(path, "rb") as f:
+            source = io.BytesIO(f.read())
+    else:
+        source = path
+    read_size = AudioConfig.OUTPUT_FRAME_SIZE * AudioConfig.CHANNELS * 2
+
+    cpu_start = cpu_time()
+    start = time.perf_counter()
+    decoder = decoder_cls(source, AudioConfig.OUTPUT_SAMPLE_RATE, AudioConfig.CHANNELS)
+    first_sample = None
+    total_bytes = 0
+    for chunk in decoder.chunks(read_size):
+        if first_sample is None:
+            first_sample = time.perf_counter() - start
+        total_bytes += len(chunk)
+    elapsed = time.perf_counter() - start
+    cpu = cpu_time() - cpu_start
+    decoder.close()
+
+    audio_seconds = total_bytes / (AudioConfig.OUTPUT_SAMPLE_RATE * AudioConfig.CHANNELS * 2)
+    minutes = max(audio_seconds / 60, 1e-9)
+    print(f"{name}: 首个采样 {first_sample * 1000:.1f}ms, 总耗时 {elapsed:.3f}s, "
+          f"音频 {audio_seconds:.1f}s, CPU {cpu / minutes:.3f}s/分钟音频, "
+          f"完整: {decoder.completed}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="音乐解码器对比测试")
+    parser.add_argument("path", nargs="?", help="MP3 文件")
+    parser.add_argument("--generate", type=float, metavar="SECONDS",
+                        help="没有 MP3 文件时生成指定时长的测试音频（需要 PyAV）")
+    parser.add_argument("--pipe", action="store_true",
+                        help="通过 read() 送入数据，模拟边下载边解码")
+    parser.add_argument("--decoders", default="pyav,ffmpeg",
+                        help="要测试的解码器，逗号分隔")
+    args = parser.parse_args()
+
+    path = args.path or (generate_mp3(args.generate) if args.generate else None)
+    if not path:
+        parser.error("需要指定 MP3 文件或 --generate")
+
+    print(f"\n===== 音乐解码器对比: {os.path.basename(path)} =====")
+    for name in args.decoders.split(","):
+        try:
+            run_decoder(name.strip(), path, args.pipe)
+        except (ImportError, OSError) as e:
+            print(f"{name}: 不可用 ({e})")
+
+
+if __name__ == "__main__":
+    main()
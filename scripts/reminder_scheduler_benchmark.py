@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提醒调度器压力测试
+
+在一个调度器中挂起大量提醒，统计:
+    插入耗时        加入 N 个提醒的平均耗时
+    取消耗时        取消其中一半的平均耗时
+    触发延迟        一批提醒实际触发时间与到期时间的偏差
+    线程数          挂起全部提醒时进程中的线程数
+
+    python scripts/reminder_scheduler_benchmark.py
+    python scripts/reminder_scheduler_benchmark.py --count 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.reminder_scheduler import ReminderScheduler  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="提醒调度器压力测试")
+    parser.add_argument("--count", type=int, default=10000, help="挂起的提醒数量")
+    parser.add_argument("--fire", type=int, default=1000,
+                        help="其中在测试期间到期触发的提醒数量")
+    parser.add_argument("--window", type=float, default=1.0,
+                        help="触发的提醒分布在多少秒内")
+    args = parser.parse_args()
+
+    scheduler = ReminderScheduler()
+    lateness = []
+    done = threading.Event()
+
+    def make_callback(due):
+        def callback():
+            lateness.append(time.monotonic() - due)
+            if len(lateness) == args.fire:
+                done.set()
+        return callback
+
+    # 大部分提醒在很久之后才到期，只在堆中占位
+    start = time.perf_counter()
+    handles = []
+    for _ in range(args.count - args.fire):
+        handles.append(scheduler.schedule(3600 + random.random() * 3600, lambda: None))
+    base = time.monotonic() + 0.2
+    for _ in range(args.fire):
+        delay = 0.2 + random.random() * args.window
+        scheduler.schedule(delay, make_callback(base - 0.2 + delay))
+    insert_time = time.perf_counter() - start
+
+    threads = threading.active_count()
+
+    random.shuffle(handles)
+    cancel_handles = handles[:len(handles) // 2]
+    start = time.perf_counter()
+    for handle in cancel_handles:
+        scheduler.cancel(handle)
+    cancel_time = time.perf_counter() - start
+
+    done.wait(args.window + 5)
+    scheduler.close()
+
+    print(f"\n===== 提醒调度器: {args.count} 个提醒 =====")
+    print(f"插入: 平均 {insert_time / args.count * 1e6:.1f}us")
+    print(f"取消: {len(cancel_handles)} 个, 平均 {cancel_time / max(1, len(cancel_handles)) * 1e6:.1f}us")
+    print(f"线程数: {threads}（主线程 + 1 个调度线程）")
+    if lateness:
+        lateness.sort()
+        p99 = lateness[int(len(lateness) * 0.99) - 1]
+        print(f"触发: {len(lateness)}/{args.fire}, 延迟中位数 {statistics.median(lateness) * 1000:.2f}ms, "
+              f"P99 {p99 * 1000:.2f}ms, 最大 {lateness[-1] * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
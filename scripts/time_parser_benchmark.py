@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提醒时间解析吞吐测试
+
+对一组典型提醒命令反复调用 parse_reminder()，统计每秒可解析的命令数，
+并与旧版做法（多个 re.search 依次尝试、循环去前缀、再单独解析时长）对比。
+旧版只支持相对时间，对比只使用相对时间命令。
+
+    python scripts/time_parser_benchmark.py
+    python scripts/time_parser_benchmark.py --rounds 20000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.time_parser import parse_reminder  # noqa: E402
+
+RELATIVE = [
+    "3分钟后提醒我起床",
+    "提醒我1小时30分钟后喝水",
+    "10s后提醒我看邮件",
+    "5 min后记得拿快递",
+    "10 提醒我起床",
+]
+
+ABSOLUTE = [
+    "明天早上8点提醒我开会",
+    "提醒我明晚8点半看球赛",
+    "下周三下午3点三刻提醒我交报告",
+    "每天8点提醒我吃药",
+    "每隔30分钟提醒我站起来",
+]
+
+
+def legacy_parse(query: str):
+    """旧版 process_reminder_command + _parse_time_string 的解析过程"""
+    time_match = re.search(
+        r'(\d+)\s*(?:秒钟|秒|分钟|分|小时|小时|s|sec|second|seconds|m|min|minute|minutes|h|hour|hours)后?',
+        query, re.IGNORECASE
+    )
+    if time_match:
+        time_str = query[:time_match.end()]
+        if time_str.endswith("后"):
+            time_str = time_str[:-1]
+        content = query[time_match.end():].strip()
+        for prefix in ["提醒我", "提醒", "记得", "告诉我", "通知我"]:
+            if content.startswith(prefix):
+                content = content[len(prefix):].strip()
+    else:
+        match = re.search(r'提醒我(?:在|过)?(?:\s*)(.+?)(?:时|分|点|秒钟|秒|分钟|分|小时|后)?(?:\s*)(.+)', query)
+        if match:
+            time_str, content = match.group(1).strip(), match.group(2).strip()
+        else:
+            match = re.search(r'^(\d+)\s+(.+)', query)
+            if not match:
+                return None
+            time_str, content = match.group(1) + "秒", match.group(2).strip()
+
+    time_str = time_str.replace(" ", "").replace("后", "").lower()
+    total = 0
+    for pattern, multiplier in ((r'(\d+)(?:小时|h|hour|hours)', 3600),
+                                (r'(\d+)(?:分钟|分|min|minute|minutes|m)', 60),
+                                (r'(\d+)(?:秒钟|秒|s|sec|second|seconds)', 1)):
+        for value in re.findall(pattern, time_str, re.IGNORECASE):
+            total += int(value) * multiplier
+    if total == 0:
+        digits = re.sub(r'\D', '', time_str)
+        total = int(digits) if digits else 0
+    return total, content
+
+
+def run(name: str, parse, queries, rounds: int):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            parse(query)
+    elapsed = time.perf_counter() - start
+    count = rounds * len(queries)
+    print(f"{name}: {count / elapsed:,.0f} 条/秒, 平均 {elapsed / count * 1e6:.2f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="提醒时间解析吞吐测试")
+    parser.add_argument("--rounds", type=int, default=5000, help="每组命令重复次数")
+    args = parser.parse_args()
+
+    print(f"\n===== 提醒时间解析: {args.rounds} 轮 =====")
+    run("旧版 (相对时间)", legacy_parse, RELATIVE, args.rounds)
+    run("parse_reminder (相对时间)", parse_reminder, RELATIVE, args.rounds)
+    run("parse_reminder (绝对/重复)", parse_reminder, ABSOLUTE, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,14 +10,12 @@ from typing import Dict, Any
 
 # 在导入 opuslib 之前处理 opus 动态库
 from src.utils.system_info import setup_opus
-from src.utils.tts_utility import TtsUtility
-from src.utils.system_commands import SystemCommands
 from src.constants.constants import (
     DeviceState, EventType, AudioConfig, 
     AbortReason, ListeningMode
 )
-from src.display import gui_display, cli_display
 from src.utils.config_manager import ConfigManager
+from src.utils.startup_profiler import StartupProfiler
 
 setup_opus()
 
@@ -29,9 +27,6 @@ except Exception as e:
     print("请确保 opus 动态库已正确安装或位于正确的位置")
     sys.exit(1)
 
-from src.protocols.mqtt_protocol import MqttProtocol
-from src.protocols.websocket_protocol import WebsocketProtocol
-
 # 配置日志
 logger = logging.getLogger("Application")
 
@@ -56,8 +51,8 @@ class Application:
         # 获取配置管理器实例
         self.config = ConfigManager.get_instance()
 
-        # 添加系统命令工具
-        self.system_commands = SystemCommands()
+        # 系统命令工具，首次使用时创建
+        self._system_commands = None
 
         # 状态变量
         self.device_state = DeviceState.IDLE
@@ -101,6 +96,19 @@ class Application:
         # 添加唤醒词检测器
         self.wake_word_detector = None
 
+        # 物联网状态更新：待检查的设备名（None 表示全部）
+        self._iot_states_lock = threading.Lock()
+        self._dirty_things = set()
+        self._iot_states_flush_pending = False
+
+    @property
+    def system_commands(self):
+        """系统命令工具（延迟导入，其依赖的平台模块较重）"""
+        if self._system_commands is None:
+            from src.utils.system_commands import SystemCommands
+            self._system_commands = SystemCommands()
+        return self._system_commands
+
     def run(self, **kwargs):
         """启动应用程序"""
         print(kwargs)
@@ -113,50 +121,86 @@ class Application:
             logging.getLogger().setLevel(logging.DEBUG)
             logger.info("已启用调试模式")
 
+        profiler = StartupProfiler.get_instance()
+        profiler.mark("Application.run")
+
+        # 硬件探测和OTA请求在后台并行进行
+        AudioConfig.start_probe()
+        self.config.refresh_mqtt_info_async()
+
         # 启动主循环线程
         main_loop_thread = threading.Thread(target=self._main_loop)
         main_loop_thread.daemon = True
         main_loop_thread.start()
 
-        # 初始化并启动唤醒词检测
-        self._initialize_wake_word_detector()
+        # 按依赖图并行初始化，音频和唤醒词就绪后即可响应，不等待可选设备
+        self.init_graph = self._build_init_graph(protocol, mode)
+        self.init_graph.on_complete(self._on_startup_complete)
+        self.init_graph.start()
 
-        # 初始化通信协议
-        self.set_protocol_type(protocol)
+        # GUI 必须在主线程创建
+        self.init_graph.run_inline("display")
+        profiler.mark("显示界面已创建")
+        # 启动GUI
+        self.display.start()
 
-        # 创建并启动事件循环线程
+    def _build_init_graph(self, protocol: str, mode: str):
+        """声明启动初始化步骤及其依赖关系"""
+        from src.utils.init_graph import InitGraph
+
+        graph = InitGraph("startup")
+        graph.add_step("event_loop", self._start_event_loop)
+        graph.add_step("protocol", lambda: self.set_protocol_type(protocol))
+        graph.add_step(
+            "protocol_callbacks",
+            self._initialize_protocol_callbacks,
+            deps=("event_loop", "protocol")
+        )
+        graph.add_step("audio", self._initialize_audio)
+        graph.add_step("wake_word_model", self._initialize_wake_word_detector)
+        graph.add_step(
+            "wake_word_start",
+            self._start_wake_word_detection,
+            deps=("audio", "wake_word_model")
+        )
+        graph.add_step("iot_devices", self._initialize_iot_devices, optional=True)
+        graph.add_step("app_index", self._initialize_app_index, optional=True)
+        graph.add_step(
+            "display",
+            lambda: self.set_display_type(mode),
+            inline=True
+        )
+        return graph
+
+    def _on_startup_complete(self, graph):
+        """所有初始化步骤结束后输出启动报告"""
+        profiler = StartupProfiler.get_instance()
+        profiler.mark("初始化完成")
+        profiler.report()
+        profiler.disable()
+
+    def _start_event_loop(self):
+        """创建并启动事件循环线程，等待事件循环真正开始运行"""
+        ready = threading.Event()
+        self.loop.call_soon_threadsafe(ready.set)
         self.loop_thread = threading.Thread(target=self._run_event_loop)
         self.loop_thread.daemon = True
         self.loop_thread.start()
-
-        # 等待事件循环准备就绪
-        time.sleep(0.1)
-
-        # 初始化应用程序（移除自动连接）
-        asyncio.run_coroutine_threadsafe(self._initialize_without_connect(), self.loop)
-
-        # 初始化物联网设备
-        self._initialize_iot_devices()
-
-        self.set_display_type(mode)
-        # 启动GUI
-        self.display.start()
+        if not ready.wait(5):
+            raise RuntimeError("事件循环启动超时")
 
     def _run_event_loop(self):
         """运行事件循环的线程函数"""
         asyncio.set_event_loop(self.loop)
         self.loop.run_forever()
 
-    async def _initialize_without_connect(self):
-        """初始化应用程序组件（不建立连接）"""
+    def _initialize_protocol_callbacks(self):
+        """设置设备初始状态和联网协议回调（不建立连接）"""
         logger.info("正在初始化应用程序...")
 
         # 设置设备状态为待命
         self.set_device_state(DeviceState.IDLE)
 
-        # 初始化音频编解码器
-        self._initialize_audio()
-        
         # 设置联网协议回调（MQTT AND WEBSOCKET）
         self.protocol.on_network_error = self._on_network_error
         self.protocol.on_incoming_audio = self._on_incoming_audio
@@ -170,19 +214,11 @@ class Application:
         """初始化音频设备和编解码器"""
         try:
             from src.audio_codecs.audio_codec import AudioCodec
+            # 等待后台探测出帧长
+            AudioConfig.resolve()
             self.audio_codec = AudioCodec()
             logger.info("音频编解码器初始化成功")
 
-            # 记录音量控制状态
-            has_volume_control = (
-                hasattr(self.display, 'volume_controller') and
-                self.display.volume_controller
-            )
-            if has_volume_control:
-                logger.info("系统音量控制已启用")
-            else:
-                logger.info("系统音量控制未启用，将使用模拟音量控制")
-
         except Exception as e:
             logger.error(f"初始化音频设备失败: {e}")
             self.alert("错误", f"初始化音频设备失败: {e}")
@@ -190,14 +226,17 @@ class Application:
     def set_protocol_type(self, protocol_type: str):
         """设置协议类型"""
         if protocol_type == 'mqtt':
+            from src.protocols.mqtt_protocol import MqttProtocol
             self.protocol = MqttProtocol(self.loop)
         else:  # websocket
+            from src.protocols.websocket_protocol import WebsocketProtocol
             self.protocol = WebsocketProtocol()
 
     def set_display_type(self, mode: str):
         """初始化显示界面"""
         # 通过适配器的概念管理不同的显示模式
         if mode == 'gui':
+            from src.display import gui_display
             self.display = gui_display.GuiDisplay()
             self.display.set_callbacks(
                 press_callback=self.start_listening,
@@ -212,6 +251,7 @@ class Application:
                 )
             )
         else:
+            from src.display import cli_display
             self.display = cli_display.CliDisplay()
             self.display.set_callbacks(
                 auto_callback=self.toggle_chat_state,
@@ -280,6 +320,7 @@ class Application:
     async def _send_text_tts(self, text):
         """将文本转换为语音并发送"""
         try:
+            from src.utils.tts_utility import TtsUtility
             tts_utility = TtsUtility(AudioConfig)
 
             # 生成 Opus 音频数据包
@@ -330,6 +371,7 @@ class Application:
             text: 要播放的文本内容
         """
         try:
+            from src.utils.tts_utility import TtsUtility
             tts_utility = TtsUtility(AudioConfig)
             
             # 生成 Opus 音频数据包
@@ -497,8 +539,8 @@ class Application:
                 wait_interval = 0.1  # 每次等待的时间间隔
                 attempts = 0
 
-                # 等待直到队列为空或超过最大尝试次数
-                while (not self.audio_codec.audio_decode_queue.empty() and 
+                # 等待直到队列和混音器TTS总线都为空或超过最大尝试次数
+                while (self.audio_codec.has_pending_audio() and 
                        attempts < max_wait_attempts):
                     time.sleep(wait_interval)
                     attempts += 1
@@ -542,13 +584,30 @@ class Application:
         logger.info("音频通道已打开")
         self.schedule(lambda: self._start_audio_streams())
 
-        # 发送物联网设备描述符
+        # 发送物联网设备描述符，设备仍在初始化时等其完成后再发送
+        self._when_iot_ready(self._send_iot_descriptors)
+
+    def _when_iot_ready(self, callback):
+        """物联网设备初始化完成后执行回调，不阻塞调用方"""
+        graph = getattr(self, 'init_graph', None)
+        if graph is None:
+            callback()
+            return
+        graph.future("iot_devices").add_done_callback(
+            lambda future: callback() if not future.exception() else None
+        )
+
+    def _send_iot_descriptors(self):
+        """发送物联网设备描述符"""
         from src.iot.thing_manager import ThingManager
         thing_manager = ThingManager.get_instance()
         asyncio.run_coroutine_threadsafe(
             self.protocol.send_iot_descriptors(thing_manager.get_descriptors_json()),
             self.loop
         )
+        # 新的会话需要完整状态，之后只发送变化的属性
+        thing_manager.reset_states()
+        self._update_iot_states()
 
     def _start_audio_streams(self):
         """启动音频流"""
@@ -664,10 +723,12 @@ class Application:
 
         self.device_state = state
 
-        # 根据状态执行相应操作
+        # 根据状态执行相应操作（显示界面可能尚未创建）
+        display = self.display
         if state == DeviceState.IDLE:
-            self.display.update_status("待命")
-            self.display.update_emotion("😶")
+            if display:
+                display.update_status("待命")
+                display.update_emotion("😶")
             # 恢复唤醒词检测（添加安全检查）
             if self.wake_word_detector and hasattr(self.wake_word_detector, 'paused') and self.wake_word_detector.paused:
                 self.wake_word_detector.resume()
@@ -676,10 +737,12 @@ class Application:
             if self.audio_codec and self.audio_codec.is_input_paused():
                 self.audio_codec.resume_input()
         elif state == DeviceState.CONNECTING:
-            self.display.update_status("连接中...")
+            if display:
+                display.update_status("连接中...")
         elif state == DeviceState.LISTENING:
-            self.display.update_status("聆听中...")
-            self.display.update_emotion("🙂")
+            if display:
+                display.update_status("聆听中...")
+                display.update_emotion("🙂")
             # 暂停唤醒词检测（添加安全检查）
             if self.wake_word_detector and hasattr(self.wake_word_detector, 'is_running') and self.wake_word_detector.is_running():
                 self.wake_word_detector.pause()
@@ -689,7 +752,8 @@ class Application:
                 if self.audio_codec.is_input_paused():
                     self.audio_codec.resume_input()
         elif state == DeviceState.SPEAKING:
-            self.display.update_status("说话中...")
+            if display:
+                display.update_status("说话中...")
             # 暂停唤醒词检测（添加安全检查）
             if self.wake_word_detector and hasattr(self.wake_word_detector, 'is_running') and self.wake_word_detector.is_running():
                 self.wake_word_detector.pause()
@@ -1010,6 +1074,10 @@ class Application:
         if self.wake_word_detector:
             self.wake_word_detector.stop()
 
+        # 取消尚未执行的物联网命令
+        from src.iot.thing_manager import ThingManager
+        ThingManager.get_instance().shutdown()
+
         # 关闭VAD检测器
         # if hasattr(self, 'vad_detector') and self.vad_detector:
         #     self.vad_detector.stop()
@@ -1127,19 +1195,6 @@ class Application:
 
             self.wake_word_detector.on_error = on_error
 
-            # 确保音频编解码器已初始化
-            if hasattr(self, 'audio_codec') and self.audio_codec:
-                shared_stream = self.audio_codec.get_shared_input_stream()
-                if shared_stream:
-                    logger.info("使用共享的音频输入流启动唤醒词检测器")
-                    self.wake_word_detector.start(shared_stream)
-                else:
-                    logger.warning("无法获取共享输入流，唤醒词检测器将使用独立音频流")
-                    self.wake_word_detector.start()
-            else:
-                logger.warning("音频编解码器尚未初始化，唤醒词检测器将使用独立音频流")
-                self.wake_word_detector.start()
-
         except Exception as e:
             logger.error(f"初始化唤醒词检测器失败: {e}")
             import traceback
@@ -1150,6 +1205,25 @@ class Application:
             logger.info("由于初始化失败，唤醒词功能已禁用，但程序将继续运行")
             self.wake_word_detector = None
 
+    def _start_wake_word_detection(self):
+        """音频就绪后启动唤醒词检测"""
+        if not self.wake_word_detector:
+            return
+
+        # 确保音频编解码器已初始化
+        if self.audio_codec:
+            shared_stream = self.audio_codec.get_shared_input_stream()
+            if shared_stream:
+                logger.info("使用共享的音频输入流启动唤醒词检测器")
+                self.wake_word_detector.start(shared_stream)
+            else:
+                logger.warning("无法获取共享输入流，唤醒词检测器将使用独立音频流")
+                self.wake_word_detector.start()
+        else:
+            logger.warning("音频编解码器初始化失败，唤醒词检测器将使用独立音频流")
+            self.wake_word_detector.start()
+        StartupProfiler.get_instance().mark("唤醒词检测已就绪")
+
     def _on_wake_word_detected(self, wake_word, full_text):
         """唤醒词检测回调"""
         logger.info(f"检测到唤醒词: {wake_word} (完整文本: {full_text})")
@@ -1231,28 +1305,54 @@ class Application:
         except Exception as e:
             logger.error(f"重新启动唤醒词检测器失败: {e}")
 
+    # 物联网状态更新的合并周期（秒）
+    IOT_STATES_DEBOUNCE = 0.1
+    # 单条物联网命令的超时时间（秒）
+    IOT_INVOKE_TIMEOUT = 30
+
+    # 可用的物联网设备: 配置名 -> (创建设备的 "模块:类名", 是否允许延迟创建)
+    # 只有初始状态固定、不依赖外部环境的设备才能延迟创建
+    IOT_THINGS = {
+        "Lamp": ("src.iot.things.lamp:Lamp", False),
+        "Speaker": ("src.iot.things.speaker:Speaker", False),
+        "MusicPlayer": ("src.iot.things.music_player:MusicPlayer", True),
+        "Camera": ("src.iot.things.CameraVL.Camera:Camera", True),
+        "QueryBridgeRAG": ("src.iot.things.query_bridge_rag:QueryBridgeRAG", False),
+        "SystemManager": ("src.iot.things.system_manager:SystemManager", True),
+        "ReminderThing": ("src.iot.things.reminder_manager:ReminderThing", False),
+    }
+
+    def _initialize_app_index(self):
+        """加载应用程序索引并在后台刷新，"打开某某"时不再临时扫描开始菜单"""
+        from src.utils.app_index import AppIndex
+
+        AppIndex.get_instance()
+
     def _initialize_iot_devices(self):
         """初始化物联网设备"""
-        from src.iot.thing_manager import ThingManager
-        from src.iot.things.lamp import Lamp
-        from src.iot.things.speaker import Speaker
-        from src.iot.things.music_player import MusicPlayer
-        from src.iot.things.CameraVL.Camera import Camera
-        from src.iot.things.query_bridge_rag import QueryBridgeRAG
-        from src.iot.things.system_manager import SystemManager
-        from src.iot.things.reminder_manager import ReminderThing
-        
+        from src.iot.thing_manager import ThingManager, resolve_factory
+
         # 获取物联网设备管理器实例
         thing_manager = ThingManager.get_instance()
 
+        enabled = self.config.get_config(
+            "IOT.ENABLED_THINGS", list(self.IOT_THINGS)
+        )
+        lazy_load = self.config.get_config("IOT.LAZY_LOAD", True)
+
         # 添加设备
-        thing_manager.add_thing(Lamp())
-        thing_manager.add_thing(Speaker())
-        thing_manager.add_thing(MusicPlayer())
-        thing_manager.add_thing(Camera())
-        thing_manager.add_thing(QueryBridgeRAG())
-        thing_manager.add_thing(SystemManager())
-        thing_manager.add_thing(ReminderThing())  # 添加提醒管理组件
+        for key in enabled:
+            if key not in self.IOT_THINGS:
+                logger.warning(f"未知的物联网设备: {key}")
+                continue
+            factory, lazy = self.IOT_THINGS[key]
+            try:
+                if lazy and lazy_load:
+                    thing_manager.add_lazy_thing(factory)
+                else:
+                    thing_manager.add_thing(resolve_factory(factory)())
+            except Exception as e:
+                logger.error(f"初始化物联网设备 {key} 失败: {e}")
         logger.info("物联网设备初始化完成")
 
     def _handle_iot_message(self, data):
@@ -1263,28 +1363,72 @@ class Application:
         commands = data.get("commands", [])
         print(commands)
         for command in commands:
-            try:
-                result = thing_manager.invoke(command)
-                logger.info(f"执行物联网命令结果: {result}")
+            # 在设备各自的执行通道中运行，不阻塞事件循环
+            future = thing_manager.invoke_async(
+                command, timeout=self.IOT_INVOKE_TIMEOUT
+            )
+            future.add_done_callback(
+                lambda f, name=command.get("name"): self._on_iot_command_done(name, f)
+            )
 
-                # 命令执行后更新设备状态
-                self.schedule(lambda: self._update_iot_states())
-            except Exception as e:
-                logger.error(f"执行物联网命令失败: {e}")
+    def _on_iot_command_done(self, thing_name, future):
+        """物联网命令执行结束回调（在执行线程中调用）"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error(f"执行物联网命令失败: {thing_name}: {error}")
+        else:
+            logger.info(f"执行物联网命令结果: {future.result()}")
 
-    def _update_iot_states(self):
-        """更新物联网设备状态"""
+        # 命令执行后更新该设备的状态
+        self._update_iot_states(thing_name)
+
+    def _update_iot_states(self, thing_name=None):
+        """
+        标记设备状态需要更新
+
+        同一周期内的多次更新合并为一条消息，只发送发生变化的属性。
+        thing_name 为空时检查全部设备。
+        """
+        with self._iot_states_lock:
+            if thing_name is None:
+                self._dirty_things = None
+            elif self._dirty_things is not None:
+                self._dirty_things.add(thing_name)
+            if self._iot_states_flush_pending:
+                return
+            self._iot_states_flush_pending = True
+
+        self.loop.call_soon_threadsafe(
+            self.loop.call_later, self.IOT_STATES_DEBOUNCE, self._flush_iot_states
+        )
+
+    def _flush_iot_states(self):
+        """发送本周期内发生变化的设备状态"""
         from src.iot.thing_manager import ThingManager
-        thing_manager = ThingManager.get_instance()
 
-        # 获取当前设备状态
-        states_json = thing_manager.get_states_json()
+        with self._iot_states_lock:
+            names = self._dirty_things
+            self._dirty_things = set()
+            self._iot_states_flush_pending = False
+
+        asyncio.ensure_future(self._send_changed_iot_states(ThingManager.get_instance(), names))
+
+    async def _send_changed_iot_states(self, thing_manager, names):
+        """在线程池中读取设备属性，事件循环不执行设备代码"""
+        try:
+            states_json = await self.loop.run_in_executor(
+                None, thing_manager.get_changed_states_json, names
+            )
+        except Exception as e:
+            logger.error(f"获取物联网设备状态失败: {e}")
+            return
+        if states_json is None:
+            return
 
         # 发送状态更新
-        asyncio.run_coroutine_threadsafe(
-            self.protocol.send_iot_states(states_json),
-            self.loop
-        )
+        await self.protocol.send_iot_states(states_json)
         logger.info("物联网设备状态已更新")
 
     def _update_wake_word_detector_stream(self):
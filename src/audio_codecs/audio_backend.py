@@ -0,0 +1,417 @@
+import logging
+import threading
+import time
+import wave
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger("AudioBackend")
+
+# 16位PCM，每个采样2字节
+SAMPLE_WIDTH = 2
+
+
+class AudioStream(ABC):
+    """音频流接口，与 PyAudio 的 Stream 对象保持相同的调用方式"""
+
+    def __init__(self, rate: int, channels: int):
+        self.rate = rate
+        self.channels = channels
+        self._active = True
+        self._closed = False
+
+    @property
+    def frame_bytes(self) -> int:
+        """每帧（所有声道一个采样）的字节数"""
+        return self.channels * SAMPLE_WIDTH
+
+    def is_active(self) -> bool:
+        return self._active and not self._closed
+
+    def is_stopped(self) -> bool:
+        return not self.is_active()
+
+    def start_stream(self):
+        if self._closed:
+            raise OSError("Stream closed")
+        self._active = True
+
+    def stop_stream(self):
+        self._active = False
+
+    def close(self):
+        self._active = False
+        self._closed = True
+
+    def get_read_available(self) -> int:
+        return 0
+
+    def get_write_available(self) -> int:
+        return 0
+
+    def get_output_latency(self) -> float:
+        return 0.0
+
+    def read(self, num_frames: int, exception_on_overflow: bool = True) -> bytes:
+        raise OSError("Not input stream")
+
+    def write(self, frames: bytes, num_frames: Optional[int] = None,
+              exception_on_underflow: bool = False):
+        raise OSError("Not output stream")
+
+
+class _RealtimeClock:
+    """按采样率节拍控制读写速度，模拟真实声卡的实时节奏"""
+
+    def __init__(self, rate: int):
+        self.rate = rate
+        self.start_time = None
+        self.frames = 0
+
+    def reset(self):
+        self.start_time = None
+        self.frames = 0
+
+    def elapsed_frames(self) -> int:
+        """自开始以来按墙钟时间应当经过的帧数"""
+        if self.start_time is None:
+            self.start_time = time.monotonic()
+        return int((time.monotonic() - self.start_time) * self.rate)
+
+    def pending_frames(self) -> int:
+        """墙钟时间已经走过、但还没有被消费的帧数"""
+        return self.elapsed_frames() - self.frames
+
+    def advance(self, frames: int):
+        """消费指定帧数，必要时阻塞直到墙钟时间追上"""
+        if self.start_time is None:
+            self.start_time = time.monotonic()
+        self.frames += frames
+        delay = self.start_time + self.frames / self.rate - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class FileInputStream(AudioStream):
+    """从 WAV 或裸 PCM(s16le) 文件读取音频的输入流
+
+    path 为 None 时产生静音，可作为无麦克风环境下的占位输入。
+    """
+
+    def __init__(self, path: Optional[str], rate: int, channels: int,
+                 frames_per_buffer: int, realtime: bool = True,
+                 loop: bool = False):
+        super().__init__(rate, channels)
+        self.path = path
+        self.frames_per_buffer = frames_per_buffer
+        self.realtime = realtime
+        self.loop = loop
+        self._clock = _RealtimeClock(rate)
+        self._lock = threading.Lock()
+        self._data = b""
+        self._pos = 0
+        self.frames_read = 0
+        if path:
+            self._data = self._load(Path(path))
+
+    def _load(self, path: Path) -> bytes:
+        """读取整个文件到内存，校验格式与流参数一致"""
+        if path.suffix.lower() == ".wav":
+            with wave.open(str(path), "rb") as wf:
+                if wf.getsampwidth() != SAMPLE_WIDTH:
+                    raise ValueError(f"仅支持16位WAV文件: {path}")
+                if wf.getframerate() != self.rate:
+                    raise ValueError(
+                        f"WAV采样率 {wf.getframerate()} 与输入流采样率 "
+                        f"{self.rate} 不一致: {path}"
+                    )
+                if wf.getnchannels() != self.channels:
+                    raise ValueError(
+                        f"WAV声道数 {wf.getnchannels()} 与输入流声道数 "
+                        f"{self.channels} 不一致: {path}"
+                    )
+                data = wf.readframes(wf.getnframes())
+        else:
+            data = path.read_bytes()
+        # 截断到完整帧
+        return data[:len(data) - len(data) % self.frame_bytes]
+
+    @property
+    def total_frames(self) -> Optional[int]:
+        """文件总帧数，静音源返回 None（无限长）"""
+        if not self.path:
+            return None
+        return len(self._data) // self.frame_bytes
+
+    def _remaining_frames(self) -> Optional[int]:
+        if not self.path or self.loop:
+            return None
+        return (len(self._data) - self._pos) // self.frame_bytes
+
+    def get_read_available(self) -> int:
+        if not self.is_active():
+            return 0
+        remaining = self._remaining_frames()
+        if self.realtime:
+            available = self._clock.pending_frames()
+            if remaining is not None:
+                available = min(available, remaining)
+            return max(0, available)
+        # 非实时模式下始终有一个缓冲区的数据可读
+        if remaining is None:
+            return self.frames_per_buffer
+        return min(self.frames_per_buffer, remaining)
+
+    def read(self, num_frames: int, exception_on_overflow: bool = True) -> bytes:
+        if self._closed:
+            raise OSError("Stream closed")
+        num_frames = int(num_frames)
+        if self.realtime:
+            self._clock.advance(num_frames)
+        with self._lock:
+            chunk = self._take(num_frames * self.frame_bytes)
+            self.frames_read += num_frames
+        return chunk
+
+    def _take(self, size: int) -> bytes:
+        """取出 size 字节，文件结束后补静音或循环回开头"""
+        if not self.path or not self._data:
+            return b"\x00" * size
+        out = bytearray()
+        while len(out) < size:
+            if self._pos >= len(self._data):
+                if not self.loop:
+                    out.extend(b"\x00" * (size - len(out)))
+                    break
+                self._pos = 0
+            end = min(len(self._data), self._pos + size - len(out))
+            out.extend(self._data[self._pos:end])
+            self._pos = end
+        return bytes(out)
+
+    def at_eof(self) -> bool:
+        """文件是否已读完（循环模式和静音源永远不会结束）"""
+        remaining = self._remaining_frames()
+        return remaining is not None and remaining <= 0
+
+    def start_stream(self):
+        if not self._active:
+            # 重新开始计时，避免停止期间的时间被当作可读数据
+            self._clock.reset()
+        super().start_stream()
+
+
+class FileOutputStream(AudioStream):
+    """把音频写入 WAV 或裸 PCM(s16le) 文件的输出流
+
+    path 为 None 时丢弃所有数据（空设备），只统计写入的帧数。
+    """
+
+    def __init__(self, path: Optional[str], rate: int, channels: int,
+                 realtime: bool = True):
+        super().__init__(rate, channels)
+        self.path = path
+        self.realtime = realtime
+        self._clock = _RealtimeClock(rate)
+        self._lock = threading.Lock()
+        self._file = None
+        self._wave = None
+        self.frames_written = 0
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            if Path(path).suffix.lower() == ".wav":
+                self._wave = wave.open(str(path), "wb")
+                self._wave.setnchannels(channels)
+                self._wave.setsampwidth(SAMPLE_WIDTH)
+                self._wave.setframerate(rate)
+            else:
+                self._file = open(path, "wb")
+
+    def get_write_available(self) -> int:
+        return 1 << 30
+
+    def write(self, frames: bytes, num_frames: Optional[int] = None,
+              exception_on_underflow: bool = False):
+        if self._closed:
+            raise OSError("Stream closed")
+        count = len(frames) // self.frame_bytes
+        with self._lock:
+            if self._wave:
+                self._wave.writeframesraw(frames)
+            elif self._file:
+                self._file.write(frames)
+            self.frames_written += count
+        if self.realtime:
+            # 与真实设备一样，写满缓冲后按播放速度阻塞
+            self._clock.advance(count)
+
+    def start_stream(self):
+        if not self._active:
+            self._clock.reset()
+        super().start_stream()
+
+    def close(self):
+        if self._closed:
+            return
+        with self._lock:
+            if self._wave:
+                self._wave.close()
+                self._wave = None
+            if self._file:
+                self._file.close()
+                self._file = None
+        super().close()
+
+
+class AudioBackend(ABC):
+    """音频后端接口，负责打开输入/输出流"""
+
+    name = "base"
+
+    @abstractmethod
+    def open_input(self, rate: int, channels: int, frames_per_buffer: int):
+        """打开16位PCM输入流"""
+
+    @abstractmethod
+    def open_output(self, rate: int, channels: int, frames_per_buffer: int):
+        """打开16位PCM输出流"""
+
+    def terminate(self):
+        """释放后端资源"""
+
+
+class PyAudioBackend(AudioBackend):
+    """基于 PortAudio 的真实声卡后端"""
+
+    name = "pyaudio"
+
+    def __init__(self):
+        import pyaudio
+        self._pyaudio = pyaudio
+        self.audio = pyaudio.PyAudio()
+
+    def get_device_index(self, is_input=True) -> int:
+        """获取默认设备或第一个可用的输入/输出设备"""
+        try:
+            if is_input:
+                default_device = self.audio.get_default_input_device_info()
+            else:
+                default_device = self.audio.get_default_output_device_info()
+            logger.info(
+                f"使用默认设备: {default_device['name']} "
+                f"(Index: {default_device['index']})"
+            )
+            return int(default_device["index"])
+        except Exception:
+            logger.warning("未找到默认设备，正在查找第一个可用的设备...")
+
+        # 遍历所有设备，寻找第一个可用的输入/输出设备
+        for i in range(self.audio.get_device_count()):
+            device_info = self.audio.get_device_info_by_index(i)
+            if is_input and device_info["maxInputChannels"] > 0:
+                logger.info(f"找到可用的麦克风: {device_info['name']} (Index: {i})")
+                return i
+            if not is_input and device_info["maxOutputChannels"] > 0:
+                logger.info(f"找到可用的扬声器: {device_info['name']} (Index: {i})")
+                return i
+
+        logger.error("未找到可用的音频设备")
+        raise RuntimeError("没有可用的音频设备")
+
+    def open_input(self, rate: int, channels: int, frames_per_buffer: int):
+        return self.audio.open(
+            format=self._pyaudio.paInt16,
+            channels=channels,
+            rate=rate,
+            input=True,
+            input_device_index=self.get_device_index(is_input=True),
+            frames_per_buffer=frames_per_buffer
+        )
+
+    def open_output(self, rate: int, channels: int, frames_per_buffer: int):
+        return self.audio.open(
+            format=self._pyaudio.paInt16,
+            channels=channels,
+            rate=rate,
+            output=True,
+            output_device_index=self.get_device_index(is_input=False),
+            frames_per_buffer=frames_per_buffer
+        )
+
+    def terminate(self):
+        if self.audio:
+            self.audio.terminate()
+            self.audio = None
+
+
+class FileAudioBackend(AudioBackend):
+    """文件后端：从文件读取麦克风数据，把播放数据写入文件
+
+    realtime=True 时按采样率节奏读写，行为接近真实声卡；
+    realtime=False 时尽可能快地读写，用于编解码吞吐量测试。
+    """
+
+    name = "file"
+
+    def __init__(self, input_path: Optional[str] = None,
+                 output_path: Optional[str] = None,
+                 realtime: bool = True, loop: bool = False):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.realtime = realtime
+        self.loop = loop
+
+    def open_input(self, rate: int, channels: int, frames_per_buffer: int):
+        return FileInputStream(
+            self.input_path, rate, channels, frames_per_buffer,
+            realtime=self.realtime, loop=self.loop
+        )
+
+    def open_output(self, rate: int, channels: int, frames_per_buffer: int):
+        return FileOutputStream(
+            self.output_path, rate, channels, realtime=self.realtime
+        )
+
+
+class NullAudioBackend(FileAudioBackend):
+    """空设备后端：输入为静音，输出直接丢弃"""
+
+    name = "null"
+
+    def __init__(self, realtime: bool = True):
+        super().__init__(None, None, realtime=realtime)
+
+
+def create_audio_backend(backend_config: Optional[dict] = None) -> AudioBackend:
+    """根据配置创建音频后端
+
+    配置项 AUDIO_BACKEND:
+        TYPE: pyaudio / file / null
+        INPUT_FILE / OUTPUT_FILE: 文件后端的输入和输出路径
+        REALTIME: 是否按实时速度读写
+        LOOP: 输入文件读完后是否循环
+    """
+    if backend_config is None:
+        from src.utils.config_manager import ConfigManager
+        backend_config = ConfigManager.get_instance().get_config(
+            "AUDIO_BACKEND", {}
+        ) or {}
+
+    backend_type = (backend_config.get("TYPE") or "pyaudio").lower()
+    realtime = backend_config.get("REALTIME", True)
+
+    if backend_type == "file":
+        logger.info("使用文件音频后端")
+        return FileAudioBackend(
+            input_path=backend_config.get("INPUT_FILE"),
+            output_path=backend_config.get("OUTPUT_FILE"),
+            realtime=realtime,
+            loop=backend_config.get("LOOP", False)
+        )
+    if backend_type == "null":
+        logger.info("使用空音频后端")
+        return NullAudioBackend(realtime=realtime)
+    if backend_type != "pyaudio":
+        logger.warning(f"未知的音频后端类型: {backend_type}，使用 pyaudio")
+    return PyAudioBackend()
@@ -1,8 +1,9 @@
 import logging
 import queue
 import numpy as np
-import pyaudio
 import opuslib
+from src.audio_codecs.audio_backend import create_audio_backend
+from src.audio_codecs.audio_mixer import AudioMixer
 from src.constants.constants import AudioConfig
 import time
 import sys
@@ -14,14 +15,19 @@ logger = logging.getLogger("AudioCodec")
 class AudioCodec:
     """音频编解码器类，处理音频的录制和播放"""
 
-    def __init__(self):
-        """初始化音频编解码器"""
-        self.audio = None
+    def __init__(self, backend=None):
+        """初始化音频编解码器
+
+        参数:
+            backend: 音频后端，默认根据配置 AUDIO_BACKEND 创建
+        """
+        self.backend = backend
         self.input_stream = None
         self.output_stream = None
         self.opus_encoder = None
         self.opus_decoder = None
         self.audio_decode_queue = queue.Queue()
+        self.mixer = None  # 软件混音器，TTS 和音乐共用同一个输出流
         self._is_closing = False  # 添加关闭状态标志
         self._is_input_paused = False  # 添加输入流暂停状态标志
         self._input_paused_lock = threading.Lock()  # 添加线程锁
@@ -32,35 +38,26 @@ class AudioCodec:
     def _initialize_audio(self):
         """初始化音频设备和编解码器"""
         try:
-            self.audio = pyaudio.PyAudio()
-
-            # 自动选择默认输入/输出设备
-            input_device_index = self._get_default_or_first_available_device(
-                is_input=True
-            )
-            output_device_index = self._get_default_or_first_available_device(
-                is_input=False
-            )
+            if self.backend is None:
+                self.backend = create_audio_backend()
 
             # 初始化音频输入流 - 使用16kHz采样率
-            self.input_stream = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=AudioConfig.CHANNELS,
-                rate=AudioConfig.INPUT_SAMPLE_RATE,  # 使用16kHz
-                input=True,
-                input_device_index=input_device_index,
-                frames_per_buffer=AudioConfig.INPUT_FRAME_SIZE
-            )
+            self.input_stream = self._open_input_stream()
 
             # 初始化音频输出流 - 使用24kHz采样率
-            self.output_stream = self.audio.open(
-                format=pyaudio.paInt16,
+            self.output_stream = self._open_output_stream()
+
+            # 所有播放都经过混音器写入输出流，TTS 播放时压低音乐音量
+            self.mixer = AudioMixer(
+                self._write_output,
+                rate=AudioConfig.OUTPUT_SAMPLE_RATE,
                 channels=AudioConfig.CHANNELS,
-                rate=AudioConfig.OUTPUT_SAMPLE_RATE,  # 使用24kHz
-                output=True,
-                output_device_index=output_device_index,
-                frames_per_buffer=AudioConfig.OUTPUT_FRAME_SIZE
+                frame_size=AudioConfig.OUTPUT_FRAME_SIZE
             )
+            self.mixer.add_ducking("music", "tts")
+            self.mixer.add_ducking("music", "effects")
+            self._update_output_latency()
+            self.mixer.start()
 
             # 初始化Opus编码器 - 使用16kHz（与输入匹配）
             self.opus_encoder = opuslib.Encoder(
@@ -75,39 +72,36 @@ class AudioCodec:
                 channels=AudioConfig.CHANNELS
             )
 
-            logger.info("音频设备和编解码器初始化成功")
+            logger.info(f"音频设备和编解码器初始化成功，后端: {self.backend.name}")
         except Exception as e:
             logger.error(f"初始化音频设备失败: {e}")
             raise
 
-    def _get_default_or_first_available_device(self, is_input=True):
-        """获取默认设备或第一个可用的输入/输出设备"""
+    def _open_input_stream(self):
+        """通过音频后端打开输入流"""
+        return self.backend.open_input(
+            rate=AudioConfig.INPUT_SAMPLE_RATE,
+            channels=AudioConfig.CHANNELS,
+            frames_per_buffer=AudioConfig.INPUT_FRAME_SIZE
+        )
+
+    def _open_output_stream(self):
+        """通过音频后端打开输出流"""
+        return self.backend.open_output(
+            rate=AudioConfig.OUTPUT_SAMPLE_RATE,
+            channels=AudioConfig.CHANNELS,
+            frames_per_buffer=AudioConfig.OUTPUT_FRAME_SIZE
+        )
+
+    def _update_output_latency(self):
+        """把输出流的延迟告诉混音器，用于计算音乐的实际播放位置"""
+        if not self.mixer or not self.output_stream:
+            return
         try:
-            if is_input:
-                default_device = self.audio.get_default_input_device_info()
-            else:
-                default_device = self.audio.get_default_output_device_info()
-            device_info = (
-                f"使用默认设备: {default_device['name']} "
-                f"(Index: {default_device['index']})"
-            )
-            logger.info(device_info)
-            return int(default_device["index"])
-        except Exception:
-            logger.warning("未找到默认设备，正在查找第一个可用的设备...")
-
-        # 遍历所有设备，寻找第一个可用的输入/输出设备
-        for i in range(self.audio.get_device_count()):
-            device_info = self.audio.get_device_info_by_index(i)
-            if is_input and device_info["maxInputChannels"] > 0:
-                logger.info(f"找到可用的麦克风: {device_info['name']} (Index: {i})")
-                return i
-            if not is_input and device_info["maxOutputChannels"] > 0:
-                logger.info(f"找到可用的扬声器: {device_info['name']} (Index: {i})")
-                return i
-
-        logger.error("未找到可用的音频设备")
-        raise RuntimeError("没有可用的音频设备")
+            self.mixer.output_latency = float(self.output_stream.get_output_latency())
+        except Exception as e:
+            logger.debug(f"获取输出延迟失败: {e}")
+            self.mixer.output_latency = 0.0
 
     def pause_input(self):
         """暂停输入流但不关闭它"""
@@ -208,7 +202,7 @@ class AudioCodec:
         self.audio_decode_queue.put(opus_data)
 
     def play_audio(self):
-        """处理并播放队列中的音频数据"""
+        """解码队列中的音频数据并送入混音器的 TTS 总线"""
         try:
             if self.audio_decode_queue.empty():
                 return None
@@ -233,39 +227,35 @@ class AudioCodec:
                 except Exception as e:
                     logger.error(f"解码音频数据时出错: {e}")
 
-            # 只有在有数据时才处理和播放
+            # 只有在有数据时才送入混音器，总线满时阻塞，与直接写声卡的节奏一致
             if len(buffer) > 0:
-                # 转换为numpy数组
-                pcm_array = np.frombuffer(buffer, dtype=np.int16)
-                
-                # 使用锁保护输出流操作
-                with self._stream_lock:
-                    if self.output_stream and self.output_stream.is_active():
-                        try:
-                            self.output_stream.write(pcm_array.tobytes())
-                        except OSError as e:
-                            error_msg = str(e)
-                            if ("Stream closed" in error_msg or 
-                                "Internal PortAudio error" in error_msg):
-                                logger.error("播放音频时出错: 流已关闭")
-                                self._reinitialize_output_stream()
-                            else:
-                                logger.error("播放音频时出错")
-                    else:
-                        self._reinitialize_output_stream()
-                        if self.output_stream and self.output_stream.is_active():
-                            try:
-                                self.output_stream.write(pcm_array.tobytes())
-                            except Exception:
-                                logger.error("重新初始化后播放音频时出错")
+                self.mixer.bus("tts").write(buffer)
                                 
         except Exception:
             logger.error("播放音频时出错")
-            self._reinitialize_output_stream()
+
+    def _write_output(self, pcm_data: bytes):
+        """混音线程写输出流，流异常时重新初始化"""
+        with self._stream_lock:
+            if self._is_closing:
+                return
+            if not self.output_stream or not self.output_stream.is_active():
+                self._reinitialize_output_stream()
+            try:
+                self.output_stream.write(pcm_data)
+            except OSError as e:
+                error_msg = str(e)
+                if ("Stream closed" in error_msg or 
+                        "Internal PortAudio error" in error_msg):
+                    logger.error("播放音频时出错: 流已关闭")
+                    self._reinitialize_output_stream()
+                else:
+                    logger.error("播放音频时出错")
 
     def has_pending_audio(self):
-        """检查是否还有待播放的音频数据"""
-        return not self.audio_decode_queue.empty()
+        """检查是否还有待播放的音频数据（包括已解码、尚未混音的TTS数据）"""
+        return (not self.audio_decode_queue.empty()
+                or (self.mixer is not None and self.mixer.bus("tts").pending > 0))
 
     def wait_for_audio_complete(self, timeout=5.0):
         # 等待音频队列清空
@@ -282,13 +272,19 @@ class AudioCodec:
             except queue.Empty:
                 break
 
+        # 等待混音器播完已解码的TTS数据
+        if self.mixer:
+            self.mixer.bus("tts").wait_empty(timeout=timeout)
+
     def clear_audio_queue(self):
-        """清空音频队列"""
+        """清空TTS音频队列和混音器中尚未播放的TTS数据"""
         while not self.audio_decode_queue.empty():
             try:
                 self.audio_decode_queue.get_nowait()
             except queue.Empty:
                 break
+        if self.mixer:
+            self.mixer.bus("tts").clear()
 
     def start_streams(self):
         """启动音频流"""
@@ -322,17 +318,8 @@ class AudioCodec:
             if sys.platform in ('darwin', 'linux'):
                 time.sleep(0.1)
 
-            input_device = self._get_default_or_first_available_device(
-                is_input=True
-            )
-            self.output_stream = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=AudioConfig.CHANNELS,
-                rate=AudioConfig.OUTPUT_SAMPLE_RATE,
-                output=True,
-                output_device_index=input_device,
-                frames_per_buffer=AudioConfig.OUTPUT_FRAME_SIZE
-            )
+            self.output_stream = self._open_output_stream()
+            self._update_output_latency()
             logger.info("音频输出流重新初始化成功")
         except Exception as e:
             logger.error(f"重新初始化音频输出流失败: {e}")
@@ -362,15 +349,7 @@ class AudioCodec:
             if sys.platform in ('darwin', 'linux'):
                 time.sleep(0.1)
 
-            input_device_index = self._get_default_or_first_available_device(is_input=True)
-            self.input_stream = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=AudioConfig.CHANNELS,
-                rate=AudioConfig.INPUT_SAMPLE_RATE,
-                input=True,
-                input_device_index=input_device_index,
-                frames_per_buffer=AudioConfig.INPUT_FRAME_SIZE
-            )
+            self.input_stream = self._open_input_stream()
             logger.info("音频输入流重新初始化成功")
         except Exception as e:
             logger.error(f"重新初始化音频输入流失败: {e}")
@@ -406,6 +385,10 @@ class AudioCodec:
             # 强制清空音频队列
             self.clear_audio_queue()
 
+            # 停止混音线程，之后不再写输出流
+            if self.mixer:
+                self.mixer.close()
+
             with self._stream_lock:  # 使用锁确保线程安全
                 # 关闭输入流
                 if self.input_stream:
@@ -431,15 +414,15 @@ class AudioCodec:
                     finally:
                         self.output_stream = None
 
-                # 关闭 PyAudio 实例
-                if self.audio:
-                    logger.debug("正在终止 PyAudio...")
+                # 释放音频后端
+                if self.backend:
+                    logger.debug("正在释放音频后端...")
                     try:
-                        self.audio.terminate()
+                        self.backend.terminate()
                     except Exception as e:
-                        logger.error(f"终止 PyAudio 时出错: {e}")
+                        logger.error(f"释放音频后端时出错: {e}")
                     finally:
-                        self.audio = None
+                        self.backend = None
 
             # 清理编解码器
             self.opus_encoder = None
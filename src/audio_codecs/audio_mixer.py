@@ -0,0 +1,297 @@
+"""
+软件混音器
+
+TTS、音乐和提示音各自写入一个输入总线，混音线程按帧从所有总线取数据，
+乘以总线增益和闪避（ducking）包络后相加，再写入唯一的输出流。
+TTS 播放时音乐按逐采样的包络压低音量，TTS 结束后平滑恢复，不再暂停音乐。
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("AudioMixer")
+
+
+class DuckingEnvelope:
+    """
+    闪避包络
+
+    触发总线有声音时增益在 attack 秒内线性降到 duck_gain；触发总线安静
+    hold 秒后在 release 秒内线性恢复到 1。增益按采样点计算。
+    """
+
+    def __init__(self, rate: int, duck_gain: float = 0.25, attack: float = 0.08,
+                 release: float = 0.5, hold: float = 0.3):
+        self.duck_gain = duck_gain
+        self.attack_step = (1.0 - duck_gain) / max(1, int(rate * attack))
+        self.release_step = (1.0 - duck_gain) / max(1, int(rate * release))
+        self.hold_samples = int(rate * hold)
+        self.gain = 1.0
+        self._quiet_samples = self.hold_samples  # 触发总线已安静的采样数
+
+    def render(self, trigger: np.ndarray) -> np.ndarray:
+        """
+        根据触发总线每个采样点是否有声音计算增益
+
+        参数:
+            trigger: 布尔数组，True 表示该采样点触发总线有数据
+        返回:
+            与 trigger 等长的增益数组
+        """
+        count = len(trigger)
+        if not trigger.any() and self.gain >= 1.0:
+            # 最常见的情况：没有 TTS，音乐保持原音量
+            self._quiet_samples += count
+            return np.ones(count, dtype=np.float32)
+
+        # 按连续的“有声/无声”片段分段计算，每段内增益是线性斜坡
+        gains = np.empty(count, dtype=np.float32)
+        edges = np.flatnonzero(np.diff(trigger.astype(np.int8))) + 1
+        start = 0
+        for end in list(edges) + [count]:
+            length = end - start
+            steps = np.arange(1, length + 1, dtype=np.float32)
+            if trigger[start]:
+                segment = np.maximum(self.duck_gain, self.gain - self.attack_step * steps)
+                self._quiet_samples = 0
+            else:
+                # hold 时间内保持当前增益，之后开始恢复
+                held = min(length, max(0, self.hold_samples - self._quiet_samples))
+                segment = np.full(length, self.gain, dtype=np.float32)
+                if length > held:
+                    segment[held:] = np.minimum(
+                        1.0, self.gain + self.release_step * steps[:length - held]
+                    )
+                self._quiet_samples += length
+            gains[start:end] = segment
+            self.gain = float(segment[-1])
+            start = end
+        return gains
+
+
+class MixerBus:
+    """
+    混音器输入总线
+
+    写入方提供 16 位 PCM，容量满时阻塞，形成与直接写声卡相同的反压。
+    written / consumed 是写入和被取走（或丢弃）的累计字节数，两者在同一坐标下，
+    写入方记下某段数据写入时的 written，就能用 played_bytes 换算出它的播放进度。
+    """
+
+    def __init__(self, name: str, mixer: "AudioMixer", capacity: int, gain: float = 1.0):
+        self.name = name
+        self.gain = gain
+        self.capacity = capacity
+        self._mixer = mixer
+        self._data = bytearray()
+        self.written = 0
+        self.consumed = 0
+
+    @property
+    def pending(self) -> int:
+        """尚未混音的字节数"""
+        with self._mixer._cond:
+            return len(self._data)
+
+    @property
+    def played_bytes(self) -> int:
+        """已经从声卡播放出来的累计字节数（扣除输出设备的延迟）"""
+        mixer = self._mixer
+        latency = int(mixer.output_latency * mixer.rate) * mixer.channels * 2
+        with mixer._cond:
+            return max(0, self.consumed - latency)
+
+    def write(self, data: bytes, timeout: Optional[float] = None) -> bool:
+        """
+        写入PCM数据，总线已满时等待混音线程取走数据
+
+        返回 False 表示等待超时或混音器已关闭，数据未完全写入。
+        """
+        view = memoryview(data).cast("B")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        cond = self._mixer._cond
+        with cond:
+            while view:
+                if self._mixer.closed:
+                    return False
+                space = self.capacity - len(self._data)
+                if space <= 0:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    cond.wait(remaining)
+                    continue
+                self._data += view[:space]
+                self.written += min(space, len(view))
+                view = view[space:]
+                cond.notify_all()
+        return True
+
+    def clear(self):
+        """丢弃尚未播放的数据（切歌、打断时使用）"""
+        with self._mixer._cond:
+            # 丢弃的数据不会播放，直接计入 consumed，保持与 written 的对应关系
+            self.consumed += len(self._data)
+            self._data.clear()
+            self._mixer._cond.notify_all()
+
+    def wait_empty(self, timeout: Optional[float] = None) -> bool:
+        """等待总线中的数据全部被混音，返回是否已清空"""
+        cond = self._mixer._cond
+        with cond:
+            return cond.wait_for(lambda: not self._data or self._mixer.closed, timeout)
+
+    def _take(self, size: int) -> bytes:
+        # 调用方持有混音器锁
+        chunk = bytes(self._data[:size])
+        del self._data[:size]
+        self.consumed += len(chunk)
+        return chunk
+
+
+class AudioMixer:
+    """
+    多总线混音器，由唯一的混音线程写输出流
+
+    参数:
+        write: 写输出流的函数，阻塞到声卡接收数据为止
+        rate / channels / frame_size: 输出格式和每次混音的帧数
+
+    output_latency 是输出流报告的延迟（秒），用于换算实际播放位置。
+    """
+
+    # 默认总线及其缓冲时长（秒）
+    BUSES = {"tts": 0.5, "music": 0.25, "effects": 0.5}
+
+    def __init__(self, write: Callable[[bytes], None], rate: int, channels: int,
+                 frame_size: int):
+        self.rate = rate
+        self.channels = channels
+        self.frame_size = frame_size
+        self.closed = False
+        self.output_latency = 0.0
+        self._write = write
+        self._cond = threading.Condition()
+        self._buses: Dict[str, MixerBus] = {}
+        # (被压低的总线, 触发总线, 包络)
+        self._ducking: List[tuple] = []
+        self._thread: Optional[threading.Thread] = None
+        for name, seconds in self.BUSES.items():
+            self.add_bus(name, int(rate * seconds) * channels * 2)
+
+    def add_bus(self, name: str, capacity: int, gain: float = 1.0) -> MixerBus:
+        with self._cond:
+            bus = MixerBus(name, self, capacity, gain)
+            self._buses[name] = bus
+            return bus
+
+    def bus(self, name: str) -> MixerBus:
+        return self._buses[name]
+
+    def add_ducking(self, target: str, trigger: str, **envelope_args):
+        """trigger 总线有声音时压低 target 总线的音量"""
+        with self._cond:
+            self._ducking.append(
+                (target, trigger, DuckingEnvelope(self.rate, **envelope_args))
+            )
+
+    def set_gain(self, name: str, gain: float):
+        self._buses[name].gain = gain
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="audio_mixer", daemon=True
+            )
+            self._thread.start()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+    def has_pending(self) -> bool:
+        with self._cond:
+            return any(bus._data for bus in self._buses.values())
+
+    def mix(self, frames: int) -> Optional[bytes]:
+        """
+        从各总线取出 frames 帧并混音
+
+        数据不足一帧的总线用静音补齐；所有总线都没有数据时返回 None。
+        """
+        size = frames * self.channels * 2
+        with self._cond:
+            chunks = {
+                name: bus._take(size)
+                for name, bus in self._buses.items() if bus._data
+            }
+            if chunks:
+                self._cond.notify_all()
+            gains = {name: self._buses[name].gain for name in chunks}
+            ducking = list(self._ducking)
+        if not chunks:
+            return None
+
+        samples = frames * self.channels
+        signals = {}
+        for name, chunk in chunks.items():
+            signal = np.zeros(samples, dtype=np.float32)
+            pcm = np.frombuffer(chunk, dtype=np.int16)
+            signal[:len(pcm)] = pcm
+            signals[name] = signal
+
+        # 计算每个采样点的闪避增益（按帧判断，多声道共用一个增益）
+        envelopes = {}
+        for target, trigger, envelope in ducking:
+            active = np.zeros(frames, dtype=bool)
+            if trigger in chunks:
+                active[:len(chunks[trigger]) // (self.channels * 2)] = True
+            envelope_gain = np.repeat(envelope.render(active), self.channels)
+            if target in envelopes:
+                envelopes[target] = envelopes[target] * envelope_gain
+            else:
+                envelopes[target] = envelope_gain
+
+        output = np.zeros(samples, dtype=np.float32)
+        for name, signal in signals.items():
+            signal *= gains[name]
+            if name in envelopes:
+                signal *= envelopes[name]
+            output += signal
+        return np.clip(output, -32768, 32767).astype(np.int16).tobytes()
+
+    def _advance_idle_envelopes(self, frames: int):
+        # 没有任何数据时包络按静音推进，TTS 结束后音乐再次出现时不会残留压低的音量
+        with self._cond:
+            ducking = list(self._ducking)
+        for _, _, envelope in ducking:
+            envelope.render(np.zeros(frames, dtype=bool))
+
+    def _run(self):
+        frame_seconds = self.frame_size / self.rate
+        while not self.closed:
+            with self._cond:
+                has_data = self._cond.wait_for(
+                    lambda: self.closed or any(bus._data for bus in self._buses.values()),
+                    timeout=frame_seconds
+                )
+            if self.closed:
+                break
+            if not has_data:
+                self._advance_idle_envelopes(self.frame_size)
+                continue
+            frame = self.mix(self.frame_size)
+            if frame is None:
+                continue
+            try:
+                self._write(frame)
+            except Exception as e:
+                logger.error(f"写入输出流失败: {e}")
+                time.sleep(frame_seconds)
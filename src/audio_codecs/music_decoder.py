@@ -0,0 +1,208 @@
+"""
+音乐解码器
+
+把 MP3 等压缩音频解码并重采样为输出格式（16 位 PCM）。可选后端:
+    pyav    进程内解码（PyAV / libavcodec），重采样使用 libswresample 的多相滤波器，
+            不需要为每首歌启动子进程，也没有管道拷贝
+    ffmpeg  启动 ffmpeg 子进程，通过管道传输数据，作为没有安装 PyAV 时的回退
+
+输入可以是本地文件路径，也可以是带阻塞 read(size) 方法的对象
+（如边下载边读取的 CacheStreamReader）。
+"""
+
+import logging
+import subprocess
+import threading
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional, Union
+
+logger = logging.getLogger("MusicDecoder")
+
+FEED_CHUNK_SIZE = 32768
+
+
+class CacheStreamReader:
+    """
+    按顺序读取渐进式缓存文件，未下载的部分等待下载线程写入
+
+    stop_event 被设置后返回 b""，解码器把它当作输入结束。
+    """
+
+    def __init__(self, cache, stop_event: threading.Event):
+        self.cache = cache
+        self.stop_event = stop_event
+        self.offset = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = FEED_CHUNK_SIZE
+        while not self.stop_event.is_set():
+            data = self.cache.read(self.offset, size, timeout=1)
+            if data is None:
+                continue  # 等待下载
+            self.offset += len(data)
+            return data
+        return b""
+
+
+class DecodeStream(ABC):
+    """
+    一首歌的解码过程
+
+    chunks() 依次产生 PCM 数据，结束后 completed 表示是否完整解码；
+    close() 可以在任意线程调用，用于中止解码。
+    """
+
+    name = ""
+
+    def __init__(self, source: Union[str, CacheStreamReader], rate: int, channels: int):
+        self.source = source
+        self.rate = rate
+        self.channels = channels
+        self.completed = False
+
+    @abstractmethod
+    def chunks(self, size: int) -> Iterator[bytes]:
+        """产生 PCM 数据块，除最后一块外每块 size 字节"""
+
+    @abstractmethod
+    def close(self):
+        """中止解码并释放资源"""
+
+
+class FFmpegDecodeStream(DecodeStream):
+    """ffmpeg 子进程解码，从 stdin 或文件读取，从 stdout 读取 PCM"""
+
+    name = "ffmpeg"
+
+    def __init__(self, source, rate: int, channels: int):
+        super().__init__(source, rate, channels)
+        from_pipe = not isinstance(source, str)
+        source_args = ['-f', 'mp3', '-i', 'pipe:0'] if from_pipe else ['-i', source]
+        cmd = [
+            'ffmpeg',
+            *source_args,
+            '-f', 's16le',
+            '-ar', str(rate),
+            '-ac', str(channels),
+            'pipe:1'
+        ]
+        self.process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if from_pipe else None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        if from_pipe:
+            threading.Thread(target=self._feed, name="decoder_feed", daemon=True).start()
+
+    def _feed(self):
+        """把输入数据写入 ffmpeg 的 stdin，读完后关闭 stdin"""
+        sink = self.process.stdin
+        try:
+            while True:
+                data = self.source.read(FEED_CHUNK_SIZE)
+                if not data:
+                    break
+                sink.write(data)
+        except (BrokenPipeError, OSError, ValueError):
+            logger.debug("解码器输入已关闭")
+        finally:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.debug(f"关闭转换进程输入时出错: {str(e)}")
+
+    def chunks(self, size: int) -> Iterator[bytes]:
+        while True:
+            chunk = self.process.stdout.read(size)
+            if not chunk:
+                self.completed = self.process.wait() == 0
+                return
+            yield chunk
+
+    def close(self):
+        try:
+            self.process.terminate()
+        except Exception as e:
+            logger.debug(f"终止转换进程时出现预期内的错误: {str(e)}")
+
+
+class PyAVDecodeStream(DecodeStream):
+    """PyAV 进程内解码，在调用 chunks() 的线程中完成解码和重采样"""
+
+    name = "pyav"
+
+    def __init__(self, source, rate: int, channels: int):
+        super().__init__(source, rate, channels)
+        import av  # noqa: F401  未安装时由 create_decode_stream 回退到 ffmpeg
+        self._closed = False
+
+    def chunks(self, size: int) -> Iterator[bytes]:
+        import av
+
+        from_pipe = not isinstance(self.source, str)
+        container = av.open(self.source, format="mp3" if from_pipe else None)
+        try:
+            stream = container.streams.audio[0]
+            resampler = av.AudioResampler(
+                format="s16",
+                layout="mono" if self.channels == 1 else "stereo",
+                rate=self.rate
+            )
+            pending = bytearray()
+            for packet in container.demux(stream):
+                if self._closed:
+                    return
+                try:
+                    frames = packet.decode()
+                except av.error.InvalidDataError:
+                    continue  # 跳过损坏的帧，与 ffmpeg 的行为一致
+                for frame in frames:
+                    for resampled in resampler.resample(frame):
+                        pending += resampled.to_ndarray().tobytes()
+                while len(pending) >= size:
+                    yield bytes(pending[:size])
+                    del pending[:size]
+            for resampled in resampler.resample(None):
+                pending += resampled.to_ndarray().tobytes()
+            if pending:
+                yield bytes(pending)
+            self.completed = not self._closed
+        finally:
+            container.close()
+
+    def close(self):
+        self._closed = True
+
+
+DECODERS = {
+    "pyav": PyAVDecodeStream,
+    "ffmpeg": FFmpegDecodeStream,
+}
+
+
+def create_decode_stream(source, rate: int, channels: int,
+                         decoder_type: Optional[str] = None) -> DecodeStream:
+    """
+    根据配置创建解码过程
+
+    配置项 MUSIC_DECODER.TYPE:
+        auto    已安装 PyAV 时进程内解码，否则使用 ffmpeg
+        pyav / ffmpeg  指定后端，PyAV 不可用时仍回退到 ffmpeg
+    """
+    if decoder_type is None:
+        from src.utils.config_manager import ConfigManager
+        decoder_type = ConfigManager.get_instance().get_config("MUSIC_DECODER.TYPE", "auto")
+    decoder_type = (decoder_type or "auto").lower()
+    if decoder_type not in DECODERS and decoder_type != "auto":
+        logger.warning(f"未知的音乐解码器类型: {decoder_type}，自动选择")
+        decoder_type = "auto"
+
+    if decoder_type in ("auto", "pyav"):
+        try:
+            return PyAVDecodeStream(source, rate, channels)
+        except ImportError:
+            if decoder_type == "pyav":
+                logger.warning("未安装 PyAV，使用 ffmpeg 解码")
+    return FFmpegDecodeStream(source, rate, channels)
@@ -24,7 +24,7 @@ class WakeWordDetector:
                  model_path=None,
                  sensitivity=0.5,
                  sample_rate=AudioConfig.INPUT_SAMPLE_RATE,
-                 buffer_size=AudioConfig.INPUT_FRAME_SIZE):
+                 buffer_size=None):
         """
         初始化唤醒词检测器
 
@@ -33,7 +33,7 @@ class WakeWordDetector:
             model_path: Vosk模型路径，默认使用项目根目录下的中文小模型
             sensitivity: 检测灵敏度 (0.0-1.0)
             sample_rate: 音频采样率
-            buffer_size: 音频缓冲区大小
+            buffer_size: 音频缓冲区大小，默认为 AudioConfig.INPUT_FRAME_SIZE
         """
         # 初始化基本属性
         self.on_detected_callbacks = []
@@ -58,7 +58,8 @@ class WakeWordDetector:
 
         self.enabled = True
         self.sample_rate = sample_rate
-        self.buffer_size = buffer_size
+        # 帧长由后台探测决定，在这里才读取，避免导入模块时阻塞
+        self.buffer_size = buffer_size or AudioConfig.INPUT_FRAME_SIZE
         self.sensitivity = sensitivity
 
         # 设置默认唤醒词
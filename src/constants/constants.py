@@ -1,5 +1,4 @@
-from src.utils.config_manager import ConfigManager
-config = ConfigManager.get_instance()
+import threading
 
 
 class ListeningMode:
@@ -28,6 +27,18 @@ class EventType:
     AUDIO_OUTPUT_READY_EVENT = "audio_output_ready_event"
 
 
+def _get_config():
+    """获取配置管理器（延迟导入，避免导入本模块时就读取配置）"""
+    from src.utils.config_manager import ConfigManager
+    return ConfigManager.get_instance()
+
+
+def _is_plain_websocket() -> bool:
+    """服务器使用非加密 ws 协议时，音频参数固定为 16kHz/60ms"""
+    url = _get_config().get_config("NETWORK.WEBSOCKET_URL") or ""
+    return url.startswith("ws:")
+
+
 def get_frame_duration() -> int:
     """
     获取设备的帧长度
@@ -35,11 +46,10 @@ def get_frame_duration() -> int:
     返回:
         int: 帧长度(毫秒)
     """
-    import pyaudio
     try:
-
-        if config.get_config("NETWORK.WEBSOCKET_URL").startswith("ws:"):
+        if _is_plain_websocket():
             return 60
+        import pyaudio
         p = pyaudio.PyAudio()
         # 获取默认输入设备信息
         device_info = p.get_default_input_device_info()
@@ -56,20 +66,86 @@ def get_frame_duration() -> int:
     except Exception:
         return 20  # 如果获取失败，返回默认值20ms
 
-class AudioConfig:
-    """音频配置类"""
+
+class _LazyAudioConfig(type):
+    """AudioConfig 的元类：首次访问依赖配置或声卡的字段时才进行解析"""
+
+    def __getattr__(cls, name):
+        if name in cls._LAZY_FIELDS:
+            cls.resolve()
+            return type.__getattribute__(cls, name)
+        raise AttributeError(name)
+
+
+class AudioConfig(metaclass=_LazyAudioConfig):
+    """音频配置类
+
+    OUTPUT_SAMPLE_RATE、FRAME_DURATION 及帧大小依赖配置文件和声卡探测，
+    不在导入时计算。Application.run 中通过 start_probe() 在后台探测声卡，
+    resolve() 统一解析一次；未显式解析时在首次访问这些字段时自动解析。
+    """
     # 固定配置
     INPUT_SAMPLE_RATE = 16000  # 输入采样率16kHz
-    OUTPUT_SAMPLE_RATE = 16000 if config.get_config("NETWORK.WEBSOCKET_URL").startswith("ws:") else 24000  # 输出采样率24kHz
     CHANNELS = 1
 
-    # 动态获取帧长度
-    FRAME_DURATION = get_frame_duration()
-
-    # 根据不同采样率计算帧大小
-    INPUT_FRAME_SIZE = int(INPUT_SAMPLE_RATE * (FRAME_DURATION / 1000))
-    OUTPUT_FRAME_SIZE = int(OUTPUT_SAMPLE_RATE * (FRAME_DURATION / 1000))
-
     # Opus编码配置
     OPUS_APPLICATION = 2049  # OPUS_APPLICATION_AUDIO
-    OPUS_FRAME_SIZE = INPUT_FRAME_SIZE  # 使用输入采样率的帧大小
+
+    # 延迟解析的字段
+    _LAZY_FIELDS = (
+        "OUTPUT_SAMPLE_RATE", "FRAME_DURATION",
+        "INPUT_FRAME_SIZE", "OUTPUT_FRAME_SIZE", "OPUS_FRAME_SIZE"
+    )
+    _resolve_lock = threading.RLock()
+    _probe_thread = None
+    _probed_frame_duration = None
+
+    @classmethod
+    def start_probe(cls):
+        """在后台线程中探测声卡帧长度，不阻塞启动流程"""
+        with cls._resolve_lock:
+            if cls._probe_thread is not None or cls.is_resolved():
+                return
+
+            def probe():
+                cls._probed_frame_duration = get_frame_duration()
+
+            cls._probe_thread = threading.Thread(
+                target=probe, name="audio_probe", daemon=True
+            )
+            cls._probe_thread.start()
+
+    @classmethod
+    def is_resolved(cls) -> bool:
+        return "FRAME_DURATION" in cls.__dict__
+
+    @classmethod
+    def resolve(cls, frame_duration: int = None):
+        """解析依赖配置和声卡的音频参数，只执行一次"""
+        with cls._resolve_lock:
+            if cls.is_resolved():
+                return
+
+            # 输出采样率24kHz，非加密 ws 服务器使用16kHz
+            cls.OUTPUT_SAMPLE_RATE = (
+                16000 if _is_plain_websocket() else 24000
+            )
+
+            # 动态获取帧长度，优先使用后台探测结果
+            if frame_duration is None:
+                if cls._probe_thread is not None:
+                    cls._probe_thread.join()
+                    frame_duration = cls._probed_frame_duration
+                if frame_duration is None:
+                    frame_duration = get_frame_duration()
+
+            # 根据不同采样率计算帧大小
+            cls.INPUT_FRAME_SIZE = int(
+                cls.INPUT_SAMPLE_RATE * (frame_duration / 1000)
+            )
+            cls.OUTPUT_FRAME_SIZE = int(
+                cls.OUTPUT_SAMPLE_RATE * (frame_duration / 1000)
+            )
+            cls.OPUS_FRAME_SIZE = cls.INPUT_FRAME_SIZE  # 使用输入采样率的帧大小
+            # FRAME_DURATION 最后赋值，作为解析完成的标志
+            cls.FRAME_DURATION = frame_duration
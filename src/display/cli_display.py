@@ -147,6 +147,8 @@ class CliDisplay(BaseDisplay):
         self.running = False
         print("\n正在关闭应用...")
         self.stop_keyboard_listener()
+        if self.volume_controller:
+            self.volume_controller.close()
 
     def _print_help(self):
         """打印帮助信息"""
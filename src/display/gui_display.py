@@ -263,6 +263,8 @@ class GuiDisplay(BaseDisplay):
         self._running = False
         self.root.destroy()
         self.stop_keyboard_listener()
+        if self.volume_controller:
+            self.volume_controller.close()
 
     def start(self):
         """启动GUI"""
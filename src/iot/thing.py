@@ -1,6 +1,11 @@
 import json
+import logging
+import threading
+import time
 from typing import Dict, List, Callable, Any, Optional, Union
 
+logger = logging.getLogger("Thing")
+
 
 class ValueType:
     BOOLEAN = "boolean"
@@ -9,13 +14,35 @@ class ValueType:
 
 
 class Property:
-    def __init__(self, name: str, description: str, getter: Callable):
+    # 超过该耗时（秒）的 getter 被视为慢 getter，之后优先返回缓存值
+    SLOW_GETTER_THRESHOLD = 0.05
+    # 慢 getter 未指定 ttl 时使用的缓存时间（秒）
+    SLOW_GETTER_TTL = 1.0
+
+    def __init__(self, name: str, description: str, getter: Callable,
+                 type_: Optional[str] = None, ttl: Optional[float] = None):
         self.name = name
         self.description = description
         self.getter = getter
+        self.ttl = ttl  # 缓存时间（秒），None 表示每次都调用 getter
+
+        # getter 耗时统计
+        self.call_count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.slow = False
+
+        self._cached_value = None
+        self._cached_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+        if type_ is not None:
+            self.type = type_
+            return
 
-        # 根据 getter 返回值类型确定属性类型
-        test_value = getter()
+        # 未声明类型时，根据 getter 返回值类型确定属性类型
+        test_value = self._call_getter()
         if isinstance(test_value, bool):
             self.type = ValueType.BOOLEAN
         elif isinstance(test_value, (int, float)):
@@ -31,8 +58,74 @@ class Property:
             "type": self.type
         }
 
+    def _call_getter(self):
+        """调用 getter 并记录耗时和缓存结果"""
+        start = time.perf_counter()
+        value = self.getter()
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.call_count += 1
+            self.total_time += elapsed
+            self.max_time = max(self.max_time, elapsed)
+            self._cached_value = value
+            self._cached_at = time.monotonic()
+            if elapsed > self.SLOW_GETTER_THRESHOLD and not self.slow:
+                self.slow = True
+                logger.warning(
+                    f"属性 {self.name} 的 getter 耗时 {elapsed * 1000:.1f}ms，"
+                    f"之后将优先返回缓存值"
+                )
+        return value
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def refresh():
+            try:
+                self._call_getter()
+            except Exception as e:
+                logger.error(f"刷新属性 {self.name} 失败: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=refresh, daemon=True,
+                         name=f"property_{self.name}").start()
+
     def get_state_value(self):
-        return self.getter()
+        ttl = self.ttl
+        if ttl is None and self.slow:
+            ttl = self.SLOW_GETTER_TTL
+        if ttl is None or self._cached_at is None:
+            return self._call_getter()
+
+        if time.monotonic() - self._cached_at < ttl:
+            return self._cached_value
+        if self.slow:
+            # 慢 getter 过期后先返回旧值，在后台刷新
+            self._refresh_in_background()
+            return self._cached_value
+        return self._call_getter()
+
+    def invalidate(self):
+        """使缓存值失效，下次读取时重新调用 getter"""
+        with self._lock:
+            self._cached_at = None
+
+    def get_stats(self) -> Dict:
+        """getter 耗时统计"""
+        with self._lock:
+            average = self.total_time / self.call_count if self.call_count else 0.0
+            return {
+                "calls": self.call_count,
+                "avg_ms": round(average * 1000, 3),
+                "max_ms": round(self.max_time * 1000, 3),
+                "slow": self.slow
+            }
 
 
 class Parameter:
@@ -55,6 +148,12 @@ class Parameter:
     def get_value(self) -> Any:
         return self.value
 
+    def bind(self, value: Any) -> "Parameter":
+        """返回携带本次调用取值的参数副本，不修改方法上共享的参数定义"""
+        bound = Parameter(self.name, self.description, self.type, self.required)
+        bound.value = value
+        return bound
+
 
 class Method:
     def __init__(self, name: str, description: str, parameters: List[Parameter], callback: Callable):
@@ -71,18 +170,17 @@ class Method:
         }
 
     def invoke(self, params: Dict[str, Any]) -> Any:
-        # 设置参数值
-        for name, value in params.items():
-            if name in self.parameters:
-                self.parameters[name].set_value(value)
-
-        # 检查必需参数
+        # 每次调用使用独立的参数副本，并发调用之间互不影响
+        bound = {}
         for name, param in self.parameters.items():
-            if param.required and param.get_value() is None:
+            value = params.get(name)
+            # 检查必需参数
+            if param.required and value is None:
                 raise ValueError(f"缺少必需参数: {name}")
+            bound[name] = param.bind(value)
 
         # 调用回调函数
-        return self.callback(self.parameters)
+        return self.callback(bound)
 
 
 class Thing:
@@ -92,8 +190,9 @@ class Thing:
         self.properties = {}
         self.methods = {}
 
-    def add_property(self, name: str, description: str, getter: Callable) -> None:
-        self.properties[name] = Property(name, description, getter)
+    def add_property(self, name: str, description: str, getter: Callable,
+                     type_: Optional[str] = None, ttl: Optional[float] = None) -> None:
+        self.properties[name] = Property(name, description, getter, type_, ttl)
 
     def add_method(self, name: str, description: str, parameters: List[Parameter], callback: Callable) -> None:
         self.methods[name] = Method(name, description, parameters, callback)
@@ -115,10 +214,19 @@ class Thing:
                       for name, prop in self.properties.items()}
         }
 
+    def get_property_stats(self) -> Dict[str, Dict]:
+        """各属性 getter 的耗时统计"""
+        return {name: prop.get_stats() for name, prop in self.properties.items()}
+
     def invoke(self, command: Dict) -> Any:
         method_name = command.get("method")
         if method_name not in self.methods:
             raise ValueError(f"方法不存在: {method_name}")
 
         parameters = command.get("parameters", {})
-        return self.methods[method_name].invoke(parameters)
\ No newline at end of file
+        try:
+            return self.methods[method_name].invoke(parameters)
+        finally:
+            # 方法可能修改了状态，缓存的属性值需要重新读取
+            for prop in self.properties.values():
+                prop.invalidate()
\ No newline at end of file
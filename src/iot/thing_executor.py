@@ -0,0 +1,123 @@
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger("ThingExecutor")
+
+
+class ThingExecutor:
+    """
+    物联网设备命令执行器
+
+    所有设备共享一个有界线程池，每个设备一条串行通道：同一设备的调用按
+    提交顺序依次执行，不同设备之间并行执行。调用方拿到 Future，不会被
+    设备方法阻塞。
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="iot"
+        )
+        # 设备名 -> 等待执行的调用；设备名存在表示该通道正在执行
+        self._lanes: Dict[str, Deque[Tuple[Future, Callable, tuple, Optional[float]]]] = {}
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def submit(self, lane: str, func: Callable, *args,
+               timeout: Optional[float] = None) -> Future:
+        """
+        在指定设备的通道上执行 func(*args)
+
+        timeout 从调用真正开始执行时计时，超时后 Future 以 TimeoutError 结束，
+        但设备方法本身无法被中断，会继续占用该设备的通道直到返回。
+        """
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("执行器已关闭")
+            queue = self._lanes.get(lane)
+            idle = queue is None
+            if idle:
+                queue = self._lanes[lane] = deque()
+            queue.append((future, func, args, timeout))
+            if idle:
+                # 在锁内提交：shutdown() 设置关闭标志后线程池才会关闭
+                self._executor.submit(self._drain, lane)
+        return future
+
+    def pending(self, lane: str) -> int:
+        """设备通道中等待执行的调用数"""
+        with self._lock:
+            queue = self._lanes.get(lane)
+            return len(queue) if queue else 0
+
+    def _drain(self, lane: str):
+        # 每次只执行一个调用，再重新排队，避免一个繁忙的设备长期占用线程
+        with self._lock:
+            queue = self._lanes.get(lane)
+            if not queue:
+                # 执行器已关闭，等待的调用已被取消
+                return
+            future, func, args, timeout = queue.popleft()
+        try:
+            self._run(lane, future, func, args, timeout)
+        finally:
+            with self._lock:
+                if self._lanes.get(lane) and not self._shutdown:
+                    self._executor.submit(self._drain, lane)
+                else:
+                    self._lanes.pop(lane, None)
+
+    def _run(self, lane: str, future: Future, func: Callable, args: tuple,
+             timeout: Optional[float]):
+        if not future.set_running_or_notify_cancel():
+            return
+
+        timer = None
+        if timeout is not None:
+            timer = threading.Timer(
+                timeout, self._expire, args=(lane, future, timeout)
+            )
+            timer.daemon = True
+            timer.start()
+        try:
+            result = func(*args)
+        except BaseException as e:
+            self._set_future(future, error=e)
+        else:
+            self._set_future(future, result=result)
+        finally:
+            if timer:
+                timer.cancel()
+
+    def _expire(self, lane: str, future: Future, timeout: float):
+        if self._set_future(future, error=FutureTimeoutError(
+                f"设备 {lane} 调用超时 ({timeout}s)")):
+            logger.warning(f"设备 {lane} 调用超过 {timeout}s 仍未返回")
+
+    @staticmethod
+    def _set_future(future: Future, result: Any = None,
+                    error: BaseException = None) -> bool:
+        # 超时与正常结束可能同时发生，只有先到的一方生效
+        try:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+            return True
+        except InvalidStateError:
+            return False
+
+    def shutdown(self, wait: bool = False):
+        """关闭执行器，尚未开始的调用会被取消"""
+        with self._lock:
+            self._shutdown = True
+            waiting = [item[0] for queue in self._lanes.values() for item in queue]
+            self._lanes.clear()
+        for future in waiting:
+            future.cancel()
+        self._executor.shutdown(wait=wait)
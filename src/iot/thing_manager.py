@@ -1,7 +1,101 @@
+import importlib
+import importlib.util
+import inspect
 import json
-from typing import Any, Dict
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 
 from src.iot.thing import Thing
+from src.iot.thing_executor import ThingExecutor
+
+logger = logging.getLogger("ThingManager")
+
+# 描述符缓存文件，记录延迟创建设备的描述符和初始状态
+DESCRIPTOR_CACHE_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "cache", "iot_descriptors.json"
+)
+
+# 描述符缓存格式版本，描述符或状态的格式变化时递增，使所有缓存失效
+DESCRIPTOR_CACHE_VERSION = 2
+
+# 描述符和状态由 Thing 基类序列化，它的修改同样会使所有缓存失效
+THING_SOURCE_FILE = inspect.getfile(Thing)
+
+
+def resolve_factory(factory: str) -> Callable[[], Thing]:
+    """把 "模块路径:类名" 解析为可调用对象（此时才导入模块）"""
+    module_name, _, attr = factory.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attr)
+
+
+def _descriptor_cache_base() -> List:
+    """所有设备共用的缓存校验信息：缓存格式版本和 Thing 基类源文件的修改时间"""
+    try:
+        thing_mtime = os.path.getmtime(THING_SOURCE_FILE)
+    except OSError:
+        thing_mtime = None
+    return [DESCRIPTOR_CACHE_VERSION, thing_mtime]
+
+
+def _factory_source_mtime(factory: str) -> Optional[float]:
+    """获取设备源文件的修改时间，用于判断缓存的描述符是否过期"""
+    module_name = factory.partition(":")[0]
+    try:
+        spec = importlib.util.find_spec(module_name)
+        if spec is None or not spec.origin:
+            return None
+        return os.path.getmtime(spec.origin)
+    except (ImportError, OSError, ValueError):
+        return None
+
+
+class LazyThing:
+    """
+    延迟创建的设备占位对象
+
+    持有设备的描述符和初始状态，在收到针对它的命令时才真正创建设备。
+    """
+
+    def __init__(self, name: str, factory: str, descriptor: Dict, state: Dict,
+                 on_loaded: Callable[["LazyThing", Thing], None]):
+        self.name = name
+        self.factory = factory
+        self._descriptor = descriptor
+        self._state = state
+        self._on_loaded = on_loaded
+        self._thing: Optional[Thing] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._thing is not None
+
+    def load(self) -> Thing:
+        """创建真正的设备对象（只执行一次）"""
+        with self._lock:
+            if self._thing is None:
+                logger.info(f"按需创建设备: {self.name}")
+                thing = resolve_factory(self.factory)()
+                self._thing = thing
+                self._on_loaded(self, thing)
+            return self._thing
+
+    def get_descriptor_json(self) -> Dict:
+        return self._descriptor
+
+    def get_state_json(self) -> Dict:
+        # 尚未创建的设备状态等于其初始状态
+        if self._thing is not None:
+            return self._thing.get_state_json()
+        return self._state
+
+    def invoke(self, command: Dict) -> Any:
+        return self.load().invoke(command)
 
 
 class ThingManager:
@@ -15,22 +109,183 @@ class ThingManager:
 
     def __init__(self):
         self.things = []
+        # 按名称索引，命令路由为 O(1)
+        self._things_by_name: Dict[str, Union[Thing, LazyThing]] = {}
+        self._lock = threading.Lock()
+        self._descriptor_cache = None
+        # 设备列表变化时递增，用于使缓存的描述符失效
+        self.version = 0
+        self._descriptors_version = -1
+        self._descriptors_json = ""
+        self._descriptors_bytes = b""
+        # 上次发送给服务器的属性值: 设备名 -> {属性名: 值}
+        self._last_states: Dict[str, Dict[str, Any]] = {}
+        self._states_lock = threading.Lock()
+        # 异步命令执行器，首次使用时创建
+        self._executor: Optional[ThingExecutor] = None
 
     def add_thing(self, thing: Thing) -> None:
-        self.things.append(thing)
+        self._register(thing)
+
+    def _register(self, thing: Union[Thing, LazyThing]) -> None:
+        with self._lock:
+            if thing.name in self._things_by_name:
+                raise ValueError(f"设备已存在: {thing.name}")
+            self.things.append(thing)
+            self._things_by_name[thing.name] = thing
+            self.version += 1
+
+    def add_lazy_thing(self, factory: str) -> Union[Thing, LazyThing]:
+        """
+        注册按需创建的设备
+
+        factory 为 "模块路径:类名"。若已缓存该设备的描述符且源文件、Thing 基类和缓存格式都未变化，
+        只注册占位对象，等到第一次收到该设备的命令时再导入并创建；
+        否则立即创建设备并缓存其描述符，供下次启动使用。
+        """
+        cache = self._load_descriptor_cache()
+        entry = cache.get(factory)
+        mtime = _factory_source_mtime(factory)
+        base = _descriptor_cache_base()
+        if (entry and mtime is not None and entry.get("mtime") == mtime
+                and entry.get("base") == base):
+            lazy = LazyThing(
+                entry["descriptor"]["name"],
+                factory,
+                entry["descriptor"],
+                entry["state"],
+                self._replace_lazy_thing
+            )
+            self._register(lazy)
+            return lazy
+
+        thing = resolve_factory(factory)()
+        self._register(thing)
+        if mtime is not None:
+            self._store_descriptor(factory, thing, mtime, base)
+        return thing
+
+    def get_thing(self, name: str) -> Optional[Thing]:
+        """按名称获取设备，延迟设备会在此时创建"""
+        thing = self._things_by_name.get(name)
+        if isinstance(thing, LazyThing):
+            return thing.load()
+        return thing
+
+    def _replace_lazy_thing(self, lazy: LazyThing, thing: Thing) -> None:
+        # 描述符与占位对象一致，无需使缓存失效
+        with self._lock:
+            self.things = [thing if item is lazy else item for item in self.things]
+            self._things_by_name[lazy.name] = thing
+
+    def _load_descriptor_cache(self) -> Dict:
+        if self._descriptor_cache is None:
+            try:
+                with open(DESCRIPTOR_CACHE_FILE, "r", encoding="utf-8") as f:
+                    self._descriptor_cache = json.load(f)
+            except (OSError, ValueError):
+                self._descriptor_cache = {}
+        return self._descriptor_cache
+
+    def _store_descriptor(self, factory: str, thing: Thing, mtime: float, base: List) -> None:
+        cache = self._load_descriptor_cache()
+        cache[factory] = {
+            "mtime": mtime,
+            "base": base,
+            "descriptor": thing.get_descriptor_json(),
+            "state": thing.get_state_json()
+        }
+        try:
+            os.makedirs(os.path.dirname(DESCRIPTOR_CACHE_FILE), exist_ok=True)
+            with open(DESCRIPTOR_CACHE_FILE, "w", encoding="utf-8") as f:
+                json.dump(cache, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.warning(f"保存设备描述符缓存失败: {e}")
+
+    def _refresh_descriptors(self) -> None:
+        # 描述符注册后不再变化，只在设备列表变化时重新序列化
+        with self._lock:
+            if self._descriptors_version == self.version:
+                return
+            descriptors = [thing.get_descriptor_json() for thing in self.things]
+            self._descriptors_json = json.dumps(descriptors)
+            self._descriptors_bytes = self._descriptors_json.encode("utf-8")
+            self._descriptors_version = self.version
 
     def get_descriptors_json(self) -> str:
-        descriptors = [thing.get_descriptor_json() for thing in self.things]
-        return json.dumps(descriptors)
+        self._refresh_descriptors()
+        return self._descriptors_json
+
+    def get_descriptors_bytes(self) -> bytes:
+        self._refresh_descriptors()
+        return self._descriptors_bytes
 
     def get_states_json(self) -> str:
         states = [thing.get_state_json() for thing in self.things]
         return json.dumps(states)
 
+    def get_changed_states_json(self, names: Optional[Iterable[str]] = None) -> Optional[str]:
+        """
+        只返回自上次发送以来发生变化的属性
+
+        names 为需要检查的设备名，为 None 时检查全部设备，只有这些设备的
+        getter 会被调用。没有任何变化时返回 None。
+        """
+        if names is None:
+            things = list(self.things)
+        else:
+            things = [self._things_by_name[name] for name in names
+                      if name in self._things_by_name]
+
+        changes = []
+        with self._states_lock:
+            for thing in things:
+                state = thing.get_state_json()["state"]
+                last = self._last_states.setdefault(thing.name, {})
+                changed = {key: value for key, value in state.items()
+                           if key not in last or last[key] != value}
+                if changed:
+                    last.update(changed)
+                    changes.append({"name": thing.name, "state": changed})
+
+        if not changes:
+            return None
+        return json.dumps(changes)
+
+    def reset_states(self) -> None:
+        """清空已发送状态的记录，下次将发送完整状态（如重新建立音频通道后）"""
+        with self._states_lock:
+            self._last_states.clear()
+
     def invoke(self, command: Dict) -> Any:
         thing_name = command.get("name")
-        for thing in self.things:
-            if thing.name == thing_name:
-                return thing.invoke(command)
+        thing = self._things_by_name.get(thing_name)
+        if thing is None:
+            raise ValueError(f"设备不存在: {thing_name}")
+        return thing.invoke(command)
+
+    def invoke_async(self, command: Dict, timeout: Optional[float] = None) -> Future:
+        """
+        在后台执行设备命令，立即返回 Future
+
+        同一设备的命令按顺序串行执行，不同设备的命令并行执行。
+        """
+        thing_name = command.get("name")
+        thing = self._things_by_name.get(thing_name)
+        if thing is None:
+            future = Future()
+            future.set_exception(ValueError(f"设备不存在: {thing_name}"))
+            return future
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThingExecutor()
+            executor = self._executor
+        # 通过名称查找，延迟设备在执行线程中被替换后也能找到真实对象
+        return executor.submit(thing_name, self.invoke, command, timeout=timeout)
 
-        raise ValueError(f"设备不存在: {thing_name}")
\ No newline at end of file
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False)
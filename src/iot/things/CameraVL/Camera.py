@@ -1,11 +1,10 @@
-import cv2
 import base64
 import json
 import logging
 from pathlib import Path
 from typing import Dict, Any, Optional
 import threading
-from src.iot.thing import Thing
+from src.iot.thing import Thing, ValueType
 from src.iot.things.CameraVL import VL
 
 logger = logging.getLogger("Camera")
@@ -45,8 +44,10 @@ class Camera(Thing):
 
     def add_property_and_method(self):
         # 定义属性
-        self.add_property("power", "摄像头是否打开", lambda: self.is_running )
-        self.add_property("result", "识别画面的内容", lambda: self.result )
+        self.add_property("power", "摄像头是否打开", lambda: self.is_running,
+                          ValueType.BOOLEAN)
+        self.add_property("result", "识别画面的内容", lambda: self.result,
+                          ValueType.STRING)
         # 定义方法
         self.add_method("start_camera", "打开摄像头", [],
                         lambda params: self.start_camera())
@@ -127,6 +128,7 @@ class Camera(Thing):
 
     def _camera_loop(self):
         """摄像头线程的主循环"""
+        import cv2  # OpenCV 较重，打开摄像头时才导入
         camera_index = self.get_config("camera_index")
         self.cap = cv2.VideoCapture(camera_index)
 
@@ -181,6 +183,7 @@ class Camera(Thing):
             return None
 
         # 将帧转换为 JPEG 格式
+        import cv2
         _, buffer = cv2.imencode('.jpg', frame)
 
         # 将 JPEG 图像转换为 Base64 编码
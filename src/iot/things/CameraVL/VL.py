@@ -1,6 +1,5 @@
 import os
 import base64
-from openai import OpenAI
 import threading
 class ImageAnalyzer:
     _instance = None
@@ -12,6 +11,7 @@ class ImageAnalyzer:
             cls._instance = super().__new__(cls)
         return cls._instance
     def init(self, api_,base_url="https://dashscope.aliyuncs.com/compatible-mode/v1"):
+        from openai import OpenAI  # openai SDK 导入较慢，创建客户端时才导入
         self.client = OpenAI(
             api_key=api_ or os.getenv("111111"),
             base_url=base_url,
@@ -1,4 +1,4 @@
-from src.iot.thing import Thing
+from src.iot.thing import Thing, ValueType
 
 
 class Lamp(Thing):
@@ -9,7 +9,8 @@ class Lamp(Thing):
         print(f"[虚拟设备] 灯设备初始化完成")
 
         # 定义属性
-        self.add_property("power", "灯是否打开", lambda: self.power)
+        self.add_property("power", "灯是否打开", lambda: self.power,
+                          ValueType.BOOLEAN)
 
         # 定义方法
         self.add_method("TurnOn", "打开灯", [],
@@ -1,19 +1,60 @@
 from src.application import Application
+from src.audio_codecs.music_decoder import CacheStreamReader, DecodeStream, create_decode_stream
 from src.constants.constants import DeviceState, AudioConfig
 from src.iot.thing import Thing, Parameter, ValueType
+import hashlib
 import os
 import requests
-import subprocess
-import pyaudio
-import queue
 import threading
 import time
-import io
-from typing import Dict, Any, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 
+from src.utils.byte_buffer import BoundedByteBuffer
+from src.utils.cancel_token import CancelToken
+from src.utils.config_manager import ConfigManager
+from src.utils.lyric_timeline import LyricTimeline
+from src.utils.music_cache_index import MusicCacheIndex
+from src.utils.pcm_cache import MappedPcmReader, PcmCacheWriter
+from src.utils.progressive_cache import ProgressiveCacheFile
+from src.utils.ttl_cache import PersistentTTLCache
+
 logger = logging.getLogger("MusicPlayer")
 
+
+class Track:
+    """
+    播放列表中的一首歌曲
+
+    保存解析结果（ID、播放链接、时长、歌词）和产生PCM数据的资源。每首歌
+    有自己的取消令牌（播放会话令牌的子令牌），下载、解码和PCM缓冲区都观察它，
+    切歌或取消预取时只停止这一首，停止播放时随会话令牌一起取消。
+    """
+
+    def __init__(self, query: str):
+        self.query = query  # 请求播放的歌曲名称
+        self.title = query  # 解析后的显示名称
+        self.song_id = ""
+        self.url = ""
+        self.duration = 0
+        self.lyrics = LyricTimeline()
+        self.resolved = threading.Event()  # 解析已完成（无论成功与否）
+        self.lock = threading.Lock()  # 串行化解析和启动数据源
+        self.cancel: Optional[CancelToken] = None  # 成为当前或预取歌曲时创建
+        self.source = None  # PCM数据来源: BoundedByteBuffer 或 MappedPcmReader
+        self.cache: Optional[ProgressiveCacheFile] = None
+        self.decoder: Optional[DecodeStream] = None
+
+    @property
+    def ok(self) -> bool:
+        return bool(self.song_id and self.url)
+
+    @property
+    def cache_key(self) -> str:
+        return self.song_id or hashlib.md5(self.url.encode("utf-8")).hexdigest()
+
+
 class MusicPlayer(Thing):
     """
     音乐播放器组件
@@ -21,6 +62,27 @@ class MusicPlayer(Thing):
     提供在线音乐搜索、播放、暂停等功能，支持歌词显示和播放进度跟踪。
     优先播放本地音乐，如果没有再播放在线音乐。
     """
+
+    # 解码与播放之间缓冲的PCM时长（秒）
+    PCM_BUFFER_SECONDS = 2
+    # 下载数据块大小
+    DOWNLOAD_CHUNK_SIZE = 32768
+    # 每个主机保持的连接数（当前歌曲和预取歌曲会同时下载）
+    HTTP_POOL_SIZE = 4
+    # 接口结果缓存时间（秒）：搜索结果和歌词基本不变，播放链接带签名会过期
+    SEARCH_CACHE_TTL = 7 * 24 * 3600
+    PLAY_URL_CACHE_TTL = 3600
+    # 播放链接请求超过该时间（秒）没有结果时再发起一个请求，不等前一个超时
+    PLAY_URL_HEDGE_DELAY = 1.5
+    # 每个播放链接接口最多请求次数，以及获取播放链接的总时限（秒）
+    PLAY_URL_ATTEMPTS = 3
+    PLAY_URL_TIMEOUT = 15
+    LYRICS_CACHE_TTL = 30 * 24 * 3600
+    # 音乐缓存目录
+    CACHE_DIR = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))),
+        "cache", "music"
+    )
     
     def __init__(self):
         """初始化音乐播放器"""
@@ -34,15 +96,20 @@ class MusicPlayer(Thing):
         self.playing = False    # 播放状态
         self.total_duration = 0  # 歌曲总时长（秒）
         self.current_position = 0  # 当前播放位置（秒）
-        self.position_update_time = 0  # 上次更新播放位置的时间
+        self.track_start_byte = 0  # 当前歌曲第一帧在音乐总线中的写入位置
         
         # 播放控制相关
-        self.audio_decode_queue = queue.Queue(maxsize=100)  
+        self.pcm_buffer = BoundedByteBuffer(1)  # 解码后的PCM数据，每次播放时重新创建
         self.play_thread = None  # 播放线程
-        self.stop_event = threading.Event()  # 停止事件
-        self.stream = None  # 音频流对象
-        self.pyaudio = None  # PyAudio对象
-        self.convert_process = None  # FFmpeg转换进程
+        self.stop_event = CancelToken()  # 播放会话的取消令牌，每次开始播放时重新创建
+        
+        # 播放列表
+        self.playlist: List[Track] = []
+        self.playlist_index = -1  # 当前歌曲在播放列表中的位置
+        self.current_track: Optional[Track] = None
+        self.prefetch_track: Optional[Track] = None  # 正在后台准备的下一首
+        self.queue_lock = threading.RLock()
+        self._jump_to: Optional[int] = None  # 等待播放线程处理的切歌请求
         
         # 线程管理
         self.cleanup_lock = threading.Lock()  # 清理锁
@@ -51,12 +118,15 @@ class MusicPlayer(Thing):
         self.thread_lock = threading.Lock()  # 线程管理锁
         
         # 歌词相关
-        self.lyrics = []  # 歌词列表，格式为 [(时间, 文本), ...]
+        self.lyrics = LyricTimeline()  # 当前歌曲的歌词时间轴
         self.current_lyric_index = 0  # 当前歌词索引
+        self.next_lyric_time = 0.0  # 播放到这个位置时才需要更新歌词
         
         # 缓存相关
-        self.cache_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "cache", "music")
+        self.cache_dir = self.CACHE_DIR
         self._ensure_cache_dir()
+        self.cache_index = self._create_cache_index()
+        self.pcm_index = self._create_pcm_index()  # 预解码PCM缓存，未启用时为 None
         
         # 获取应用程序实例
         self.app = Application.get_instance()
@@ -64,8 +134,17 @@ class MusicPlayer(Thing):
         # 加载配置文件
         self.config = self._load_config()
         
-        # 下载管理
-        self.current_temp_file = None  # 当前正在下载的临时文件路径
+        # 网络请求：复用连接的会话和持久化的接口结果缓存
+        self.api_session = self._create_http_session()
+        # 下载不使用系统代理设置
+        self.download_session = self._create_http_session(trust_env=False)
+        self.api_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="music_api")
+        self.search_cache = PersistentTTLCache(
+            os.path.join(self.cache_dir, "search_cache.json"), self.SEARCH_CACHE_TTL)
+        self.play_url_cache = PersistentTTLCache(
+            os.path.join(self.cache_dir, "play_url_cache.json"), self.PLAY_URL_CACHE_TTL)
+        self.lyrics_cache = PersistentTTLCache(
+            os.path.join(self.cache_dir, "lyrics_cache.json"), self.LYRICS_CACHE_TTL, 500)
         
         logger.info("音乐播放器初始化完成")
         
@@ -75,11 +154,23 @@ class MusicPlayer(Thing):
     
     def _register_properties(self):
         """注册播放器属性"""
-        self.add_property("current_song", "当前播放的歌曲", lambda: self.current_song)
-        self.add_property("playing", "是否正在播放", lambda: self.playing)
-        self.add_property("total_duration", "歌曲总时长（秒）", lambda: self.total_duration)
-        self.add_property("current_position", "当前播放位置（秒）", lambda: self._get_current_position())
-        self.add_property("progress", "播放进度（百分比）", lambda: self._get_progress())
+        self.add_property("current_song", "当前播放的歌曲", lambda: self.current_song,
+                          ValueType.STRING)
+        self.add_property("playing", "是否正在播放", lambda: self.playing,
+                          ValueType.BOOLEAN)
+        self.add_property("total_duration", "歌曲总时长（秒）", lambda: self.total_duration,
+                          ValueType.NUMBER)
+        self.add_property("current_position", "当前播放位置（秒）", lambda: self._get_current_position(),
+                          ValueType.NUMBER)
+        self.add_property("progress", "播放进度（百分比）", lambda: self._get_progress(),
+                          ValueType.NUMBER)
+        self.add_property("playlist_length", "播放列表中的歌曲数",
+                          lambda: len(self.playlist), ValueType.NUMBER)
+        self.add_property("playlist_position", "当前歌曲在播放列表中的序号（从1开始）",
+                          lambda: self.playlist_index + 1, ValueType.NUMBER)
+        self.add_property("cache_hit_rate", "本地缓存命中率（0-1）",
+                          lambda: round(self.cache_index.hit_rate, 3),
+                          ValueType.NUMBER, ttl=5.0)
     
     def _register_methods(self):
         """注册播放器方法"""
@@ -108,6 +199,34 @@ class MusicPlayer(Thing):
             }
         )
 
+        self.add_method(
+            "Enqueue",
+            "把歌曲加入播放列表，当前没有播放时立即开始播放",
+            [Parameter("song_name", "歌曲名称", ValueType.STRING, True)],
+            lambda params: self._enqueue(params["song_name"].get_value())
+        )
+
+        self.add_method(
+            "Next",
+            "播放播放列表中的下一首",
+            [],
+            lambda params: self._next()
+        )
+
+        self.add_method(
+            "Previous",
+            "播放播放列表中的上一首",
+            [],
+            lambda params: self._previous()
+        )
+
+        self.add_method(
+            "GetPlaylist",
+            "获取播放列表",
+            [],
+            lambda params: self._get_playlist()
+        )
+
     def _load_config(self) -> Dict[str, Any]:
         """
         加载配置文件
@@ -119,6 +238,8 @@ class MusicPlayer(Thing):
                 "API": {
                     "SEARCH_URL": "http://search.kuwo.cn/r.s",
                     "PLAY_URL": "http://api.xiaodaokg.com/kuwo.php",
+                    # 备用播放链接接口（可选），与 PLAY_URL 同时请求，使用最先返回的结果
+                    "PLAY_URL_FALLBACKS": [],
                     "LYRIC_URL": "http://m.kuwo.cn/newh5/singles/songinfoandlrc"
                 },
                 "HEADERS": {
@@ -141,8 +262,24 @@ class MusicPlayer(Thing):
         if not self.playing:
             return self.current_position
         
-        # 如果正在播放，返回当前位置
-        return min(self.total_duration, self.current_position)
+        # 如果正在播放，按声卡实际播放的采样数计算
+        position = self._get_played_seconds()
+        if self.total_duration > 0:
+            position = min(self.total_duration, position)
+        return position
+
+    def _get_played_seconds(self) -> float:
+        """
+        当前歌曲已经从声卡播放出来的时长
+
+        由音乐总线中已被混音的字节数扣除输出延迟得到，不受缓冲和暂停影响。
+        """
+        music_bus = self._get_music_bus()
+        if music_bus is None:
+            return self.current_position
+        played = music_bus.played_bytes - self.track_start_byte
+        bytes_per_second = AudioConfig.OUTPUT_SAMPLE_RATE * AudioConfig.CHANNELS * 2
+        return max(0, played) / bytes_per_second
     
     def _get_progress(self) -> float:
         """
@@ -159,18 +296,14 @@ class MusicPlayer(Thing):
         """
         播放指定歌曲
         
+        歌曲插入到播放列表当前位置之后并立即切换过去，播放列表中其余的歌曲保留。
+        
         参数:
             song_name: 歌曲名称
             
         返回:
             Dict[str, Any]: 播放结果
         """
-        # 如果已经在播放，先停止当前播放
-        if self.playing:
-            self._stop_playback()
-            # 添加短暂延迟确保之前的播放线程完全停止
-            time.sleep(0.5)
-        
         # 清空之前的歌词显示
         if self.app:
             self.app.schedule(lambda: self.app.set_chat_message("assistant", f"正在播放: {song_name}"))
@@ -179,41 +312,99 @@ class MusicPlayer(Thing):
         if self.app and self.app.device_state == DeviceState.SPEAKING:
             logger.info(f"应用程序正在说话，但将继续播放歌曲: {song_name}")
         
-        # 重置播放状态
-        self.current_song = song_name
-        self.playing = True
-        self.current_position = 0
-        self.lyrics = []  # 清空歌词
-        self.current_lyric_index = -1  # 重置歌词索引为-1，确保第一句歌词能显示
-        
-        # 确保停止事件被清除
-        self.stop_event.clear()
-        
         # 通过API搜索获取歌曲信息
         try:
             # 获取歌曲ID和播放URL
-            song_id, url = self._get_song_info(song_name)
-            if not song_id or not url:
+            track = Track(song_name)
+            self._resolve_track(track)
+            if not track.ok:
                 return {"status": "error", "message": f"未找到歌曲 '{song_name}' 或无法获取播放链接"}
             
-            logger.info(f"正在播放: {song_name}, URL: {url}")
+            logger.info(f"正在播放: {track.title}, URL: {track.url}")
             
-            # 创建并启动播放线程
-            self.play_thread = threading.Thread(
-                target=self._process_audio,
-                args=(url, song_id),
-                daemon=True
-            )
-            self.play_thread.start()
+            with self.queue_lock:
+                index = self.playlist_index + 1 if self.playlist else 0
+                self.playlist.insert(index, track)
+            self._jump(index)
             
             # 不等待播放线程开始，直接返回成功
-            return {"status": "success", "message": f"正在播放: {song_name}", "duration": self.total_duration}
+            return {"status": "success", "message": f"正在播放: {track.title}", "duration": track.duration}
             
         except Exception as e:
             logger.error(f"播放歌曲失败: {str(e)}")
             self.playing = False
             return {"status": "error", "message": f"播放歌曲失败: {str(e)}"}
 
+    def _enqueue(self, song_name: str) -> Dict[str, Any]:
+        """把歌曲加入播放列表末尾，解析在后台进行"""
+        track = Track(song_name)
+        with self.queue_lock:
+            self.playlist.append(track)
+            index = len(self.playlist) - 1
+            # 没有在播放且后面没有待播歌曲时直接开始播放
+            start_now = not self.playing and index == self.playlist_index + 1
+        if start_now:
+            self._jump(index)
+            return {"status": "success", "message": f"正在播放: {song_name}"}
+        if index == self.playlist_index + 1:
+            self._prefetch(index)
+        return {"status": "success", "message": f"已加入播放列表: {song_name}",
+                "position": index + 1}
+
+    def _next(self) -> Dict[str, Any]:
+        """切换到下一首"""
+        with self.queue_lock:
+            index = self.playlist_index + 1
+            if index >= len(self.playlist):
+                return {"status": "info", "message": "已经是播放列表的最后一首"}
+        self._jump(index)
+        return {"status": "success", "message": f"下一首: {self.playlist[index].title}"}
+
+    def _previous(self) -> Dict[str, Any]:
+        """切换到上一首"""
+        with self.queue_lock:
+            index = self.playlist_index - 1
+            if index < 0:
+                return {"status": "info", "message": "已经是播放列表的第一首"}
+        self._jump(index)
+        return {"status": "success", "message": f"上一首: {self.playlist[index].title}"}
+
+    def _get_playlist(self) -> Dict[str, Any]:
+        """返回播放列表中的歌曲名称和当前位置"""
+        with self.queue_lock:
+            return {
+                "songs": [track.title for track in self.playlist],
+                "position": self.playlist_index + 1
+            }
+
+    def _jump(self, index: int):
+        """
+        切换到播放列表中的指定歌曲
+
+        播放线程运行时只记录切歌请求，由播放线程在不关闭音频流的情况下切换；
+        否则启动新的播放线程。
+        """
+        with self.queue_lock:
+            if self.playing and self.play_thread and self.play_thread.is_alive():
+                self._jump_to = index
+                # 取消当前歌曲，阻塞在读取数据上的播放线程立即处理切歌
+                current = self.current_track
+                if current is not None and current is not self.playlist[index]:
+                    self._release_track(current)
+                self._clear_music_bus()
+                return
+            # 结束上一个播放会话（通常已被取消）；旧线程只响应自己的令牌，不等它退出
+            self.stop_event.cancel()
+            self._jump_to = index
+            self.stop_event = CancelToken()
+            self.playing = True
+            self.play_thread = self._create_thread(
+                target=self._play_audio_stream,
+                name="audio_play",
+                args=(self.stop_event,)
+            )
+            self.play_thread.start()
+
     def _stop_playback(self):
         """停止当前播放并清理资源"""
         # 使用锁防止重复清理
@@ -225,76 +416,40 @@ class MusicPlayer(Thing):
             
             try:
                 logger.info("停止当前播放并清理资源")
-                self.stop_event.set()
                 self.playing = False
                 
-                # 清理临时下载文件
-                if self.current_temp_file and os.path.exists(self.current_temp_file):
-                    try:
-                        os.remove(self.current_temp_file)
-                        logger.info(f"已清理临时下载文件: {self.current_temp_file}")
-                    except Exception as e:
-                        logger.error(f"清理临时文件失败: {str(e)}")
-                    finally:
-                        self.current_temp_file = None
+                # 取消播放会话：所有歌曲的下载、解码和缓冲区随之取消，阻塞中的读写立即返回
+                self.stop_event.cancel()
                 
-                # 清空音频队列
-                self._clear_audio_queue()
+                # 保存未下载完的缓存进度
+                with self.queue_lock:
+                    tracks = [self.current_track, self.prefetch_track]
+                    self.current_track = self.prefetch_track = None
+                    self._jump_to = None
+                for track in tracks:
+                    if track:
+                        self._release_track(track)
                 
-                # 关闭音频流
-                if self.stream:
-                    try:
-                        if self.stream.is_active():
-                            self.stream.stop_stream()
-                        self.stream.close()
-                        self.stream = None
-                    except Exception as e:
-                        logger.debug(
-                            f"关闭音频流时出现预期内的错误: {str(e)}"
-                        )
+                # 中止PCM缓冲区，唤醒等待中的播放线程
+                self.pcm_buffer.abort()
                 
-                # 终止PyAudio
-                if self.pyaudio:
-                    try:
-                        self.pyaudio.terminate()
-                        self.pyaudio = None
-                    except Exception as e:
-                        logger.debug(
-                            f"终止PyAudio时出现预期内的错误: {str(e)}"
-                        )
-                
-                # 终止转换进程
-                if self.convert_process:
-                    try:
-                        self.convert_process.terminate()
-                        self.convert_process = None
-                    except Exception as e:
-                        logger.debug(
-                            f"终止转换进程时出现预期内的错误: {str(e)}"
-                        )
-                
-                # 等待所有活动线程结束
-                with self.thread_lock:
-                    active_threads = list(self.active_threads)
-                    self.active_threads.clear()
-                
-                for thread in active_threads:
-                    if (thread.is_alive() and 
-                        thread != threading.current_thread()):
-                        try:
-                            thread.join(timeout=2.0)
-                        except RuntimeError:
-                            logger.debug(
-                                f"跳过等待线程 {thread.name} 结束"
-                            )
+                # 丢弃混音器中尚未播放的音乐数据
+                self._clear_music_bus()
                 
+                # 各线程观察取消令牌自行退出，不再逐个等待
                 logger.info("所有播放资源已清理完成")
             finally:
                 self.is_cleaning = False
 
     def _create_thread(self, target, name=None, args=()):
-        """创建并注册线程"""
-        thread = threading.Thread(target=target, name=name, args=args, daemon=True)
+        """创建并注册线程，线程结束时自动移除"""
+        def run():
+            try:
+                target(*args)
+            finally:
+                self._remove_thread(threading.current_thread())
+
+        thread = threading.Thread(target=run, name=name, daemon=True)
         with self.thread_lock:
             self.active_threads.add(thread)
         return thread
@@ -304,22 +459,27 @@ class MusicPlayer(Thing):
         with self.thread_lock:
             self.active_threads.discard(thread)
 
-    def _get_song_info(self, song_name: str) -> Tuple[str, str]:
+    def _resolve_track(self, track: Track):
+        """解析歌曲的ID、播放链接、时长和歌词"""
+        try:
+            track.song_id, track.url = self._get_song_info(track)
+        finally:
+            track.resolved.set()
+
+    def _search_song(self, song_name: str) -> Optional[Dict[str, Any]]:
         """
-        获取歌曲信息（ID和播放URL）
+        搜索歌曲
         
         参数:
             song_name: 歌曲名称
             
         返回:
-            Tuple[str, str]: (歌曲ID, 播放URL)
+            Optional[Dict[str, Any]]: {"song_id", "title", "duration"}，未找到时为 None
         """
         # 从配置中获取请求头和API URL
         headers = self.config.get("HEADERS", {})
         search_url = self.config.get("API", {}).get("SEARCH_URL", "http://search.kuwo.cn/r.s")
-        play_url = self.config.get("API", {}).get("PLAY_URL", "http://api.xiaodaokg.com/kuwo.php")
         
-        # 1. 搜索歌曲获取ID
         search_params = {
             "all": song_name,
             "ft": "music",
@@ -344,7 +504,7 @@ class MusicPlayer(Thing):
         logger.info(f"搜索歌曲: {song_name}")
         
         try:
-            response = requests.get(search_url, params=search_params, headers=headers, timeout=10)
+            response = self.api_session.get(search_url, params=search_params, headers=headers, timeout=10)
             response.raise_for_status()
             
             # 记录响应内容到日志（调试用）
@@ -366,7 +526,7 @@ class MusicPlayer(Thing):
             # 如果没有找到歌曲ID，返回失败
             if not song_id:
                 logger.warning(f"未找到歌曲 '{song_name}' 的ID")
-                return "", ""
+                return None
             
             # 提取歌曲时长
             duration = 0
@@ -377,7 +537,6 @@ class MusicPlayer(Thing):
                 if end_pos != -1:
                     try:
                         duration = int(response_text[start_pos:end_pos])
-                        self.total_duration = duration
                         logger.info(f"提取到歌曲时长: {duration}秒")
                     except ValueError:
                         logger.warning(f"歌曲时长解析失败: {response_text[start_pos:end_pos]}")
@@ -415,49 +574,130 @@ class MusicPlayer(Thing):
                 display_name = f"{title} - {artist}"
                 if album:
                     display_name += f" ({album})"
-            self.current_song = display_name
             
-            logger.info(f"获取到歌曲: {self.current_song}, ID: {song_id}, 时长: {duration}秒")
+            logger.info(f"获取到歌曲: {display_name}, ID: {song_id}, 时长: {duration}秒")
+            return {"song_id": song_id, "title": display_name, "duration": duration}
+        except Exception as e:
+            logger.error(f"搜索歌曲失败: {str(e)}")
+            return None
+
+    def _get_song_info(self, track: Track) -> Tuple[str, str]:
+        """
+        获取歌曲信息（ID和播放URL），时长、显示名称和歌词写入 track
+        
+        搜索结果、播放链接和歌词分别缓存在磁盘上，重复播放同一首歌时
+        不再请求接口；播放链接和歌词并行获取。
+        
+        参数:
+            track: 待解析的歌曲
             
-            # 2. 获取歌曲播放链接
-            play_api_url = f"{play_url}?ID={song_id}"
-            logger.info(f"获取歌曲播放链接: {play_api_url}")
+        返回:
+            Tuple[str, str]: (歌曲ID, 播放URL)
+        """
+        song_name = track.query
+        
+        # 1. 搜索歌曲获取ID
+        info = self.search_cache.get(song_name)
+        if info:
+            logger.info(f"使用缓存的搜索结果: {song_name} -> {info['song_id']}")
+        else:
+            info = self._search_song(song_name)
+            if not info:
+                return "", ""
+            self.search_cache.set(song_name, info)
+        song_id = info["song_id"]
+        track.title = info["title"]
+        track.duration = info["duration"]
+        
+        # 2. 获取歌词与获取播放链接同时进行
+        lyrics = self.lyrics_cache.get(song_id)
+        lyrics_future = None
+        if lyrics is None:
+            lyrics_future = self.api_executor.submit(self._fetch_lyrics, song_id)
+        
+        # 3. 获取歌曲播放链接
+        play_url = self.play_url_cache.get(song_id)
+        if play_url:
+            logger.info("使用缓存的歌曲播放链接")
+        else:
+            play_url = self._get_play_url(song_id)
+            if play_url:
+                self.play_url_cache.set(song_id, play_url)
+        
+        if lyrics_future:
+            try:
+                lyrics = lyrics_future.result(timeout=15)
+            except Exception as e:
+                logger.error(f"获取歌词失败: {str(e)}")
+                lyrics = []
+            if lyrics:
+                self.lyrics_cache.set(song_id, lyrics)
+        # 在解析线程中预先排序好歌词，播放线程只需移动游标
+        track.lyrics = LyricTimeline(lyrics or [])
+        
+        return song_id, play_url or ""
+
+    def _get_play_url(self, song_id: str) -> str:
+        """
+        获取歌曲播放链接
+        
+        先请求 PLAY_URL 和配置的所有备用接口（默认没有备用接口）。超过
+        PLAY_URL_HEDGE_DELAY 秒仍没有结果，或进行中的请求全部失败时，再向
+        接口发起一个新请求（对冲请求），与之前的请求并行，使用最先返回的
+        有效链接。每个接口最多请求 PLAY_URL_ATTEMPTS 次。
+        """
+        api = self.config.get("API", {})
+        endpoints = [api.get("PLAY_URL", "http://api.xiaodaokg.com/kuwo.php")]
+        endpoints += api.get("PLAY_URL_FALLBACKS", [])
+        urls = [f"{endpoint}?ID={song_id}" for endpoint in endpoints]
+        
+        # 之后的请求按接口轮流发起
+        queued = urls * self.PLAY_URL_ATTEMPTS
+        in_flight = {self.api_executor.submit(self._request_play_url, url)
+                     for url in queued[:len(urls)]}
+        queued = queued[len(urls):]
+        deadline = time.monotonic() + self.PLAY_URL_TIMEOUT
+        
+        while in_flight:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning("获取播放链接超时")
+                break
+            timeout = min(self.PLAY_URL_HEDGE_DELAY, remaining) if queued else remaining
+            done, in_flight = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                play_url = future.result()
+                if play_url:
+                    # 其余请求的结果不再需要
+                    for other in in_flight:
+                        other.cancel()
+                    return play_url
+            if queued and (not done or not in_flight):
+                logger.info(f"再次请求播放链接 (剩余 {len(queued)} 次)")
+                in_flight.add(self.api_executor.submit(self._request_play_url, queued.pop(0)))
+        for future in in_flight:
+            future.cancel()
+        return ""
+
+    def _request_play_url(self, play_api_url: str) -> str:
+        """请求一个播放链接接口，返回有效的播放链接或空字符串"""
+        logger.info(f"获取歌曲播放链接: {play_api_url}")
+        try:
+            headers = self.config.get("HEADERS", {})
+            url_response = self.api_session.get(play_api_url, headers=headers, timeout=10)
+            url_response.raise_for_status()
             
-            for attempt in range(3):
-                try:
-                    url_response = requests.get(play_api_url, headers=headers, timeout=10)
-                    url_response.raise_for_status()
-                    
-                    # 获取播放链接（直接返回的文本）
-                    play_url_text = url_response.text.strip()
-                    
-                    # 检查URL是否有效
-                    if play_url_text and play_url_text.startswith("http"):
-                        logger.info(f"获取到有效的歌曲URL: {play_url_text[:60]}...")
-                        
-                        # 3. 获取歌词
-                        self._fetch_lyrics(song_id)
-                        
-                        return song_id, play_url_text
-                    else:
-                        logger.warning(f"返回的播放链接格式不正确: {play_url_text[:100]}")
-                        if attempt < 2:
-                            logger.info(f"尝试重新获取播放链接 ({attempt+1}/3)")
-                            time.sleep(1)
-                        else:
-                            return song_id, ""
-                except Exception as e:
-                    logger.error(f"获取播放链接时出错: {str(e)}")
-                    if attempt < 2:
-                        logger.info(f"尝试重新获取播放链接 ({attempt+1}/3)")
-                        time.sleep(1)
-                    else:
-                        return song_id, ""
+            # 获取播放链接（直接返回的文本）
+            play_url_text = url_response.text.strip()
             
-            return song_id, ""
+            # 检查URL是否有效
+            if play_url_text and play_url_text.startswith("http"):
+                logger.info(f"获取到有效的歌曲URL: {play_url_text[:60]}...")
+                return play_url_text
+            logger.warning(f"返回的播放链接格式不正确: {play_url_text[:100]}")
         except Exception as e:
-            logger.error(f"获取歌曲信息失败: {str(e)}")
-            return "", ""
+            logger.error(f"获取播放链接时出错: {str(e)}")
+        return ""
 
     def _pause(self) -> Dict[str, Any]:
         """
@@ -470,21 +710,21 @@ class MusicPlayer(Thing):
             return {"status": "error", "message": "没有正在播放的歌曲"}
         
         if self.playing:
-            # 更新当前播放位置
-            if self.position_update_time > 0:
-                elapsed = time.time() - self.position_update_time
-                self.current_position += elapsed
-                self.current_position = min(self.total_duration, self.current_position)
+            # 按已播放的采样数更新当前播放位置
+            self.current_position = self._get_current_position()
             
             self.playing = False
-            self.stop_event.set()  # 设置停止事件
+            self.stop_event.cancel()  # 取消播放会话，播放线程立即退出
             
             # 清空队列
             self._clear_audio_queue()
             
-            # 等待播放线程结束
-            if self.play_thread and self.play_thread.is_alive():
-                self.play_thread.join(timeout=2.0)
+            # 播放线程观察取消令牌退出，只短暂等待，阻塞在读取上时不拖慢暂停
+            thread = self.play_thread
+            if thread and thread.is_alive() and thread is not threading.current_thread():
+                thread.join(timeout=0.05)
+                if thread.is_alive():
+                    logger.debug("播放线程尚未退出，继续暂停")
             
             # 更新Application显示
             if self.app and self.app.display:
@@ -499,293 +739,514 @@ class MusicPlayer(Thing):
             return {"status": "info", "message": f"歌曲 {self.current_song} 已经是暂停状态"}
     
     def _clear_audio_queue(self):
-        """清空音频解码队列"""
-        while not self.audio_decode_queue.empty():
-            try:
-                self.audio_decode_queue.get_nowait()
-            except queue.Empty:
-                break
+        """清空已解码的音频数据"""
+        self.pcm_buffer.clear()
+        self._clear_music_bus()
 
-    def _download_stream(self, url: str, chunk_queue: queue.Queue, cache_file: io.BufferedWriter = None):
-        """
-        流式下载音频文件
-        
-        参数:
-            url: 音频文件URL
-            chunk_queue: 数据块队列
-            cache_file: 缓存文件
+    def _get_music_bus(self):
+        """获取混音器的音乐总线，音乐与TTS共用同一个输出设备"""
+        audio_codec = getattr(self.app, "audio_codec", None) if self.app else None
+        mixer = getattr(audio_codec, "mixer", None)
+        return mixer.bus("music") if mixer else None
+
+    def _clear_music_bus(self):
+        bus = self._get_music_bus()
+        if bus:
+            bus.clear()
+
+    def _new_pcm_buffer(self) -> BoundedByteBuffer:
+        """为一首歌创建PCM缓冲区"""
+        capacity = (self.PCM_BUFFER_SECONDS * AudioConfig.OUTPUT_SAMPLE_RATE
+                    * AudioConfig.CHANNELS * 2)
+        return BoundedByteBuffer(capacity)
+
+    def _download_to_cache(self, url: str, cache: ProgressiveCacheFile,
+                           stop_event: CancelToken):
         """
-        try:
-            # 使用配置中的请求头
-            headers = self.config.get("HEADERS", {}).copy()
-            # 修改Accept-Encoding以支持流式下载
-            headers.update({
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Referer': 'https://music.163.com/'
-            })
-            
-            session = requests.Session()
-            session.trust_env = False
+        把缺失的部分下载到渐进式缓存中
 
-            # 添加重试机制
-            for attempt in range(3):
-                try:
-                    response = session.get(url, stream=True, headers=headers, timeout=30)
-                    response.raise_for_status()
+        已缓存的区间不会重复下载，缺失的区间通过 HTTP Range 请求获取；
+        下载中断后保留已下载的数据，下次播放时继续。
+        """
+        # 使用配置中的请求头，Range 按原始字节计算，不能使用压缩传输
+        headers = self.config.get("HEADERS", {}).copy()
+        headers.update({
+            'Accept-Encoding': 'identity',
+            'Referer': 'https://music.163.com/'
+        })
+        session = self.download_session
 
-                    total_size = int(response.headers.get('content-length', 0))
-                    downloaded = 0
-                    
-                    # 使用更大的chunk大小提高下载效率
-                    for chunk in response.iter_content(chunk_size=32768):
-                        if self.stop_event.is_set():
-                            logger.info("下载被中止")
-                            break
-                        if chunk:
-                            # 写入缓存文件
-                            if cache_file:
-                                try:
-                                    cache_file.write(chunk)
-                                    cache_file.flush()  # 确保数据写入磁盘
-                                except Exception as e:
-                                    logger.error(f"写入缓存文件失败: {str(e)}")
-                            
-                            # 放入播放队列
-                            chunk_queue.put(chunk)
-                            downloaded += len(chunk)
-                            
-                            # 每下载10%更新一次日志
-                            if total_size > 0 and downloaded % (total_size // 10) < 32768:
-                                progress = downloaded * 100 // total_size
-                                logger.info(f"下载进度: {progress}%")
-                    
-                    # 下载成功，跳出重试循环
+        cache.begin_write()
+        finished = False
+        failures = 0
+        try:
+            while not stop_event.is_set():
+                missing = cache.missing_ranges()
+                if missing == []:
+                    finished = True
                     break
-                    
+                # 总大小未知时从头请求整个文件
+                start, end = missing[0] if missing else (0, None)
+                before = cache.cached_bytes
+                try:
+                    finished = self._download_range(session, url, headers, cache,
+                                                    start, end, stop_event)
+                    if finished and missing is None:
+                        break
+                    if cache.cached_bytes == before:
+                        raise requests.exceptions.RequestException("服务器没有返回新的数据")
+                    failures = 0
                 except requests.exceptions.RequestException as e:
-                    if attempt == 2:  # 最后一次尝试
-                        logger.error(f"下载失败 (尝试 {attempt + 1}/3): {str(e)}")
-                        return
-                    logger.warning(f"下载失败，正在重试 ({attempt + 1}/3)...")
-                    time.sleep(1)  # 等待1秒后重试
+                    failures += 1
+                    if failures >= 3:
+                        logger.error(f"下载失败 (尝试 {failures}/3): {str(e)}")
+                        # 播放链接可能已过期，下次重新获取
+                        self.play_url_cache.delete(os.path.basename(cache.path)[:-len(".mp3")])
+                        break
+                    logger.warning(f"下载失败，正在从断点重试 ({failures}/3)...")
+                    stop_event.wait(1)  # 等待1秒后重试，取消时立即返回
         except Exception as e:
             logger.error(f"下载失败: {str(e)}")
         finally:
-            # 标记下载结束
-            chunk_queue.put(None)
-            # 关闭缓存文件
-            if cache_file:
-                try:
-                    cache_file.close()
-                    logger.info("缓存文件已保存并关闭")
-                except Exception as e:
-                    logger.error(f"关闭缓存文件失败: {str(e)}")
-                    try:
-                        cache_file.close()
-                    except:
-                        pass
+            cache.end_write(finished)
+
+        if cache.complete:
+            if cache.finalize():
+                logger.info("MP3文件已缓存到本地")
+        elif cache.total_size:
+            logger.info(f"已缓存 {cache.cached_bytes * 100 // cache.total_size}%，下次播放时续传")
+        self._register_cache(cache)
+
+    def _register_cache(self, cache: ProgressiveCacheFile):
+        """把下载结果登记到缓存索引，必要时淘汰其他歌曲"""
+        key = os.path.basename(cache.path)[:-len(".mp3")]
+        protect = [track.cache_key for track in (self.current_track, self.prefetch_track)
+                   if track and track.ok]
+        if os.path.exists(cache.path):
+            self.cache_index.add(key, cache.path, protect=protect)
+        elif os.path.exists(cache.part_path):
+            self.cache_index.add(key, cache.part_path, complete=False, protect=protect)
 
-    def _decode_audio_stream(self, process: subprocess.Popen):
+    def _download_range(self, session, url: str, headers: Dict, cache: ProgressiveCacheFile,
+                        start: int, end: Optional[int], stop_event: CancelToken) -> bool:
         """
-        解码音频流并将数据块放入队列
+        下载 [start, end) 区间写入缓存，end 为空表示到文件末尾
+
+        返回:
+            bool: 是否完整读到了响应末尾
+        """
+        request_headers = dict(headers)
+        if start > 0 or end is not None:
+            last = "" if end is None else str(end - 1)
+            request_headers['Range'] = f"bytes={start}-{last}"
+
+        with session.get(url, stream=True, headers=request_headers, timeout=30) as response:
+            # 取消时关闭响应，阻塞在读取网络数据上的下载线程立即返回
+            close_response = stop_event.on_cancel(response.close)
+            try:
+                response.raise_for_status()
+                if response.status_code == 206:
+                    # Content-Range: bytes 100-199/1000
+                    content_range = response.headers.get('content-range', '')
+                    total = content_range.rpartition('/')[2]
+                    cache.set_total_size(int(total) if total.isdigit() else None)
+                    offset = start
+                else:
+                    # 服务器不支持 Range，从头开始
+                    length = response.headers.get('content-length')
+                    cache.set_total_size(int(length) if length and length.isdigit() else None)
+                    offset = 0
+
+                total_size = cache.total_size or 0
+                next_log = offset + total_size // 10
+                for chunk in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+                    if stop_event.is_set():
+                        logger.info("下载被中止")
+                        return False
+                    if not chunk:
+                        continue
+                    cache.write(offset, chunk)
+                    offset += len(chunk)
+                    # 每下载10%更新一次日志
+                    if total_size > 0 and offset >= next_log:
+                        logger.info(f"下载进度: {offset * 100 // total_size}%")
+                        next_log += total_size // 10
+                    if end is not None and offset >= end:
+                        break
+            except Exception:
+                if stop_event.is_set():
+                    logger.info("下载被中止")
+                    return False
+                raise
+            finally:
+                stop_event.remove(close_response)
+        return True
+
+    def _decode_audio_stream(self, decoder: DecodeStream, pcm_buffer: BoundedByteBuffer,
+                             stop_event: CancelToken, pcm_key: str = None):
+        """
+        读取解码器输出并写入PCM缓冲区
         
         参数:
-            process: FFmpeg进程
+            decoder: 歌曲的解码过程（进程内解码或FFmpeg）
+            pcm_buffer: PCM缓冲区，写满时阻塞
+            stop_event: 歌曲的取消令牌
+            pcm_key: 不为空时同时把解码结果写入预解码PCM缓存
         """
+        pcm_writer = None
+        completed = False
         try:
-            buffer_size = AudioConfig.OUTPUT_FRAME_SIZE  # 增加读取缓冲区大小提高效率
-            
-            while not self.stop_event.is_set():
-                # 读取固定大小的数据块
-                chunk = process.stdout.read(buffer_size)
-                if not chunk:
+            if pcm_key and self.pcm_index:
+                pcm_writer = PcmCacheWriter(self._get_pcm_path(pcm_key))
+            for chunk in decoder.chunks(self._pcm_chunk_bytes()):
+                if stop_event.is_set():
+                    break
+                if pcm_writer:
+                    pcm_writer.write(chunk)
+                if not pcm_buffer.write(chunk):
                     break
-                # 将数据块放入队列
-                self.audio_decode_queue.put(chunk)
+            else:
+                completed = decoder.completed
         except Exception as e:
             logger.error(f"解码过程中出错: {str(e)}")
         finally:
             # 标记流结束
-            self.audio_decode_queue.put(None)
+            pcm_buffer.close()
+            if pcm_writer:
+                self._finish_pcm_cache(pcm_key, pcm_writer, completed)
 
-    def _play_audio_stream(self):
-        """播放解码后的音频流"""
+    def _finish_pcm_cache(self, pcm_key: str, pcm_writer: PcmCacheWriter, completed: bool):
+        """只保存完整解码的歌曲，播放被中断时丢弃"""
         try:
-            # 初始化PyAudio
-            self.pyaudio = pyaudio.PyAudio()
-            self.stream = self.pyaudio.open(
-                format=pyaudio.paInt16,
-                channels=AudioConfig.CHANNELS,
-                rate=AudioConfig.OUTPUT_SAMPLE_RATE,
-                output=True,
-                frames_per_buffer=AudioConfig.OUTPUT_FRAME_SIZE
-            )
+            if completed and pcm_writer.commit():
+                self.pcm_index.add(pcm_key, pcm_writer.path)
+                logger.info("已保存预解码PCM缓存，下次播放无需解码")
+            else:
+                pcm_writer.discard()
+        except Exception as e:
+            logger.error(f"保存PCM缓存失败: {str(e)}")
+
+    def _pcm_chunk_bytes(self) -> int:
+        """每次写入播放设备的字节数（一帧）"""
+        return AudioConfig.OUTPUT_FRAME_SIZE * AudioConfig.CHANNELS * 2
+
+    def _play_audio_stream(self, session: CancelToken):
+        """
+        按播放列表顺序播放
+
+        PCM数据写入混音器的音乐总线，与TTS共用同一个输出设备；TTS播放时由
+        混音器压低音乐音量，不再暂停音乐。一首歌的数据读完后直接切换到已预取
+        好的下一首的PCM数据，不等待搜索和下载，实现无缝衔接。
+
+        线程只响应启动时的播放会话令牌：会话被取消后即使已经开始了新的
+        播放会话，旧线程也不会再修改播放状态。
+        """
+        try:
+            music_bus = self._get_music_bus()
+            if music_bus is None:
+                logger.error("音频编解码器未初始化，无法播放音乐")
+                return
 
             logger.info("开始播放音频流...")
+            chunk_bytes = self._pcm_chunk_bytes()
             
-            # 播放状态跟踪变量
-            total_chunks = 0
-            start_time = time.time()
-            playback_started = False
-            
-            # TTS优先级处理相关变量
-            paused_for_tts = False
-            tts_check_time = 0
-            pause_start_time = 0
-            total_pause_time = 0
-            
-            # 添加最后一次数据接收时间
-            last_data_time = time.time()
+            # 打断检查相关变量
+            abort_check_time = 0
             data_timeout = 5.0
+            track = None
+
+            while not session.is_set():
+                # 切歌请求：首次进入、Next/Previous/Play，或上一首已播完
+                with self.queue_lock:
+                    jump = self._jump_to
+                if jump is not None:
+                    track = self._open_track(jump, session)
+                    if track is None:
+                        break
+                    # 播放状态跟踪变量，每首歌重新计算
+                    total_chunks = 0
+                    playback_started = False
+                    last_data_time = time.time()
 
-            while not self.stop_event.is_set():
-                # TTS优先级处理
+                # 打断处理
                 current_time = time.time()
-                if current_time - tts_check_time >= 0.2:
-                    tts_check_time = current_time
-                    paused_for_tts, pause_start_time, total_pause_time = (
-                        self._handle_tts_priority(
-                            self.stream, current_time, paused_for_tts,
-                            pause_start_time, total_pause_time
-                        )
-                    )
-
-                if paused_for_tts:
-                    time.sleep(0.1)
-                    continue
+                if current_time - abort_check_time >= 0.2:
+                    abort_check_time = current_time
+                    if self._handle_abort():
+                        break
 
-                try:
-                    # 从队列获取音频数据
-                    chunk = self.audio_decode_queue.get(timeout=1)
-                    last_data_time = time.time()
-                    
-                    if chunk is None:
-                        if self._check_stream_end(self.stream, total_chunks):
+                # 从PCM缓冲区获取一帧音频数据
+                pcm_buffer = self.pcm_buffer
+                chunk = pcm_buffer.read(chunk_bytes, timeout=1)
+                if chunk is None:
+                    if pcm_buffer.aborted:
+                        if session.is_set():
                             break
+                        continue  # 已切换到其他歌曲
+                    if (playback_started and total_chunks > 0 and
+                            (time.time() - last_data_time) > data_timeout):
+                        logger.info("数据接收超时，认为播放已结束")
+                        chunk = b""
+                    else:
+                        if playback_started and total_chunks > 0:
+                            logger.debug("音频缓冲区暂时为空，等待更多数据...")
                         continue
 
-                    # 播放音频数据
-                    if not self.stop_event.is_set():
-                        self.stream.write(chunk)
-                        total_chunks += 1
+                if not chunk:
+                    logger.info(f"歌曲播放完成: {track.title}")
+                    if not self._advance_track():
+                        break
+                    continue
+                last_data_time = time.time()
 
-                        if not playback_started and total_chunks > 5:
-                            playback_started = True
-                            logger.info("音频播放已开始")
+                # 播放音频数据
+                if not session.is_set():
+                    # 总线已满时阻塞，按实际播放速度消费PCM数据
+                    if not music_bus.write(chunk):
+                        logger.info("混音器已关闭，停止播放")
+                        break
+                    if self._jump_to is not None:
+                        # 写入期间收到切歌请求，丢弃刚写入的旧歌曲数据
+                        music_bus.clear()
+                        continue
+                    total_chunks += 1
 
-                        # 更新播放位置
-                        self.current_position = (
-                            time.time() - start_time - total_pause_time
-                        )
-                        self.position_update_time = time.time()
+                    if not playback_started and total_chunks > 5:
+                        playback_started = True
+                        logger.info("音频播放已开始")
 
-                        # 显示歌词
+                    # 更新播放位置
+                    self.current_position = self._get_played_seconds()
+
+                    # 到达下一句歌词的时间才更新歌词显示
+                    if self.current_position >= self.next_lyric_time:
                         self._update_lyrics()
 
-                        # 更新播放进度显示
-                        if total_chunks % 50 == 0:
-                            self._update_progress_display()
-                    
-                    self.audio_decode_queue.task_done()
-                    
-                except queue.Empty:
-                    if (playback_started and total_chunks > 0 and 
-                            (time.time() - last_data_time) > data_timeout):
-                        logger.info("数据接收超时，认为播放已结束")
-                        self.current_position = self.total_duration
+                    # 更新播放进度显示
+                    if total_chunks % 50 == 0:
                         self._update_progress_display()
-                        break
-                    
-                    if playback_started and total_chunks > 0:
-                        logger.debug("音频队列暂时为空，等待更多数据...")
-                    continue
 
-            # 播放完成时的处理
-            if playback_started and total_chunks > 0:
-                self.current_position = self.total_duration
-                self._update_progress_display()
-                logger.info("歌曲播放完成")
+            if not session.is_set():
+                logger.info("播放列表播放结束")
+                self.playing = False
+                # 根据自动模式设置应用状态
+                if self.app:
+                    self.app.set_device_state(DeviceState.IDLE)
 
         except Exception as e:
             logger.error(f"播放过程中出错: {str(e)}")
         finally:
-            # 在播放线程中调用_stop_playback时，不等待自己结束
-            self.play_thread = None
-            self._stop_playback()
-    
-    def _handle_tts_priority(self, stream, current_time, paused_for_tts, pause_start_time, total_pause_time):
+            # 已开始新的播放会话时由新的播放线程负责，不能清理它的资源
+            with self.queue_lock:
+                current = self.stop_event is session
+            if current:
+                self._stop_playback()
+
+    def _advance_track(self) -> bool:
         """
-        处理TTS优先级逻辑和打断处理
+        当前歌曲播完后请求切换到下一首
+
+        返回 False 表示播放列表已播完，此时在锁内标记停止播放，
+        避免与同时到达的切歌请求冲突。
         """
-        # 检查是否被打断
-        if self.app.aborted:
-            logger.info("检测到打断指令，停止播放")
-            self._stop_playback()
-            return paused_for_tts, pause_start_time, total_pause_time
-
-        # 检查应用程序是否正在播放TTS
-        if self.app and self.app.is_tts_playing:
-            if not paused_for_tts and stream.is_active():
-                logger.info("TTS正在播放，暂停音乐播放")
-                paused_for_tts = True
-                pause_start_time = current_time
-                stream.stop_stream()
-        elif paused_for_tts:
-            # 如果之前因为TTS而暂停，现在恢复播放
-            logger.info("TTS播放结束，恢复音乐播放")
-            paused_for_tts = False
-            # 计算暂停时间
-            total_pause_time += (current_time - pause_start_time)
-            if not stream.is_active():
-                stream.start_stream()
-                # 将应用状态设置为SPEAKING，防止自动模式切换到聆听状态
-                if self.app:
-                    self.app.set_device_state(DeviceState.SPEAKING)
-        
-        return paused_for_tts, pause_start_time, total_pause_time
+        with self.queue_lock:
+            if self._jump_to is not None:
+                return True
+            if self.playlist_index + 1 < len(self.playlist):
+                self._jump_to = self.playlist_index + 1
+                return True
+            self.playing = False
+            return False
 
-    def _check_stream_end(self, stream, total_chunks):
+    def _open_track(self, index: int, session: CancelToken) -> Optional[Track]:
         """
-        检查音频流是否结束
-        
-        参数:
-            stream: 音频流
-            total_chunks: 已播放的数据块数量
-            
+        在播放线程中切换到播放列表的指定位置
+
+        已预取的歌曲直接使用准备好的数据源；无法播放的歌曲会被跳过。
+        返回 None 表示之后已没有可播放的歌曲或播放会话已被取消。
+        """
+        while not session.is_set():
+            with self.queue_lock:
+                if session.is_set():
+                    return None
+                self._jump_to = None
+                if not 0 <= index < len(self.playlist):
+                    self.playing = False
+                    return None
+                track = self.playlist[index]
+                self.playlist_index = index
+                previous, self.current_track = self.current_track, track
+                if track is self.prefetch_track:
+                    self.prefetch_track = None
+                else:
+                    # 之前播放过或被取消的歌曲重新准备
+                    self._arm_track(track)
+            if previous and previous is not track:
+                self._release_track(previous)
+
+            if self._prepare_track(track):
+                with self.queue_lock:
+                    if session.is_set():
+                        return None
+                    self._activate_track(track)
+                self._prefetch(index + 1)
+                return track
+            logger.warning(f"无法播放 '{track.query}'，跳过")
+            index += 1
+        return None
+
+    def _activate_track(self, track: Track):
+        """把歌曲设为当前播放的歌曲"""
+        self.pcm_buffer = track.source
+        self.current_song = track.title
+        self.total_duration = track.duration
+        self.lyrics = track.lyrics
+        self.current_lyric_index = -1  # 确保第一句歌词能显示
+        self.next_lyric_time = 0.0
+        self.current_position = 0
+        # 之后写入音乐总线的数据属于这首歌，按总线的播放进度计算位置
+        music_bus = self._get_music_bus()
+        self.track_start_byte = music_bus.written if music_bus else 0
+        self.playing = True
+        if self.app:
+            self.app.schedule(
+                lambda: self.app.set_chat_message("assistant", f"正在播放: {track.title}")
+            )
+        logger.info(f"切换到: {track.title}")
+
+    def _prefetch(self, index: int):
+        """在后台解析下一首歌曲并预先解码开头部分"""
+        with self.queue_lock:
+            if not 0 <= index < len(self.playlist):
+                return
+            track = self.playlist[index]
+            if track is self.prefetch_track or track is self.current_track:
+                return
+            previous, self.prefetch_track = self.prefetch_track, track
+            self._arm_track(track)
+        if previous:
+            self._release_track(previous)
+        self._create_thread(
+            target=self._prepare_track,
+            name="music_prefetch",
+            args=(track,)
+        ).start()
+
+    def _arm_track(self, track: Track):
+        """为歌曲创建当前播放会话的子令牌（已有未取消的令牌时保留）"""
+        if track.cancel is None or track.cancel.cancelled:
+            track.cancel = self.stop_event.child()
+
+    def _prepare_track(self, track: Track) -> bool:
+        """
+        解析歌曲并启动它的PCM数据源，可以重复调用
+
         返回:
-            bool: 是否结束
+            bool: 数据源是否已就绪
         """
-        # 确认是否真的播放结束，而不是因为缓冲区暂时为空
-        if total_chunks > 0:
-            # 再等待一小段时间，确认没有更多数据
+        with track.lock:
+            if not track.resolved.is_set():
+                self._resolve_track(track)
+            if track.ok and track.source is None and not track.cancel.cancelled:
+                try:
+                    self._start_source(track)
+                except Exception as e:
+                    logger.error(f"准备歌曲 {track.title} 失败: {str(e)}")
+                    self._release_track(track)
+            if track.cancel.cancelled:
+                # 准备期间被取消
+                self._release_track(track)
+            return track.source is not None
+
+    def _start_source(self, track: Track):
+        """
+        为歌曲启动PCM数据源
+
+        优先使用预解码的PCM缓存，其次是MP3缓存，都没有时边下载边解码：
+        下载线程 -> 缓存文件 -> 解码器 -> 解码线程 -> PCM缓冲区。
+        解码器默认在进程内解码，未安装 PyAV 时使用 FFmpeg 子进程。
+        解码结果受缓冲区容量限制，预取的歌曲只会预先解码开头几秒。
+        """
+        cache_key = track.cache_key
+        pcm_key = self._pcm_cache_key(cache_key)
+        pcm_path = self.pcm_index.lookup(pcm_key) if self.pcm_index else None
+        if pcm_path:
             try:
-                next_chunk = self.audio_decode_queue.get(timeout=2)
-                if next_chunk is not None:
-                    stream.write(next_chunk)
-                    return False
-            except queue.Empty:
-                # 确认没有更多数据，可以结束播放
-                logger.info("音频流结束")
-                return True
-        # 如果还没有播放任何数据，继续等待
-        return False
+                track.source = MappedPcmReader(pcm_path)
+                track.cancel.on_cancel(track.source.abort)
+                return
+            except (OSError, ValueError) as e:
+                logger.error(f"打开PCM缓存失败: {str(e)}")
+                self.pcm_index.remove(pcm_key)
+
+        stop_event = track.cancel
+        cache_path = self.cache_index.lookup(cache_key)
+        if cache_path:
+            # 播放MP3缓存时同时生成PCM缓存
+            source = cache_path
+        else:
+            cache = ProgressiveCacheFile(self._get_cache_path(cache_key))
+            track.cache = cache
+            if cache.total_size and cache.cached_bytes:
+                logger.info(
+                    f"已缓存 {cache.cached_bytes * 100 // cache.total_size}%，续传剩余部分"
+                )
+            # 下载线程只负责补齐缓存，不受播放速度影响
+            self._create_thread(
+                target=self._download_to_cache,
+                name="mp3_download",
+                args=(track.url, cache, stop_event)
+            ).start()
+            source = CacheStreamReader(cache, stop_event)
+            pcm_key = None
+
+        track.decoder = create_decode_stream(
+            source, AudioConfig.OUTPUT_SAMPLE_RATE, AudioConfig.CHANNELS
+        )
+        logger.debug(f"使用 {track.decoder.name} 解码")
+        track.source = self._new_pcm_buffer()
+        # 取消时关闭解码器、中止缓冲区，解码线程和播放线程的阻塞读写立即返回
+        stop_event.on_cancel(track.decoder.close)
+        stop_event.on_cancel(track.source.abort)
+        self._create_thread(
+            target=self._decode_audio_stream,
+            name="audio_decode",
+            args=(track.decoder, track.source, stop_event, pcm_key)
+        ).start()
+
+    def _release_track(self, track: Track):
+        """停止一首歌的下载和解码，保留已下载的缓存以便续传"""
+        if track.cancel is not None:
+            # 取消回调负责中止数据源和关闭解码器
+            track.cancel.cancel()
+        track.source = None
+        track.decoder = None
+        if track.cache:
+            try:
+                track.cache.close()
+            except Exception as e:
+                logger.error(f"保存缓存进度失败: {str(e)}")
+            track.cache = None
     
+    def _handle_abort(self) -> bool:
+        """
+        处理打断指令
+
+        TTS播放时音乐由混音器自动压低音量，这里只需要处理打断。
+        返回 True 表示已停止播放。
+        """
+        if self.app and self.app.aborted:
+            logger.info("检测到打断指令，停止播放")
+            self._stop_playback()
+            return True
+        return False
+
     def _update_progress_display(self):
         """更新播放进度显示"""
         progress = self._get_progress()
         position_str = self._format_time(self.current_position)
         duration_str = self._format_time(self.total_duration)
         status_text = f"播放中: {position_str}/{duration_str} ({progress}%)"
-        
-        # 检查是否接近播放结束（允许1秒误差）
-        if self.total_duration > 0 and (self.total_duration - self.current_position) <= 1:
-            logger.info(f"歌曲 '{self.current_song}' 播放完成")
-            self.playing = False
-            # 根据自动模式设置应用状态
-            self.app.set_device_state(DeviceState.IDLE)
-            # 设置停止事件，确保资源被释放
-            self.stop_event.set()
-            return
 
         # 更新Application显示
         if self.app and self.app.display:
@@ -807,252 +1268,17 @@ class MusicPlayer(Thing):
         seconds = int(seconds) % 60
         return f"{minutes:02d}:{seconds:02d}"
 
-    def _process_audio(self, url: str, song_id: str = None):
-        """处理音频URL，实现并行的流式下载、转换和播放"""
-        try:
-            # 检查是否有缓存
-            if song_id and self._is_song_cached(song_id):
-                cache_path = self._get_cache_path(song_id)
-                # 直接播放缓存文件
-                self._play_cached_file(cache_path)
-                return
-
-            # 创建下载队列
-            download_queue = queue.Queue(maxsize=100)
-            
-            # 如果有song_id，启动单独的下载线程保存完整MP3文件
-            if song_id:
-                cache_path = self._get_cache_path(song_id)
-                download_thread = self._create_thread(
-                    target=self._download_mp3,
-                    name="mp3_download",
-                    args=(url, cache_path)
-                )
-                download_thread.start()
-
-            # 创建流式下载线程（用于实时播放）
-            stream_thread = self._create_thread(
-                target=self._download_stream,
-                name="stream_download",
-                args=(url, download_queue)
-            )
-            stream_thread.start()
-
-            # 创建FFmpeg转换进程
-            cmd = [
-                'ffmpeg',
-                '-f', 'mp3',
-                '-i', 'pipe:0',
-                '-f', 's16le',
-                '-ar', str(AudioConfig.OUTPUT_SAMPLE_RATE),
-                '-ac', str(AudioConfig.CHANNELS),
-                'pipe:1'
-            ]
-            self.convert_process = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-
-            # 创建解码线程
-            decode_thread = self._create_thread(
-                target=self._decode_audio_stream,
-                name="audio_decode",
-                args=(self.convert_process,)
-            )
-            decode_thread.start()
-
-            # 创建播放线程
-            play_thread = self._create_thread(
-                target=self._play_audio_stream,
-                name="audio_play"
-            )
-            play_thread.start()
-
-            # 从下载队列读取数据并写入转换进程
-            self._feed_download_to_converter(
-                download_queue, 
-                self.convert_process
-            )
-
-            # 如果没有被中止，等待所有线程完成
-            if not self.stop_event.is_set():
-                stream_thread.join()
-                self._remove_thread(stream_thread)
-                
-                decode_thread.join()
-                self._remove_thread(decode_thread)
-                
-                play_thread.join()
-                self._remove_thread(play_thread)
-                
-                if song_id:
-                    download_thread.join()
-                    self._remove_thread(download_thread)
-
-        except Exception as e:
-            logger.error(f"音频处理过程中出错: {str(e)}")
-        finally:
-            self._stop_playback()
-
-    def _download_mp3(self, url: str, cache_path: str):
-        """
-        下载完整的MP3文件到缓存目录
-        
-        参数:
-            url: 音频URL
-            cache_path: 缓存文件路径
-        """
-        try:
-            # 使用配置中的请求头
-            headers = self.config.get("HEADERS", {}).copy()
-            headers.update({
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Referer': 'https://music.163.com/'
-            })
-            
-            # 创建临时文件路径
-            temp_path = cache_path + '.temp'
-            self.current_temp_file = temp_path  # 记录当前临时文件路径
-            
-            with requests.get(url, stream=True, headers=headers, timeout=30) as response:
-                response.raise_for_status()
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded = 0
-                
-                with open(temp_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=32768):
-                        if self.stop_event.is_set():
-                            logger.info("缓存下载被中止")
-                            break
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
-                            # 每下载10%更新一次日志
-                            if total_size > 0 and downloaded % (total_size // 10) < 32768:
-                                progress = downloaded * 100 // total_size
-                                logger.info(f"缓存下载进度: {progress}%")
-                
-                # 下载完成后，将临时文件重命名为正式文件
-                if not self.stop_event.is_set() and downloaded == total_size:
-                    os.replace(temp_path, cache_path)
-                    logger.info("MP3文件已缓存到本地")
-                    self.current_temp_file = None
-                else:
-                    # 如果下载被中止或不完整，删除临时文件
-                    if os.path.exists(temp_path):
-                        os.remove(temp_path)
-                        logger.info("已清理未完成的临时文件")
-                    self.current_temp_file = None
-            
-        except Exception as e:
-            logger.error(f"下载MP3文件失败: {str(e)}")
-            # 清理临时文件
-            if self.current_temp_file and os.path.exists(self.current_temp_file):
-                try:
-                    os.remove(self.current_temp_file)
-                    logger.info("已清理临时文件")
-                except Exception as e:
-                    logger.error(f"清理临时文件失败: {str(e)}")
-                finally:
-                    self.current_temp_file = None
-
-    def _play_cached_file(self, cache_path: str):
-        """播放缓存文件"""
-        try:
-            # 创建FFmpeg转换进程
-            cmd = [
-                'ffmpeg',
-                '-i', cache_path,
-                '-f', 's16le',
-                '-ar', str(AudioConfig.OUTPUT_SAMPLE_RATE),  # 使用配置中的采样率
-                '-ac', str(AudioConfig.CHANNELS),  # 使用配置中的声道数
-                'pipe:1'
-            ]
-            self.convert_process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-
-            # 创建解码线程
-            decode_thread = self._create_thread(
-                target=self._decode_audio_stream,
-                name="cache_decode",
-                args=(self.convert_process,)
-            )
-            decode_thread.start()
-
-            # 创建播放线程
-            play_thread = self._create_thread(
-                target=self._play_audio_stream,
-                name="cache_play"
-            )
-            play_thread.start()
-
-            # 等待播放完成
-            if not self.stop_event.is_set():
-                decode_thread.join()
-                self._remove_thread(decode_thread)
-                play_thread.join()
-                self._remove_thread(play_thread)
-
-        except Exception as e:
-            logger.error(f"播放缓存文件失败: {str(e)}")
-        finally:
-            if self.convert_process:
-                try:
-                    self.convert_process.terminate()
-                except Exception as e:
-                    logger.debug(f"终止转换进程时出错: {str(e)}")
-                self.convert_process = None
-
-    def _feed_download_to_converter(self, download_queue: queue.Queue, convert_process: subprocess.Popen):
-        """
-        将下载的数据喂给转换进程
-        
-        参数:
-            download_queue: 下载队列
-            convert_process: 转换进程
-        """
-        try:
-            while not self.stop_event.is_set():
-                try:
-                    chunk = download_queue.get(timeout=1)
-                    if chunk is None:
-                        logger.info("下载完成，关闭转换进程输入")
-                        break
-                    if convert_process.poll() is None:  # 检查进程是否还在运行
-                        convert_process.stdin.write(chunk)
-                    else:
-                        logger.warning("转换进程已终止")
-                        break
-                    download_queue.task_done()
-                except queue.Empty:
-                    continue
-                except BrokenPipeError:
-                    logger.error("管道已断开")
-                    break
-                except Exception as e:
-                    logger.error(f"写入转换进程时出错: {str(e)}")
-                    break
-        finally:
-            # 关闭转换进程的输入
-            try:
-                if convert_process.poll() is None:
-                    convert_process.stdin.close()
-                    logger.debug("已关闭转换进程输入")
-            except Exception as e:
-                logger.debug(f"关闭转换进程输入时出错: {str(e)}")
-
-    def _fetch_lyrics(self, song_id: str):
+    def _fetch_lyrics(self, song_id: str) -> List[Tuple[float, str]]:
         """
         获取歌词
         
         参数:
             song_id: 歌曲ID
+            
+        返回:
+            List[Tuple[float, str]]: [(时间, 文本), ...]，获取失败时为空列表
         """
+        lyrics = []
         try:
             # 从配置中获取请求头和API URL
             headers = self.config.get("HEADERS", {})
@@ -1062,7 +1288,7 @@ class MusicPlayer(Thing):
             lyric_api_url = f"{lyric_url}?musicId={song_id}"
             logger.info(f"获取歌词URL: {lyric_api_url}")
             
-            response = requests.get(lyric_api_url, headers=headers, timeout=10)
+            response = self.api_session.get(lyric_api_url, headers=headers, timeout=10)
             response.raise_for_status()
             
             # 添加错误处理
@@ -1073,7 +1299,6 @@ class MusicPlayer(Thing):
                 # 解析歌词
                 if data.get("status") == 200 and data.get("data") and data["data"].get("lrclist"):
                     lrc_list = data["data"]["lrclist"]
-                    self.lyrics = []
                     
                     for lrc in lrc_list:
                         time_sec = float(lrc.get("time", "0"))
@@ -1082,9 +1307,9 @@ class MusicPlayer(Thing):
                         # 跳过空歌词和元信息歌词
                         if (text and not text.startswith("作词") and not text.startswith("作曲") 
                                 and not text.startswith("编曲")):
-                            self.lyrics.append((time_sec, text))
+                            lyrics.append((time_sec, text))
                     
-                    logger.info(f"成功获取歌词，共 {len(self.lyrics)} 行")
+                    logger.info(f"成功获取歌词，共 {len(lyrics)} 行")
                 else:
                     logger.warning(f"未获取到歌词或歌词格式错误: {data.get('msg', '')}")
             except ValueError as e:
@@ -1095,55 +1320,27 @@ class MusicPlayer(Thing):
                     logger.warning(f"歌词API响应内容: {sample}")
         except Exception as e:
             logger.error(f"获取歌词失败: {str(e)}")
+        return lyrics
 
     def _update_lyrics(self):
         """
         根据当前播放位置更新歌词显示
         
-        在适当的时间点显示对应的歌词，考虑TTS优先级
+        在适当的时间点显示对应的歌词，考虑TTS优先级。更新后记录下一句歌词
+        的时间，播放线程到达该位置前不再调用本方法。
         """
         # 如果没有歌词或应用程序正在说话，不更新歌词
         if not self.lyrics or (self.app and self.app.is_tts_playing):
             return
 
-        current_time = self.current_position
-        
         # 查找当前时间对应的歌词
-        current_index = self._find_current_lyric_index(current_time)
+        current_index = self.lyrics.index_at(self.current_position)
+        self.next_lyric_time = self.lyrics.next_time
         
         # 如果歌词索引变化了，更新显示
         if current_index != self.current_lyric_index:
             self._display_current_lyric(current_index)
     
-    def _find_current_lyric_index(self, current_time: float) -> int:
-        """
-        查找当前时间对应的歌词索引
-        
-        参数:
-            current_time: 当前播放时间（秒）
-            
-        返回:
-            int: 当前歌词索引
-        """
-        # 查找下一句歌词
-        next_lyric_index = None
-        for i, (time_sec, _) in enumerate(self.lyrics):
-            # 添加一个小的偏移量(0.5秒)，使歌词显示更准确
-            if time_sec > current_time - 0.5:
-                next_lyric_index = i
-                break
-
-        # 确定当前歌词索引
-        if next_lyric_index is not None and next_lyric_index > 0:
-            # 如果找到下一句歌词，当前歌词就是它的前一句
-            return next_lyric_index - 1
-        elif next_lyric_index is None and self.lyrics:
-            # 如果没找到下一句，说明已经到最后一句
-            return len(self.lyrics) - 1
-        else:
-            # 其他情况（如播放刚开始）
-            return 0
-    
     def _display_current_lyric(self, current_index: int):
         """
         显示当前歌词
@@ -1154,7 +1351,7 @@ class MusicPlayer(Thing):
         self.current_lyric_index = current_index
         
         if current_index < len(self.lyrics):
-            time_sec, text = self.lyrics[current_index]
+            text = self.lyrics.text(current_index)
             
             # 只在应用程序不在说话时更新UI
             # 创建歌词文本副本，避免引用可能变化的变量
@@ -1170,6 +1367,18 @@ class MusicPlayer(Thing):
             self.app.schedule(lambda: self.app.set_chat_message("assistant", lyric_text))
             logger.debug(f"显示歌词: {lyric_text}")
 
+    def _create_http_session(self, trust_env: bool = True) -> requests.Session:
+        """创建HTTP会话，同一主机的请求复用保持连接的连接池"""
+        session = requests.Session()
+        session.trust_env = trust_env
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.HTTP_POOL_SIZE,
+            pool_maxsize=self.HTTP_POOL_SIZE
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
     def _ensure_cache_dir(self):
         """确保缓存目录存在"""
         try:
@@ -1179,11 +1388,51 @@ class MusicPlayer(Thing):
         except Exception as e:
             logger.error(f"创建缓存目录失败: {str(e)}")
 
+    def _create_cache_index(self) -> MusicCacheIndex:
+        """创建缓存索引，登记旧版本留下的缓存文件"""
+        config = ConfigManager.get_instance()
+        max_mb = config.get_config("MUSIC_CACHE.MAX_MB", 1024) or 0
+        policy = config.get_config("MUSIC_CACHE.POLICY", "lru")
+        if policy not in MusicCacheIndex.POLICIES:
+            logger.warning(f"未知的缓存淘汰策略 {policy}，使用 lru")
+            policy = "lru"
+        index = MusicCacheIndex(self.cache_dir, int(max_mb * 1024 * 1024), policy)
+        index.scan()
+        return index
+
+    def _create_pcm_index(self):
+        """创建预解码PCM缓存索引，使用独立的目录和容量上限"""
+        config = ConfigManager.get_instance()
+        if not config.get_config("MUSIC_CACHE.PCM_ENABLED", True):
+            return None
+        max_mb = config.get_config("MUSIC_CACHE.PCM_MAX_MB", 512) or 0
+        policy = self.cache_index.policy
+        index = MusicCacheIndex(os.path.join(self.cache_dir, "pcm"),
+                                int(max_mb * 1024 * 1024), policy)
+        index.scan(".pcm")
+        return index
+
+    def _pcm_cache_key(self, cache_key: str) -> str:
+        """PCM缓存键包含输出格式，采样率或声道数变化后不会用错缓存"""
+        return f"{cache_key}_{AudioConfig.OUTPUT_SAMPLE_RATE}_{AudioConfig.CHANNELS}"
+
+    def _get_pcm_path(self, pcm_key: str) -> str:
+        """获取预解码PCM缓存文件路径"""
+        return os.path.join(self.pcm_index.cache_dir, f"{pcm_key}.pcm")
+
     def _get_cache_path(self, song_id: str) -> str:
         """获取歌曲缓存文件路径"""
         return os.path.join(self.cache_dir, f"{song_id}.mp3")
 
     def _is_song_cached(self, song_id: str) -> bool:
-        """检查歌曲是否已缓存"""
-        cache_path = self._get_cache_path(song_id)
-        return os.path.exists(cache_path)
\ No newline at end of file
+        """检查歌曲是否已缓存（不计入命中率）"""
+        return self.cache_index.contains(song_id)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """缓存统计：命中次数、未命中次数、文件数、占用字节数和命中率"""
+        stats = self.cache_index.stats()
+        stats["hit_rate"] = self.cache_index.hit_rate
+        if self.pcm_index:
+            stats["pcm"] = self.pcm_index.stats()
+            stats["pcm"]["hit_rate"] = self.pcm_index.hit_rate
+        return stats
\ No newline at end of file
@@ -21,8 +21,10 @@ class QueryBridgeRAG(Thing):
         self.last_query = ""
         
         # 注册属性
-        self.add_property("query_result", "当前查询结果", lambda: self.query_result)
-        self.add_property("last_query", "上次查询内容", lambda: self.last_query)
+        self.add_property("query_result", "当前查询结果", lambda: self.query_result,
+                          ValueType.STRING)
+        self.add_property("last_query", "上次查询内容", lambda: self.last_query,
+                          ValueType.STRING)
         
         self._register_methods()
 
@@ -2,6 +2,7 @@ from src.iot.thing import Thing, Parameter, ValueType
 import logging
 from typing import Dict, Any
 import asyncio
+from src.utils.notification_dispatcher import NotificationDispatcher, SpeechSink
 from src.utils.reminder import ReminderManager
 from src.utils.reminder_commands import process_reminder_command, process_countdown_command
 import re
@@ -26,6 +27,12 @@ class ReminderThing(Thing):
         from src.application import Application
         self.app = Application.get_instance()
         
+        # 提醒触发时除桌面通知外再语音播报
+        NotificationDispatcher.get_instance().add_sink(SpeechSink(self.app))
+        
+        # 恢复上次运行时未完成的提醒，已过期的立即触发
+        ReminderManager.restore()
+        
         logger.info("提醒管理器初始化完成")
         
         # 注册属性和方法
@@ -37,7 +44,8 @@ class ReminderThing(Thing):
         self.add_property(
             "ActiveReminders",
             "当前活跃的提醒数量",
-            lambda: len(ReminderManager._active_reminders)
+            ReminderManager.active_count,
+            ValueType.NUMBER
         )
     
     def _register_methods(self):
@@ -46,7 +54,7 @@ class ReminderThing(Thing):
             "SetReminder", 
             "设置一个提醒",
             [
-                Parameter("time_str", "时间字符串，如'10s后'、'5分钟后'等", ValueType.STRING, True),
+                Parameter("time_str", "时间字符串，如'10s后'、'5分钟后'、'明天早上8点'、'每天9点'等", ValueType.STRING, True),
                 Parameter("message", "提醒内容", ValueType.STRING, True)
             ],
             lambda params: self._set_reminder(
@@ -104,7 +112,7 @@ class ReminderThing(Thing):
                     logger.error(f"发送反馈消息失败: {e}")
             
             # 向服务器发送操作结果状态更新
-            self.app.schedule(lambda: self.app._update_iot_states())
+            self.app._update_iot_states(self.name)
             
             return result
             
@@ -153,7 +161,7 @@ class ReminderThing(Thing):
                     logger.error(f"发送反馈消息失败: {e}")
             
             # 向服务器发送操作结果状态更新
-            self.app.schedule(lambda: self.app._update_iot_states())
+            self.app._update_iot_states(self.name)
             
             return result
             
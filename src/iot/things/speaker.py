@@ -14,14 +14,24 @@ class Speaker(Thing):
             # 如果获取失败，使用默认值
             self.volume = 100  # 默认音量
 
-        # 定义属性
-        self.add_property("volume", "当前音量值", lambda: self.volume)
+        # 定义属性，音量可能在界面或系统中被修改，读取实际音量并缓存1秒
+        self.add_property("volume", "当前音量值", self._get_volume,
+                          ValueType.NUMBER, ttl=1.0)
 
         # 定义方法
         self.add_method("SetVolume", "设置音量",
                         [Parameter("volume", "0到100之间的整数", ValueType.NUMBER, True)],
                         lambda params: self._set_volume(params["volume"].get_value()))
 
+    def _get_volume(self):
+        try:
+            display = Application.get_instance().display
+            if display:
+                self.volume = display.current_volume
+        except Exception:
+            pass
+        return self.volume
+
     def _set_volume(self, volume):
         if 0 <= volume <= 100:
             self.volume = volume
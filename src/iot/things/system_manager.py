@@ -106,7 +106,7 @@ class SystemManager(Thing):
                         logger.error(f"发送错误反馈消息失败: {e}")
             
             # 向服务器发送操作结果状态更新
-            self.app.schedule(lambda: self.app._update_iot_states())
+            self.app._update_iot_states(self.name)
             
             return result
             
@@ -183,7 +183,7 @@ class SystemManager(Thing):
                         logger.error(f"发送错误反馈消息失败: {e}")
             
             # 向服务器发送操作结果状态更新
-            self.app.schedule(lambda: self.app._update_iot_states())
+            self.app._update_iot_states(self.name)
             
             return result
             
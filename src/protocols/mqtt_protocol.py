@@ -53,8 +53,10 @@ class MqttProtocol(Protocol):
 
         # 首先尝试获取MQTT配置
         try:
-            # 尝试从OTA服务器获取MQTT配置
-            mqtt_config = self.config.get_config("MQTT_INFO")
+            # 尝试从OTA服务器获取MQTT配置（启动时已在后台请求）
+            mqtt_config = await asyncio.get_running_loop().run_in_executor(
+                None, self.config.wait_for_mqtt_info, 10
+            )
 
             # 更新MQTT配置
             self.endpoint = mqtt_config.get("endpoint")
@@ -83,18 +83,19 @@ class Protocol:
 
     async def send_iot_descriptors(self, descriptors):
         """发送物联网设备描述信息"""
-        message = {
-            "session_id": self.session_id,
-            "type": "iot",
-            "descriptors": json.loads(descriptors) if isinstance(descriptors, str) else descriptors
-        }
-        await self.send_text(json.dumps(message))
+        await self.send_text(self._build_iot_message("descriptors", descriptors))
 
     async def send_iot_states(self, states):
         """发送物联网设备状态信息"""
-        message = {
-            "session_id": self.session_id,
-            "type": "iot",
-            "states": json.loads(states) if isinstance(states, str) else states
-        }
-        await self.send_text(json.dumps(message))
\ No newline at end of file
+        await self.send_text(self._build_iot_message("states", states))
+
+    def _build_iot_message(self, key: str, payload) -> str:
+        """组装物联网消息，已序列化的 JSON 直接拼接，不再重复解析"""
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8")
+        if not isinstance(payload, str):
+            payload = json.dumps(payload)
+        return (
+            f'{{"session_id": {json.dumps(self.session_id)}, '
+            f'"type": "iot", "{key}": {payload}}}'
+        )
\ No newline at end of file
@@ -1,13 +1,11 @@
-from datetime import datetime
-import time
-import threading
-from winotify import Notification, audio
 import os
-import queue
 import logging
 import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.reminder import ReminderManager
+# 通过 src.utils 导入，与 src/iot/things 中的提醒组件共用同一个 ReminderManager，
+# 避免以 utils.reminder 再加载一份模块导致提醒被重复调度
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.utils.notification_dispatcher import NotificationDispatcher
+from src.utils.reminder import ReminderManager
 
 logger = logging.getLogger(__name__)
 
@@ -69,11 +67,6 @@ class ReminderThing(Thing):
         super().__init__(thing_id)
         self.name = "ReminderThing"
         self.description = "提醒功能管理器"
-        
-        # 通知队列和处理线程
-        self._notification_queue = queue.Queue()
-        self._notification_thread = None
-        self._stop_notification = False
 
     def initialize(self) -> bool:
         """初始化设备
@@ -81,67 +74,19 @@ class ReminderThing(Thing):
         Returns:
             bool: 初始化是否成功
         """
-        self._start_notification_thread()
+        # 恢复上次运行时未完成的提醒，已过期的立即触发
+        ReminderManager.restore()
         return True
 
-    def _start_notification_thread(self):
-        """启动通知处理线程"""
-        self._stop_notification = False
-        self._notification_thread = threading.Thread(target=self._process_notifications)
-        self._notification_thread.daemon = True
-        self._notification_thread.start()
-
-    def _process_notifications(self):
-        """处理通知队列的循环"""
-        while not self._stop_notification:
-            try:
-                # 从队列获取通知信息，设置超时以便能够响应停止信号
-                try:
-                    title, msg, duration = self._notification_queue.get(timeout=1)
-                except queue.Empty:
-                    continue
-
-                # 创建并显示通知
-                try:
-                    toast = Notification(
-                        app_id="提醒助手",
-                        title=title,
-                        msg=msg,
-                        duration=duration
-                    )
-                    toast.set_audio(audio.Default, loop=False)
-                    toast.show()
-                    
-                    # 记录通知发送
-                    logger.info(f"已发送通知 - 标题: {title}, 内容: {msg}")
-                    
-                    # 短暂延时确保通知显示
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    logger.error(f"显示通知失败: {e}")
-                
-                finally:
-                    # 标记任务完成
-                    self._notification_queue.task_done()
-                    
-            except Exception as e:
-                logger.error(f"处理通知时出错: {e}")
-                time.sleep(1)  # 发生错误时等待一下
-
-    def _show_notification(self, title: str, msg: str, duration: str = "short"):
-        """将通知加入队列
+    def _show_notification(self, title: str, msg: str):
+        """发送通知，由通知分发器在后台显示，不阻塞调用方
         
         Args:
             title: 通知标题
             msg: 通知内容
-            duration: 通知持续时间
         """
-        try:
-            self._notification_queue.put((title, msg, duration))
-            logger.info(f"通知已加入队列 - 标题: {title}")
-        except Exception as e:
-            logger.error(f"添加通知到队列失败: {e}")
+        NotificationDispatcher.get_instance().notify(title, msg)
+        logger.info(f"通知已提交 - 标题: {title}")
 
     def process_command(self, command: str, params: dict) -> dict:
         """处理接收到的命令
@@ -205,10 +150,3 @@ class ReminderThing(Thing):
             "status": "online",
             "active_reminders": active_count
         }
-
-    def cleanup(self):
-        """清理资源"""
-        self._stop_notification = True
-        
-        if self._notification_thread:
-            self._notification_thread.join(timeout=2) 
\ No newline at end of file
@@ -0,0 +1,628 @@
+"""
+应用程序索引
+
+"打开某某"时不再每次遍历开始菜单、桌面和注册表：所有能启动的程序在后台
+扫描一次，保存在 cache/app_index.json 中，下次启动直接加载。
+
+索引按目录记录修改时间，刷新时只重新列出修改时间变化的目录（新增或删除了
+快捷方式），其余目录沿用上次的结果；注册表按键的最后写入时间判断。没有变化时
+一次刷新不到 1 毫秒，所以索引过旧或查询找不到时都会再刷新一次，运行期间新安装
+的程序不需要重启就能找到。
+
+来源:
+    Windows: 开始菜单和桌面的快捷方式、PATH 中的 .exe、注册表 Uninstall 项
+    Linux:   XDG 目录下的 .desktop 文件、PATH 中的可执行文件
+
+查询先按规范化后的名称精确查找，找不到时用名称的二元字组倒排索引挑出
+少量候选再计算相似度，不需要对每个程序运行 difflib。
+"""
+
+import difflib
+import json
+import logging
+import os
+import shlex
+import shutil
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("AppIndex")
+
+# 名称中常见的修饰词，比较前去掉
+_NAME_SUFFIXES = ["应用", "软件", "程序", "app", "客户端", "工具", "学习版", "专业版",
+                  "免费版", "最新版", "官方版", "中文版", "英文版", "完整版", "精简版", "便携版"]
+
+# 同分时的来源优先级：用户能在菜单中看到的程序优先
+_SOURCE_PRIORITY = {"start_menu": 0, "desktop": 1, "desktop_file": 1, "registry": 2, "path": 3}
+
+# .desktop Exec 中的占位参数
+_EXEC_FIELD_CODES = {"%f", "%F", "%u", "%U", "%d", "%D", "%n", "%N", "%i", "%c", "%k", "%v", "%m"}
+
+
+def normalize_name(name: str) -> str:
+    """小写并去掉"软件"、"客户端"等修饰词"""
+    name = name.lower()
+    for suffix in _NAME_SUFFIXES:
+        name = name.replace(suffix, "")
+    return name.strip()
+
+
+def _similarity(name1: str, name2: str) -> int:
+    """两个已规范化名称的相似度(0-100)"""
+    if name1 == name2:
+        return 100
+    if name1 and name2 and (name1 in name2 or name2 in name1):
+        return int(min(len(name1), len(name2)) / max(len(name1), len(name2)) * 90)
+    return int(difflib.SequenceMatcher(None, name1, name2).ratio() * 80)
+
+
+def _bounded_similarity(matcher: difflib.SequenceMatcher, name1: str, name2: str,
+                        floor: int) -> Optional[int]:
+    """
+    与 _similarity 相同，但能确定分数低于 floor 时提前返回 None
+
+    matcher 已通过 set_seq2 设置为 name1，逐个比较名称时不必重复预处理查询。
+    """
+    if name1 == name2:
+        return 100
+    if name1 in name2 or name2 in name1:
+        return int(min(len(name1), len(name2)) / max(len(name1), len(name2)) * 90)
+    matcher.set_seq1(name2)
+    # real_quick_ratio 和 quick_ratio 都是 ratio 的上界，代价低得多
+    if matcher.real_quick_ratio() * 80 < floor or matcher.quick_ratio() * 80 < floor:
+        return None
+    return int(matcher.ratio() * 80)
+
+
+def get_name_similarity(name1: str, name2: str) -> int:
+    """
+    计算两个名称的相似度
+
+    参数:
+        name1: 第一个名称
+        name2: 第二个名称
+
+    返回:
+        int: 相似度得分(0-100)，完全相同 100，包含关系最高 90，其余最高 80
+    """
+    return _similarity(normalize_name(name1), normalize_name(name2))
+
+
+def _grams(text: str) -> Iterable[str]:
+    if len(text) < 2:
+        return (text,) if text else ()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def default_roots() -> List[Tuple[str, str, bool]]:
+    """当前系统需要扫描的目录：(目录, 来源, 是否递归)"""
+    roots = []
+    if os.name == "nt":
+        for base in (os.environ.get("ProgramData", ""), os.environ.get("APPDATA", "")):
+            if base:
+                roots.append((os.path.join(base, "Microsoft", "Windows", "Start Menu", "Programs"),
+                              "start_menu", True))
+        for base in (os.environ.get("USERPROFILE", ""), os.environ.get("PUBLIC", "")):
+            if base:
+                roots.append((os.path.join(base, "Desktop"), "desktop", False))
+    else:
+        data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+        data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+        bases = [data_home] + data_dirs.split(":") + [
+            "/var/lib/flatpak/exports/share",
+            os.path.expanduser("~/.local/share/flatpak/exports/share"),
+        ]
+        for base in bases:
+            if base:
+                roots.append((os.path.join(base, "applications"), "desktop_file", True))
+    for path_dir in os.environ.get("PATH", "").split(os.pathsep):
+        if path_dir:
+            roots.append((path_dir, "path", False))
+    return roots
+
+
+class AppIndex:
+    """持久化的应用程序索引（单例）"""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    INDEX_PATH = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "cache", "app_index.json"
+    )
+    VERSION = 1
+    # 第一次运行没有索引文件时，查询最多等待后台扫描的时间（秒）
+    BUILD_WAIT = 10.0
+    # 模糊查询只对共享二元字组最多的若干个名称计算相似度
+    MAX_CANDIDATES = 32
+    # 距上次刷新超过该时间（秒）的查询在后台刷新索引
+    REFRESH_INTERVAL = 60.0
+    # 查询找不到时先刷新再查一次，两次这样的刷新至少间隔该时间（秒）
+    MISS_REFRESH_INTERVAL = 2.0
+    # 找不到时最多等待刷新的时间（秒），超时后刷新在后台继续，下次查询生效
+    MISS_REFRESH_WAIT = 0.3
+
+    REGISTRY_PATHS = (
+        r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
+        r"SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Uninstall",
+    )
+
+    @classmethod
+    def get_instance(cls):
+        """获取索引实例，第一次调用时加载索引文件并在后台刷新"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                cls._instance.load()
+                cls._instance.refresh_async()
+        return cls._instance
+
+    def __init__(self, path: Optional[str] = None,
+                 roots: Optional[List[Tuple[str, str, bool]]] = None,
+                 scan_registry: Optional[bool] = None):
+        self.path = path or self.INDEX_PATH
+        self.roots = roots if roots is not None else default_roots()
+        self.scan_registry = os.name == "nt" if scan_registry is None else scan_registry
+        # 目录 -> {"mtime", "source", "entries", "subdirs"}
+        self._dirs: Dict[str, Dict[str, Any]] = {}
+        # 注册表路径 -> {"mtime", "entries"}
+        self._registry: Dict[str, Dict[str, Any]] = {}
+        # 查询结构，刷新时整体替换，查询不需要加锁
+        self._names: List[Tuple[str, Dict[str, Any]]] = []  # (规范化名称, 条目)
+        self._by_name: Dict[str, List[int]] = {}
+        self._postings: Dict[str, List[int]] = {}
+        self._query_cache: Dict[Tuple, Optional[Dict[str, Any]]] = {}
+        self._normalized: Dict[str, str] = {}  # 名称 -> 规范化名称
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._dirty = False
+        self.ready = threading.Event()  # 至少有一份可用的索引
+        self.last_refresh = {"rescanned": 0, "dirs": 0, "seconds": 0.0}
+        self._refreshed_at: Optional[float] = None  # 上次刷新完成的 time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    # ------------------------------------------------------------------ 持久化
+
+    def load(self) -> bool:
+        """加载索引文件，成功后立即可以查询"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != self.VERSION:
+            return False
+        self._dirs = data.get("dirs", {})
+        self._registry = data.get("registry", {})
+        self._rebuild()
+        self.ready.set()
+        logger.info(f"已加载应用程序索引: {len(self._names)} 个名称")
+        return True
+
+    def save(self):
+        """原子地写入索引文件"""
+        data = {"version": self.VERSION, "dirs": self._dirs, "registry": self._registry}
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    # -------------------------------------------------------------------- 刷新
+
+    def refresh_async(self) -> threading.Thread:
+        """在后台线程中刷新索引"""
+        with self._refresh_lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return self._refresh_thread
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_in_background, name="app_index_refresh", daemon=True
+            )
+            self._refresh_thread.start()
+            return self._refresh_thread
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"刷新应用程序索引失败: {e}", exc_info=True)
+            # 扫描失败时不让查询一直等待，也不在每次查询时重试
+            self._refreshed_at = time.monotonic()
+            self.ready.set()
+
+    def refresh(self) -> int:
+        """
+        按目录修改时间增量刷新索引
+
+        返回:
+            int: 重新扫描的目录数（包括注册表项）
+        """
+        start = time.perf_counter()
+        rescanned = 0
+        dirs: Dict[str, Dict[str, Any]] = {}
+        stack = list(reversed(self.roots))
+        while stack:
+            directory, source, recursive = stack.pop()
+            if directory in dirs:
+                continue
+            try:
+                mtime = os.stat(directory).st_mtime
+            except OSError:
+                continue
+            record = self._dirs.get(directory)
+            if record is None or record["mtime"] != mtime or record["source"] != source:
+                record = self._scan_dir(directory, source, mtime)
+                rescanned += 1
+            dirs[directory] = record
+            if recursive:
+                stack.extend((sub, source, True) for sub in record["subdirs"])
+
+        registry = self._registry
+        if self.scan_registry:
+            registry, count = self._refresh_registry()
+            rescanned += count
+
+        changed = rescanned > 0 or set(dirs) != set(self._dirs)
+        if changed:
+            self._dirs = dirs
+            self._registry = registry
+            self._rebuild()
+        if changed or self._dirty:
+            try:
+                self.save()
+            except OSError as e:
+                logger.warning(f"保存应用程序索引失败: {e}")
+
+        self._refreshed_at = time.monotonic()
+        self.ready.set()
+        self.last_refresh = {
+            "rescanned": rescanned,
+            "dirs": len(dirs),
+            "seconds": time.perf_counter() - start,
+        }
+        logger.info(f"应用程序索引刷新完成: {len(self._names)} 个名称, "
+                    f"重新扫描 {rescanned}/{len(dirs)} 个目录, "
+                    f"耗时 {self.last_refresh['seconds'] * 1000:.1f}ms")
+        return rescanned
+
+    def _scan_dir(self, directory: str, source: str, mtime: float) -> Dict[str, Any]:
+        """列出一个目录（不递归）中的程序和子目录"""
+        entries, subdirs = [], []
+        try:
+            with os.scandir(directory) as it:
+                for item in it:
+                    try:
+                        if item.is_dir(follow_symlinks=False):
+                            subdirs.append(item.path)
+                        elif item.is_file():
+                            entry = self._make_entry(item, source)
+                            if entry:
+                                entries.append(entry)
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.debug(f"扫描目录失败 {directory}: {e}")
+        return {"mtime": mtime, "source": source, "entries": entries, "subdirs": subdirs}
+
+    @staticmethod
+    def _make_entry(item: os.DirEntry, source: str) -> Optional[Dict[str, Any]]:
+        name, ext = os.path.splitext(item.name)
+        ext = ext.lower()
+        if source in ("start_menu", "desktop"):
+            if ext == ".lnk":
+                # 快捷方式目标在查询命中时再解析
+                return {"names": [name], "path": item.path, "target": "", "source": source}
+            if ext == ".exe":
+                return {"names": [name], "path": item.path, "target": item.path, "source": source}
+            return None
+        if source == "desktop_file":
+            return _parse_desktop_file(item.path) if ext == ".desktop" else None
+        if source == "path":
+            if os.name == "nt":
+                if ext != ".exe":
+                    return None
+            elif not os.access(item.path, os.X_OK):
+                return None
+            else:
+                name = item.name
+            return {"names": [name], "path": item.path, "target": item.path, "source": source}
+        return None
+
+    def _refresh_registry(self) -> Tuple[Dict[str, Dict[str, Any]], int]:
+        """按注册表项的最后写入时间刷新 Uninstall 列表"""
+        import winreg
+
+        registry, rescanned = {}, 0
+        for reg_path in self.REGISTRY_PATHS:
+            try:
+                key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, reg_path)
+            except OSError:
+                continue
+            try:
+                subkey_count, _, modified = winreg.QueryInfoKey(key)
+                record = self._registry.get(reg_path)
+                if record is None or record["mtime"] != modified:
+                    record = {"mtime": modified,
+                              "entries": self._scan_registry_key(winreg, key, subkey_count)}
+                    rescanned += 1
+                registry[reg_path] = record
+            finally:
+                winreg.CloseKey(key)
+        return registry, rescanned
+
+    @staticmethod
+    def _scan_registry_key(winreg, key, subkey_count: int) -> List[Dict[str, Any]]:
+        entries = []
+        for i in range(subkey_count):
+            try:
+                subkey = winreg.OpenKey(key, winreg.EnumKey(key, i))
+            except OSError:
+                continue
+            try:
+                values = {}
+                for value_name in ("DisplayName", "InstallLocation", "DisplayIcon"):
+                    try:
+                        values[value_name] = winreg.QueryValueEx(subkey, value_name)[0]
+                    except OSError:
+                        values[value_name] = ""
+                if not values["DisplayName"]:
+                    continue
+                # DisplayIcon 通常是 "C:\...\app.exe,0"
+                icon = values["DisplayIcon"].split(",")[0].strip('"')
+                entries.append({
+                    "names": [values["DisplayName"]],
+                    "path": "",
+                    "target": icon if icon.lower().endswith(".exe") else "",
+                    "install_location": values["InstallLocation"],
+                    "source": "registry",
+                })
+            finally:
+                winreg.CloseKey(subkey)
+        return entries
+
+    def _rebuild(self):
+        """根据目录记录重建查询结构"""
+        names: List[Tuple[str, Dict[str, Any]]] = []
+        # 沿用上次的规范化结果，只变化一个目录时不必重新处理所有名称
+        previous = self._normalized
+        normalized_names: Dict[str, str] = {}
+        records = list(self._dirs.values()) + list(self._registry.values())
+        for record in records:
+            for entry in record["entries"]:
+                for name in entry["names"]:
+                    normalized = previous.get(name)
+                    if normalized is None:
+                        normalized = normalize_name(name)
+                    normalized_names[name] = normalized
+                    if normalized:
+                        names.append((normalized, entry))
+        self._normalized = normalized_names
+
+        by_name: Dict[str, List[int]] = {}
+        postings: Dict[str, List[int]] = {}
+        for i, (normalized, _) in enumerate(names):
+            by_name.setdefault(normalized, []).append(i)
+            for gram in _grams(normalized):
+                postings.setdefault(gram, []).append(i)
+
+        # 依次替换引用，查询线程看到的要么是旧结构要么是新结构
+        self._query_cache = {}
+        self._names, self._by_name, self._postings = names, by_name, postings
+
+    # -------------------------------------------------------------------- 查询
+
+    def search(self, app_name: str, min_score: int = 60,
+               sources: Optional[Iterable[str]] = None,
+               contains: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        查找最匹配的程序
+
+        参数:
+            app_name: 程序名称
+            min_score: 最小匹配分数(0-100)
+            sources: 只在这些来源中查找，如 ("start_menu", "desktop")
+            contains: 没有精确匹配时先按包含关系查找，名称包含查询词得 80 分
+                （如 "chrome" 匹配 "Google Chrome"），查询词包含名称得 60 分
+
+        返回:
+            dict: 匹配的条目（含 name、path、target、source、match_score），找不到返回 None
+        """
+        if not self.ready.is_set():
+            self.ready.wait(self.BUILD_WAIT)
+        sources = tuple(sorted(sources)) if sources else None
+        if self._refresh_due(self.REFRESH_INTERVAL):
+            self.refresh_async()
+        result = self._lookup(app_name, min_score, sources, contains)
+        if result is None and self._refresh_due(self.MISS_REFRESH_INTERVAL):
+            # 找不到时可能是刚安装的程序：增量刷新后再查一次，只短暂等待
+            thread = self.refresh_async()
+            thread.join(self.MISS_REFRESH_WAIT)
+            if not thread.is_alive():
+                result = self._lookup(app_name, min_score, sources, contains)
+        return result
+
+    def _refresh_due(self, interval: float) -> bool:
+        refreshed_at = self._refreshed_at
+        return refreshed_at is None or time.monotonic() - refreshed_at >= interval
+
+    def _lookup(self, app_name: str, min_score: int, sources: Optional[Tuple[str, ...]],
+                contains: bool = False) -> Optional[Dict[str, Any]]:
+        """在当前索引中查找，结果按查询缓存"""
+        query = normalize_name(app_name)
+        cache_key = (query, min_score, sources, contains)
+        cache = self._query_cache
+        if cache_key in cache:
+            return cache[cache_key]
+
+        names = self._names
+        best: Optional[Tuple[int, int, Dict[str, Any]]] = None  # (分数, 来源优先级, 条目)
+        for index in self._by_name.get(query, ()):
+            entry = names[index][1]
+            if sources and entry["source"] not in sources:
+                continue
+            rank = (100, -_SOURCE_PRIORITY.get(entry["source"], 9))
+            if best is None or rank > best[:2]:
+                best = (rank[0], rank[1], entry)
+
+        if best is None and contains and len(query) >= 2:
+            best = self._contained(query, min_score, sources)
+
+        if best is None and query:
+            matcher = difflib.SequenceMatcher(None)
+            matcher.set_seq2(query)
+            for index in self._fuzzy_candidates(query, sources):
+                normalized, entry = names[index]
+                floor = max(min_score, best[0] if best else 0)
+                score = _bounded_similarity(matcher, query, normalized, floor)
+                if score is None or score < min_score:
+                    continue
+                rank = (score, -_SOURCE_PRIORITY.get(entry["source"], 9))
+                if best is None or rank > best[:2]:
+                    best = (rank[0], rank[1], entry)
+
+        result = None
+        if best is not None:
+            score, _, entry = best
+            result = dict(entry, name=entry["names"][0], match_score=score)
+        cache[cache_key] = result
+        return result
+
+    def _contained(self, query: str, min_score: int, sources: Optional[Tuple[str, ...]]
+                   ) -> Optional[Tuple[int, int, Dict[str, Any]]]:
+        """
+        按包含关系查找：名称包含查询词 80 分，查询词包含名称 60 分
+
+        同分时名称与查询词长度越接近越优先。包含查询词的名称一定包含它的
+        所有二元字组，取倒排列表的交集即可；查询词包含的名称只需查它的子串。
+        """
+        names = self._names
+        postings = self._postings
+        candidates: List[Tuple[int, int]] = []  # (分数, 名称序号)
+        if min_score <= 80:
+            grams = sorted(_grams(query), key=lambda gram: len(postings.get(gram, ())))
+            common = set(postings.get(grams[0], ()))
+            for gram in grams[1:]:
+                if not common:
+                    break
+                common.intersection_update(postings.get(gram, ()))
+            candidates += [(80, index) for index in common if query in names[index][0]]
+        if min_score <= 60:
+            by_name = self._by_name
+            for start in range(len(query)):
+                for end in range(start + 2, len(query) + 1):
+                    part = query[start:end]
+                    if part != query:
+                        candidates += [(60, index) for index in by_name.get(part, ())]
+
+        best, best_rank = None, None
+        for score, index in candidates:
+            normalized, entry = names[index]
+            if sources and entry["source"] not in sources:
+                continue
+            rank = (score, -abs(len(normalized) - len(query)),
+                    -_SOURCE_PRIORITY.get(entry["source"], 9))
+            if best_rank is None or rank > best_rank:
+                best_rank = rank
+                best = (score, rank[2], entry)
+        return best
+
+    def _fuzzy_candidates(self, query: str, sources: Optional[Tuple[str, ...]]) -> List[int]:
+        """共享二元字组最多的若干个名称序号"""
+        if len(query) < 2:
+            # 单字与其他名称的相似度最高 45 分，只可能精确匹配
+            return []
+        names = self._names
+        counts = Counter()
+        postings = self._postings
+        for gram in _grams(query):
+            counts.update(postings.get(gram, ()))
+        result = []
+        for index, _ in counts.most_common():
+            if sources and names[index][1]["source"] not in sources:
+                continue
+            result.append(index)
+            if len(result) >= self.MAX_CANDIDATES:
+                break
+        return result
+
+    def resolve(self, entry: Dict[str, Any]) -> str:
+        """
+        返回条目的可执行程序路径，快捷方式在第一次命中时解析并写回索引
+
+        返回:
+            str: 可执行程序路径，无法解析时为空字符串
+        """
+        if entry.get("target") or not entry.get("path", "").lower().endswith(".lnk"):
+            return entry.get("target", "")
+        try:
+            import pythoncom
+            import win32com.client
+
+            pythoncom.CoInitialize()
+            shell = win32com.client.Dispatch("WScript.Shell")
+            target = shell.CreateShortCut(entry["path"]).Targetpath
+        except Exception as e:
+            logger.error(f"解析快捷方式失败: {e}")
+            return ""
+        # entry 是 search() 返回的副本，写回索引中的原始条目
+        for record in self._dirs.values():
+            for original in record["entries"]:
+                if original["path"] == entry["path"]:
+                    original["target"] = target
+        entry["target"] = target
+        self._dirty = True
+        return target
+
+
+def _parse_desktop_file(path: str) -> Optional[Dict[str, Any]]:
+    """解析 .desktop 文件的 [Desktop Entry] 部分"""
+    fields: Dict[str, str] = {}
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            in_entry = False
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    if in_entry:
+                        break
+                    in_entry = line == "[Desktop Entry]"
+                    continue
+                if in_entry and "=" in line and not line.startswith("#"):
+                    key, value = line.split("=", 1)
+                    fields[key.strip()] = value.strip()
+    except OSError:
+        return None
+
+    if fields.get("Type", "Application") != "Application":
+        return None
+    if fields.get("NoDisplay") == "true" or fields.get("Hidden") == "true":
+        return None
+    exec_line = fields.get("Exec", "")
+    if not exec_line:
+        return None
+    try:
+        command = [arg for arg in shlex.split(exec_line) if arg not in _EXEC_FIELD_CODES]
+    except ValueError:
+        return None
+    if not command:
+        return None
+
+    names = []
+    for key in ("Name[zh_CN]", "Name[zh]", "Name", "GenericName[zh_CN]", "GenericName"):
+        if fields.get(key) and fields[key] not in names:
+            names.append(fields[key])
+    names.append(os.path.splitext(os.path.basename(path))[0])
+    executable = command[0] if os.path.isabs(command[0]) else (shutil.which(command[0]) or command[0])
+    return {
+        "names": names,
+        "path": path,
+        "target": executable,
+        "command": [executable] + command[1:],
+        "source": "desktop_file",
+    }
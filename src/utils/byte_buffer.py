@@ -0,0 +1,102 @@
+"""
+按字节计容量的有界缓冲区
+
+用于连接生产者和消费者线程（如下载 -> 解码 -> 播放）。与按块计数的
+queue.Queue 不同，容量按字节限制，读取方可以按需要的字节数取数据，
+写满时写入方阻塞，从而对上游形成反压。
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class BoundedByteBuffer:
+    """线程安全的有界字节缓冲区（单生产者/单消费者）"""
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("缓冲区容量必须大于0")
+        self.capacity = capacity
+        self._data = bytearray()
+        self._cond = threading.Condition()
+        self._closed = False  # 写入方已结束，读完剩余数据后返回 EOF
+        self._aborted = False  # 放弃所有数据，唤醒所有等待方
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._data)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def aborted(self) -> bool:
+        return self._aborted
+
+    def write(self, data: bytes, timeout: Optional[float] = None) -> bool:
+        """
+        写入全部数据，缓冲区满时阻塞等待
+
+        返回 False 表示缓冲区已关闭/中止或等待超时，数据未完全写入。
+        """
+        view = memoryview(data)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while view:
+                if self._aborted or self._closed:
+                    return False
+                space = self.capacity - len(self._data)
+                if space <= 0:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                    continue
+                self._data += view[:space]
+                view = view[space:]
+                self._cond.notify_all()
+        return True
+
+    def read(self, size: int, timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        读取 size 字节，数据不足时等待
+
+        写入方结束后返回剩余的不足 size 的数据，读完后返回 b""。
+        超时或被中止时返回 None。
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while len(self._data) < size and not self._closed:
+                if self._aborted:
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            if self._aborted:
+                return None
+            chunk = bytes(self._data[:size])
+            del self._data[:size]
+            self._cond.notify_all()
+            return chunk
+
+    def close(self):
+        """写入结束，读取方读完剩余数据后得到 EOF"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def abort(self):
+        """中止缓冲区，丢弃数据并唤醒所有等待的读写方"""
+        with self._cond:
+            self._aborted = True
+            self._data.clear()
+            self._cond.notify_all()
+
+    def clear(self):
+        """丢弃已缓冲的数据"""
+        with self._cond:
+            self._data.clear()
+            self._cond.notify_all()
@@ -0,0 +1,81 @@
+"""
+取消令牌
+
+一次播放（或一首歌）的所有处理阶段共享同一个令牌：下载、解码、缓冲区和
+播放线程都观察它。取消时依次执行各阶段登记的回调（中止缓冲区、关闭解码器、
+关闭 HTTP 响应），阻塞中的读写立即返回，不需要等待线程超时或逐个 join。
+
+子令牌随父令牌一起取消，也可以单独取消。接口与 threading.Event 兼容
+（is_set / wait），可以直接传给只检查停止事件的代码。
+"""
+
+import logging
+import threading
+from typing import Callable, List, Optional
+
+logger = logging.getLogger("CancelToken")
+
+
+class CancelToken:
+    """可组成父子关系的取消令牌，取消只发生一次"""
+
+    def __init__(self, parent: Optional["CancelToken"] = None):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self._parent = parent
+        if parent is not None:
+            parent.on_cancel(self.cancel)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def is_set(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._event.wait(timeout)
+
+    def child(self) -> "CancelToken":
+        return CancelToken(self)
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        登记取消时执行的回调，已取消时立即执行
+
+        返回的回调可以传给 remove() 取消登记（如 HTTP 响应读完后）。
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return callback
+        self._run(callback)
+        return callback
+
+    def remove(self, callback: Callable[[], None]):
+        with self._lock:
+            try:
+                self._callbacks.remove(callback)
+            except ValueError:
+                pass
+
+    def cancel(self) -> bool:
+        """取消令牌并执行回调，返回 False 表示之前已经取消"""
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        if self._parent is not None:
+            self._parent.remove(self.cancel)
+        for callback in callbacks:
+            self._run(callback)
+        return True
+
+    @staticmethod
+    def _run(callback: Callable[[], None]):
+        try:
+            callback()
+        except Exception as e:
+            logger.debug(f"执行取消回调时出错: {e}")
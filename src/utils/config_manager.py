@@ -3,7 +3,6 @@ import logging
 from pathlib import Path
 from typing import Dict, Any, Optional
 import threading
-import requests
 import socket
 import uuid
 import sys
@@ -43,7 +42,31 @@ class ConfigManager:
             "小智",
             "你好小明"
         ],
-        "WAKE_WORD_MODEL_PATH": "models/vosk-model-small-cn-0.22"
+        "WAKE_WORD_MODEL_PATH": "models/vosk-model-small-cn-0.22",
+        "AUDIO_BACKEND": {
+            "TYPE": "pyaudio",  # pyaudio / file / null
+            "INPUT_FILE": None,  # 文件后端的麦克风输入(WAV或s16le裸数据)
+            "OUTPUT_FILE": None,  # 文件后端的播放输出，为空时丢弃
+            "REALTIME": True,  # 是否按实时速度读写
+            "LOOP": False  # 输入文件读完后是否循环
+        },
+        "IOT": {
+            # 启用的物联网设备，不在列表中的设备不会被导入
+            "ENABLED_THINGS": [
+                "Lamp", "Speaker", "MusicPlayer", "Camera",
+                "QueryBridgeRAG", "SystemManager", "ReminderThing"
+            ],
+            "LAZY_LOAD": True  # 较重的设备在首次收到命令时才创建
+        },
+        "MUSIC_CACHE": {
+            "MAX_MB": 1024,  # 音乐缓存目录的容量上限，0 表示不限制
+            "POLICY": "lru",  # 超出上限时的淘汰策略: lru(最久未播放) / lfu(播放次数最少)
+            "PCM_ENABLED": True,  # 重复播放的歌曲保存解码后的PCM，不再启动FFmpeg
+            "PCM_MAX_MB": 512  # PCM缓存的容量上限，与MP3缓存分开计算
+        },
+        "MUSIC_DECODER": {
+            "TYPE": "auto"  # auto / pyav / ffmpeg，auto 在安装了 PyAV 时进程内解码
+        }
     }
 
     def __new__(cls):
@@ -63,7 +86,10 @@ class ConfigManager:
         self._config = self._load_config()
         self._initialize_client_id()
         self._initialize_device_id()
-        self._initialize_mqtt_info()
+
+        # MQTT信息需要请求OTA服务器，改为在后台刷新，避免阻塞启动
+        self._mqtt_info_thread = None
+        self._mqtt_info_ready = threading.Event()
 
     def _load_config(self) -> Dict[str, Any]:
         """加载配置文件，如果不存在则创建"""
@@ -269,10 +295,40 @@ class ConfigManager:
             except Exception as e:
                 logger.error(f"Error generating DEVICE_ID: {e}")
 
+    def refresh_mqtt_info_async(self):
+        """在后台线程中从OTA服务器刷新MQTT信息"""
+        with self._lock:
+            if self._mqtt_info_thread and self._mqtt_info_thread.is_alive():
+                return
+            self._mqtt_info_ready.clear()
+            self._mqtt_info_thread = threading.Thread(
+                target=self._refresh_mqtt_info,
+                name="ota_mqtt_info",
+                daemon=True
+            )
+            self._mqtt_info_thread.start()
+
+    def _refresh_mqtt_info(self):
+        try:
+            self._initialize_mqtt_info()
+        finally:
+            self._mqtt_info_ready.set()
+
+    def wait_for_mqtt_info(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """
+        等待后台MQTT信息刷新完成并返回MQTT配置
+        如果还没有开始刷新，则先启动刷新
+        """
+        if self._mqtt_info_thread is None:
+            self.refresh_mqtt_info_async()
+        if not self._mqtt_info_ready.wait(timeout):
+            self.logger.warning("等待OTA服务器返回MQTT信息超时，使用已保存的配置")
+        return self.get_config("MQTT_INFO")
+
     def _initialize_mqtt_info(self):
         """
         初始化MQTT信息
-        每次启动都重新获取最新的MQTT配置信息
+        每次启动都在后台重新获取最新的MQTT配置信息
         
         Returns:
             dict: MQTT配置信息，获取失败则返回已保存的配置
@@ -296,6 +352,7 @@ class ConfigManager:
 
     def _get_ota_version(self):
         """获取OTA服务器的MQTT信息"""
+        import requests  # 仅在后台请求OTA时导入
         MAC_ADDR = self.get_device_id()
         OTA_VERSION_URL = self.get_config("NETWORK.OTA_VERSION_URL")
         
@@ -0,0 +1,241 @@
+"""
+启动初始化依赖图
+
+每个初始化步骤声明自己的依赖，依赖全部完成后立即在线程池中执行，
+互不依赖的步骤并行运行。每一步的开始时间、耗时和所在线程都会记录下来，
+全部完成后输出启动时序。
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.utils.startup_profiler import StartupProfiler
+
+logger = logging.getLogger("InitGraph")
+
+
+class InitStep:
+    """一个初始化步骤"""
+
+    def __init__(self, name: str, func: Callable, deps: Iterable[str] = (),
+                 optional: bool = False, inline: bool = False):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.optional = optional  # 可选步骤失败不影响整体启动
+        self.inline = inline  # 由调用方线程执行（如必须在主线程创建的GUI）
+        self.future: Future = Future()
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+        self.thread_name = ""
+        self.status = "pending"  # pending / running / done / failed / skipped
+
+    @property
+    def duration(self) -> float:
+        if self.start_time is None or self.end_time is None:
+            return 0.0
+        return self.end_time - self.start_time
+
+
+class InitGraph:
+    """初始化依赖图执行器"""
+
+    def __init__(self, name: str = "startup", max_workers: int = 4):
+        self.name = name
+        self.max_workers = max_workers
+        self.steps: Dict[str, InitStep] = {}
+        self._order: List[str] = []
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._origin = time.perf_counter()
+        self._remaining = 0
+        self._complete_callbacks: List[Callable[["InitGraph"], None]] = []
+        self.completed = threading.Event()
+
+    def add_step(self, name: str, func: Callable, deps: Iterable[str] = (),
+                 optional: bool = False, inline: bool = False) -> InitStep:
+        """注册初始化步骤，func 不接收参数，返回值作为步骤结果"""
+        if name in self.steps:
+            raise ValueError(f"初始化步骤重复: {name}")
+        step = InitStep(name, func, deps, optional, inline)
+        self.steps[name] = step
+        self._order.append(name)
+        return step
+
+    def on_complete(self, callback: Callable[["InitGraph"], None]):
+        """注册所有步骤结束后的回调"""
+        self._complete_callbacks.append(callback)
+
+    def _validate(self):
+        """检查依赖是否存在以及是否有环"""
+        for step in self.steps.values():
+            for dep in step.deps:
+                if dep not in self.steps:
+                    raise ValueError(f"步骤 {step.name} 依赖不存在的步骤: {dep}")
+
+        visiting, visited = set(), set()
+
+        def visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"初始化步骤存在循环依赖: {name}")
+            visiting.add(name)
+            for dep in self.steps[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self._order:
+            visit(name)
+
+    def start(self):
+        """开始执行依赖图，立即返回"""
+        self._validate()
+        self._origin = time.perf_counter()
+        self._remaining = len(self.steps)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=f"init_{self.name}"
+        )
+        for step in self.steps.values():
+            self._schedule_if_ready(step)
+
+    def _deps_state(self, step: InitStep) -> Optional[bool]:
+        """依赖全部成功返回 True，有依赖失败返回 False，仍在等待返回 None"""
+        for dep in step.deps:
+            dep_step = self.steps[dep]
+            if not dep_step.future.done():
+                return None
+            if dep_step.status != "done":
+                return False
+        return True
+
+    def _schedule_if_ready(self, step: InitStep):
+        with self._lock:
+            if step.status != "pending":
+                return
+            state = self._deps_state(step)
+            if state is None:
+                return
+            if state is False:
+                step.status = "skipped"
+            elif step.inline:
+                # 由 run_inline 在调用方线程执行
+                return
+            else:
+                step.status = "running"
+
+        if step.status == "skipped":
+            failed = [d for d in step.deps if self.steps[d].status != "done"]
+            self._finish(step, error=RuntimeError(f"依赖步骤未完成: {', '.join(failed)}"))
+        else:
+            self._executor.submit(self._execute, step)
+
+    def _execute(self, step: InitStep):
+        step.thread_name = threading.current_thread().name
+        step.start_time = time.perf_counter()
+        try:
+            result = step.func()
+        except Exception as e:
+            step.end_time = time.perf_counter()
+            level = logging.WARNING if step.optional else logging.ERROR
+            logger.log(level, f"初始化步骤 {step.name} 失败: {e}", exc_info=True)
+            self._finish(step, error=e)
+        else:
+            step.end_time = time.perf_counter()
+            self._finish(step, result=result)
+
+    def run_inline(self, name: str, timeout: Optional[float] = None):
+        """在当前线程中执行标记为 inline 的步骤，先等待其依赖完成"""
+        step = self.steps[name]
+        for dep in step.deps:
+            try:
+                self.steps[dep].future.result(timeout)
+            except Exception:
+                pass
+        with self._lock:
+            state = self._deps_state(step)
+            if step.status != "pending" or state is None:
+                raise RuntimeError(f"初始化步骤 {name} 无法执行")
+            step.status = "running" if state else "skipped"
+        if step.status == "skipped":
+            self._finish(step, error=RuntimeError("依赖步骤未完成"))
+        else:
+            self._execute(step)
+        return step.future.result()
+
+    def _finish(self, step: InitStep, result=None, error: Exception = None):
+        if error is None:
+            step.status = "done"
+            step.future.set_result(result)
+        else:
+            if step.status != "skipped":
+                step.status = "failed"
+            step.future.set_exception(error)
+
+        # 调度后续步骤
+        for other in self.steps.values():
+            if step.name in other.deps:
+                self._schedule_if_ready(other)
+
+        with self._lock:
+            self._remaining -= 1
+            all_done = self._remaining == 0
+        if all_done:
+            self._on_all_done()
+
+    def _on_all_done(self):
+        self.completed.set()
+        profiler = StartupProfiler.get_instance()
+        for step in self.steps.values():
+            if step.start_time is not None:
+                profiler.record_step(
+                    step.name,
+                    step.start_time,
+                    step.duration,
+                    step.thread_name,
+                    step.status
+                )
+        logger.info("初始化时序:\n" + self.format_trace())
+        for callback in self._complete_callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error(f"执行初始化完成回调时出错: {e}")
+        if self._executor:
+            self._executor.shutdown(wait=False)
+
+    def future(self, name: str) -> Future:
+        """获取步骤的 Future，可用于添加完成回调"""
+        return self.steps[name].future
+
+    def wait(self, name: str, timeout: Optional[float] = None):
+        """等待步骤完成并返回结果，步骤失败时抛出异常"""
+        return self.steps[name].future.result(timeout)
+
+    def is_done(self, name: str) -> bool:
+        step = self.steps.get(name)
+        return bool(step and step.status == "done")
+
+    def format_trace(self) -> str:
+        """按开始时间输出每个步骤的时序"""
+        lines = []
+        steps = sorted(
+            self.steps.values(),
+            key=lambda s: s.start_time if s.start_time is not None else float("inf")
+        )
+        for step in steps:
+            if step.start_time is None:
+                lines.append(f"{'-':>9}  {'-':>9}  {step.name} ({step.status})")
+                continue
+            offset = (step.start_time - self._origin) * 1000
+            flag = "" if step.status == "done" else f" ({step.status})"
+            lines.append(
+                f"{offset:>7.1f}ms  {step.duration * 1000:>7.1f}ms  "
+                f"{step.name}{flag} [{step.thread_name}]"
+            )
+        return "\n".join(lines)
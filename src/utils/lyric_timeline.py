@@ -0,0 +1,55 @@
+"""
+歌词时间轴
+
+歌词按时间排序后保存为两个平行数组（时间、文本）。顺序播放时游标只向前
+移动，播放位置回退（切歌、跳转）时用二分查找重新定位，查找当前歌词不再
+需要从头扫描整份歌词。
+"""
+
+import bisect
+import math
+from typing import Iterable, List, Tuple
+
+
+class LyricTimeline:
+    """有序歌词时间轴和单调前进的当前行游标"""
+
+    def __init__(self, lyrics: Iterable[Tuple[float, str]] = ()):
+        ordered = sorted(((float(t), text) for t, text in lyrics), key=lambda line: line[0])
+        self.times: List[float] = [t for t, _ in ordered]
+        self.texts: List[str] = [text for _, text in ordered]
+        self._cursor = -1  # 最后一句时间不晚于当前位置的歌词，-1 表示还没到第一句
+        self._position = 0.0
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __bool__(self) -> bool:
+        return bool(self.times)
+
+    def index_at(self, position: float) -> int:
+        """
+        返回播放位置对应的歌词索引
+
+        位置不小于上次查询时游标向前移动，否则二分查找。还没到第一句歌词时
+        返回 0，与之前的显示逻辑一致。
+        """
+        if position >= self._position:
+            times = self.times
+            cursor = self._cursor
+            while cursor + 1 < len(times) and times[cursor + 1] <= position:
+                cursor += 1
+            self._cursor = cursor
+        else:
+            self._cursor = bisect.bisect_right(self.times, position) - 1
+        self._position = position
+        return max(0, self._cursor)
+
+    @property
+    def next_time(self) -> float:
+        """下一句歌词开始的时间，已是最后一句时返回无穷大"""
+        index = self._cursor + 1
+        return self.times[index] if index < len(self.times) else math.inf
+
+    def text(self, index: int) -> str:
+        return self.texts[index]
@@ -0,0 +1,247 @@
+"""
+音乐缓存索引
+
+用 SQLite 记录缓存目录中每个文件的大小、最后访问时间和命中次数，
+在总大小超过预算时按 LRU 或 LFU 策略淘汰，并统计缓存命中率。
+未下载完的渐进式缓存（.part）同样计入容量，但查询时不算命中。
+每次更新都在一个事务中完成，进程中途退出也不会留下不一致的索引。
+"""
+
+import glob
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger("MusicCacheIndex")
+
+
+class MusicCacheIndex:
+    """缓存目录索引（线程安全）"""
+
+    POLICIES = ("lru", "lfu")
+
+    # 淘汰顺序：LRU 先淘汰最久未访问的；LFU 先淘汰命中最少的，其次最久未访问
+    _EVICT_ORDER = {
+        "lru": "last_access ASC",
+        "lfu": "hits ASC, last_access ASC",
+    }
+
+    def __init__(self, cache_dir: str, max_bytes: int = 0, policy: str = "lru",
+                 index_name: str = "index.sqlite3"):
+        if policy not in self.POLICIES:
+            raise ValueError(f"不支持的缓存淘汰策略: {policy}")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes  # 0 表示不限制
+        self.policy = policy
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(cache_dir, index_name),
+            check_same_thread=False,
+            isolation_level=None  # 手动管理事务
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " path TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL,"
+            " hits INTEGER NOT NULL DEFAULT 0,"
+            " complete INTEGER NOT NULL DEFAULT 1)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS stats ("
+            " name TEXT PRIMARY KEY,"
+            " value INTEGER NOT NULL)"
+        )
+        self._db.execute(
+            "INSERT OR IGNORE INTO stats VALUES ('hits', 0), ('misses', 0)"
+        )
+
+    def _transaction(self):
+        return _Transaction(self._db, self._lock)
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        查找完整的缓存文件
+
+        命中时记录一次命中并返回路径；不存在或只有部分数据时记录一次未命中，
+        返回 None。无论是否命中都会刷新最后访问时间。
+        """
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT path, complete FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row and not os.path.exists(row[0]):
+                # 文件已被外部删除
+                db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+            if row and row[1]:
+                db.execute(
+                    "UPDATE entries SET hits = hits + 1, last_access = ? WHERE key = ?",
+                    (now, key)
+                )
+                db.execute("UPDATE stats SET value = value + 1 WHERE name = 'hits'")
+                return row[0]
+            if row:
+                db.execute(
+                    "UPDATE entries SET last_access = ? WHERE key = ?", (now, key)
+                )
+            db.execute("UPDATE stats SET value = value + 1 WHERE name = 'misses'")
+            return None
+
+    def contains(self, key: str) -> bool:
+        """检查是否有完整的缓存文件，不影响命中统计"""
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT path, complete FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        return bool(row and row[1] and os.path.exists(row[0]))
+
+    def add(self, key: str, path: str, complete: bool = True,
+            protect: Iterable[str] = ()) -> List[str]:
+        """
+        记录（或更新）一个缓存文件，超出预算时淘汰其他文件
+
+        complete 为 False 表示文件还没有下载完。protect 中的键（以及 key
+        本身）不会被淘汰。返回被淘汰的键。
+        """
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return []
+        with self._transaction() as db:
+            db.execute(
+                "INSERT INTO entries (key, path, size, last_access, hits, complete)"
+                " VALUES (?, ?, ?, ?, 0, ?)"
+                " ON CONFLICT(key) DO UPDATE SET"
+                " path = excluded.path, size = excluded.size,"
+                " last_access = excluded.last_access, complete = excluded.complete",
+                (key, path, size, time.time(), int(complete))
+            )
+        return self.evict(protect=set(protect) | {key})
+
+    def remove(self, key: str):
+        with self._transaction() as db:
+            db.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def evict(self, protect: Iterable[str] = ()) -> List[str]:
+        """淘汰文件直到总大小不超过预算"""
+        if not self.max_bytes:
+            return []
+        protect = set(protect)
+        evicted = []
+        with self._transaction() as db:
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return []
+            rows = db.execute(
+                f"SELECT key, path, size FROM entries ORDER BY {self._EVICT_ORDER[self.policy]}"
+            ).fetchall()
+            for key, path, size in rows:
+                if total <= self.max_bytes:
+                    break
+                if key in protect:
+                    continue
+                self._delete_files(path)
+                db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                evicted.append(key)
+        if evicted:
+            logger.info(f"缓存超出预算，已淘汰 {len(evicted)} 个文件")
+        return evicted
+
+    @staticmethod
+    def _delete_files(path: str):
+        # 同时删除渐进式缓存的数据和区间记录
+        base = path[:-len(".part")] if path.endswith(".part") else path
+        for candidate in (base, base + ".part", base + ".ranges"):
+            try:
+                os.remove(candidate)
+            except OSError:
+                pass
+
+    def scan(self, suffix: str = ".mp3"):
+        """把目录中尚未登记的缓存文件加入索引（兼容旧版本留下的缓存）"""
+        with self._transaction() as db:
+            known = {row[0] for row in db.execute("SELECT path FROM entries")}
+        added = 0
+        for pattern, complete in (("*" + suffix, True), ("*" + suffix + ".part", False)):
+            for path in glob.glob(os.path.join(self.cache_dir, pattern)):
+                if path in known:
+                    continue
+                key = os.path.basename(path).split(".", 1)[0]
+                try:
+                    size, mtime = os.path.getsize(path), os.path.getmtime(path)
+                except OSError:
+                    continue
+                with self._transaction() as db:
+                    # 完整文件优先，同一个键不会同时登记 .part
+                    db.execute(
+                        "INSERT OR IGNORE INTO entries"
+                        " (key, path, size, last_access, hits, complete)"
+                        " VALUES (?, ?, ?, ?, 0, ?)",
+                        (key, path, size, mtime, int(complete))
+                    )
+                added += 1
+        if added:
+            logger.info(f"缓存索引新增 {added} 个已有文件")
+        self.evict()
+
+    @property
+    def total_bytes(self) -> int:
+        with self._transaction() as db:
+            return db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    @property
+    def hit_rate(self) -> float:
+        """缓存命中率（0-1），没有查询记录时为 0"""
+        stats = self.stats()
+        lookups = stats["hits"] + stats["misses"]
+        return stats["hits"] / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, int]:
+        with self._transaction() as db:
+            values = dict(db.execute("SELECT name, value FROM stats").fetchall())
+            count, total = db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {
+            "hits": values.get("hits", 0),
+            "misses": values.get("misses", 0),
+            "entries": count,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class _Transaction:
+    """持有索引锁并在一个 SQLite 事务中执行，异常时回滚"""
+
+    def __init__(self, db: sqlite3.Connection, lock: threading.Lock):
+        self._db = db
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        self._db.execute("BEGIN IMMEDIATE")
+        return self._db
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self._db.execute("COMMIT")
+            else:
+                self._db.execute("ROLLBACK")
+        finally:
+            self._lock.release()
+        return False
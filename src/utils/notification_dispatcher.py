@@ -0,0 +1,255 @@
+"""
+通知分发器
+
+提醒触发后只需调用 notify() 把通知放进各通知渠道（sink）的待发送列表，
+立即返回；真正的显示（桌面弹窗、语音播报、日志）由每个渠道自己的线程完成，
+提醒调度线程永远不会等待界面。
+
+同一时刻触发的多个通知会合并成一批交给渠道，渠道还可以设置最小发送间隔：
+间隔未到时新通知继续积累，到时一起发送，既不丢通知也不会刷屏。
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("NotificationDispatcher")
+
+
+class Notification:
+    """一条待发送的通知"""
+
+    __slots__ = ("title", "message", "created")
+
+    def __init__(self, title: str, message: str):
+        self.title = title
+        self.message = message
+        self.created = time.time()
+
+
+class NotificationSink(ABC):
+    """
+    通知渠道基类
+
+    子类实现 deliver()，一次收到一批通知，可以合并显示。
+    min_interval 为两次发送之间的最小间隔（秒）。
+    """
+
+    name = "base"
+    min_interval = 0.0
+
+    @abstractmethod
+    def deliver(self, batch: List[Notification]):
+        """发送一批通知"""
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def summarize(batch: List[Notification]):
+        """把一批通知合并为一个标题和内容"""
+        if len(batch) == 1:
+            return batch[0].title, batch[0].message
+        return f"⏰ {len(batch)} 个提醒", "\n".join(n.message for n in batch)
+
+
+class ToastSink(NotificationSink):
+    """Windows 桌面通知（winotify）"""
+
+    name = "toast"
+    # 弹窗需要一点时间显示，太快会相互覆盖
+    min_interval = 0.5
+
+    def __init__(self, app_id: str = "提醒助手", duration: str = "long"):
+        from winotify import Notification as Toast, audio
+
+        self._toast_cls = Toast
+        self._audio = audio
+        self.app_id = app_id
+        self.duration = duration
+
+    def deliver(self, batch: List[Notification]):
+        title, message = self.summarize(batch)
+        toast = self._toast_cls(
+            app_id=self.app_id,
+            title=title,
+            msg=message,
+            duration=self.duration
+        )
+        toast.set_audio(self._audio.Default, loop=False)
+        toast.show()
+
+
+class SpeechSink(NotificationSink):
+    """通过应用程序的 TTS 播报通知"""
+
+    name = "speech"
+    min_interval = 1.0
+
+    def __init__(self, app):
+        self.app = app
+
+    def deliver(self, batch: List[Notification]):
+        text = "，".join(n.message for n in batch)
+        if len(batch) > 1:
+            text = f"您有{len(batch)}个提醒：{text}"
+        else:
+            text = f"提醒：{text}"
+        # 只提交到事件循环，不等待播报完成
+        asyncio.run_coroutine_threadsafe(self.app._speak(text), self.app.loop)
+
+
+class LogSink(NotificationSink):
+    """写入日志，用于没有桌面环境的 Linux"""
+
+    name = "log"
+
+    def deliver(self, batch: List[Notification]):
+        for notification in batch:
+            logger.info(f"通知: {notification.title} - {notification.message}")
+
+
+class _SinkWorker:
+    """一个渠道的待发送列表和发送线程"""
+
+    def __init__(self, sink: NotificationSink, batch_window: float):
+        self.sink = sink
+        self.batch_window = batch_window
+        self.pending: List[Notification] = []
+        self.cond = threading.Condition()
+        self.closed = False
+        self.last_delivery = 0.0
+        self.delivered = 0
+        self.batches = 0
+        self.thread = threading.Thread(
+            target=self._run, name=f"notify_{sink.name}", daemon=True
+        )
+        self.thread.start()
+
+    def put(self, notification: Notification):
+        with self.cond:
+            self.pending.append(notification)
+            self.cond.notify()
+
+    def close(self, timeout: float):
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+        self.thread.join(timeout)
+
+    def _next_batch(self) -> Optional[List[Notification]]:
+        with self.cond:
+            while not self.pending and not self.closed:
+                self.cond.wait()
+            if not self.pending:
+                return None
+            # 等待同一时刻触发的其他通知，以及渠道的发送间隔
+            ready = max(self.pending[0].created + self.batch_window,
+                        self.last_delivery + self.sink.min_interval)
+            while not self.closed:
+                wait = ready - time.time()
+                if wait <= 0:
+                    break
+                self.cond.wait(wait)
+            batch, self.pending = self.pending, []
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            try:
+                self.sink.deliver(batch)
+            except Exception as e:
+                logger.error(f"通知渠道 {self.sink.name} 发送失败: {e}")
+            self.last_delivery = time.time()
+            self.delivered += len(batch)
+            self.batches += 1
+        try:
+            self.sink.close()
+        except Exception as e:
+            logger.debug(f"关闭通知渠道 {self.sink.name} 出错: {e}")
+
+
+class NotificationDispatcher:
+    """通知分发器（单例）"""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    # 在该时间内先后到达的通知合并为一批（秒）
+    BATCH_WINDOW = 0.1
+
+    @classmethod
+    def get_instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                cls._instance.add_sink(cls._default_sink())
+        return cls._instance
+
+    @staticmethod
+    def _default_sink() -> NotificationSink:
+        """有 winotify 时使用桌面通知，否则写日志"""
+        try:
+            return ToastSink()
+        except ImportError:
+            logger.info("winotify 不可用，提醒通知写入日志")
+            return LogSink()
+
+    def __init__(self, batch_window: Optional[float] = None):
+        self.batch_window = self.BATCH_WINDOW if batch_window is None else batch_window
+        self._workers: Dict[str, _SinkWorker] = {}
+        self._lock = threading.Lock()
+
+    def add_sink(self, sink: NotificationSink) -> bool:
+        """
+        添加通知渠道，同名渠道只保留第一个
+
+        Returns:
+            bool: 是否新增
+        """
+        with self._lock:
+            if sink.name in self._workers:
+                return False
+            self._workers[sink.name] = _SinkWorker(sink, self.batch_window)
+        logger.info(f"已添加通知渠道: {sink.name}")
+        return True
+
+    def remove_sink(self, name: str, timeout: float = 1.0):
+        with self._lock:
+            worker = self._workers.pop(name, None)
+        if worker:
+            worker.close(timeout)
+
+    def notify(self, title: str, message: str):
+        """把通知交给所有渠道，不等待发送"""
+        notification = Notification(title, message)
+        with self._lock:
+            workers = list(self._workers.values())
+        for worker in workers:
+            worker.put(notification)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """各渠道已发送的通知数和批次数"""
+        with self._lock:
+            workers = list(self._workers.values())
+        return {
+            worker.sink.name: {
+                "delivered": worker.delivered,
+                "batches": worker.batches,
+                "pending": len(worker.pending),
+            }
+            for worker in workers
+        }
+
+    def close(self, timeout: float = 1.0):
+        """发送完已排队的通知后停止所有渠道线程"""
+        with self._lock:
+            workers, self._workers = list(self._workers.values()), {}
+        for worker in workers:
+            worker.close(timeout)
@@ -0,0 +1,126 @@
+"""
+预解码 PCM 缓存
+
+把解码、重采样后的 PCM 数据保存到磁盘，再次播放时通过 mmap 直接把
+内存视图切片写入音频流，不再启动 FFmpeg。
+
+MappedPcmReader 提供与 BoundedByteBuffer 相同的读取接口（read / abort /
+clear / close / aborted），播放循环无需区分数据来源。
+"""
+
+import logging
+import mmap
+import os
+import threading
+from typing import Optional
+
+logger = logging.getLogger("PcmCache")
+
+
+class PcmCacheWriter:
+    """边解码边写入 PCM 缓存，完整写完后才以最终文件名出现"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.temp_path = path + ".tmp"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(self.temp_path, "wb")
+        self.size = 0
+
+    def write(self, data: bytes):
+        self._file.write(data)
+        self.size += len(data)
+
+    def commit(self) -> bool:
+        """保存为最终文件，没有写入任何数据时放弃"""
+        self._file.close()
+        if not self.size:
+            self.discard()
+            return False
+        os.replace(self.temp_path, self.path)
+        return True
+
+    def discard(self):
+        """放弃未完成的缓存"""
+        self._file.close()
+        try:
+            os.remove(self.temp_path)
+        except OSError:
+            pass
+
+
+class MappedPcmReader:
+    """通过 mmap 读取 PCM 缓存文件，返回零拷贝的内存视图切片"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            self._file.close()
+            raise
+        self._view = memoryview(self._map)
+        self._offset = 0
+        self._lock = threading.Lock()
+        self._aborted = False
+        self._closed = False
+
+    def __len__(self) -> int:
+        """剩余未读取的字节数"""
+        with self._lock:
+            return len(self._view) - self._offset if not self._closed else 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def aborted(self) -> bool:
+        return self._aborted
+
+    def read(self, size: int, timeout: Optional[float] = None) -> Optional[memoryview]:
+        """
+        读取最多 size 字节
+
+        读完返回 b""，被中止时返回 None。数据全部在磁盘上，timeout 不起作用。
+        """
+        with self._lock:
+            if self._aborted:
+                return None
+            if self._closed or self._offset >= len(self._view):
+                return b""
+            chunk = self._view[self._offset:self._offset + size]
+            self._offset += len(chunk)
+            return chunk
+
+    def seek(self, offset: int):
+        """跳转到指定字节偏移（按帧对齐由调用方保证）"""
+        with self._lock:
+            self._offset = max(0, min(offset, len(self._view)))
+
+    def clear(self):
+        """与 BoundedByteBuffer 接口保持一致，文件数据无需丢弃"""
+
+    def abort(self):
+        with self._lock:
+            self._aborted = True
+        self.close()
+
+    def close(self):
+        """
+        释放映射
+
+        播放线程仍持有切片时映射无法关闭，此时留给垃圾回收或下一次 close()。
+        """
+        with self._lock:
+            self._closed = True
+            if self._map.closed:
+                return
+            self._view.release()
+            # 映射持有自己的文件句柄，文件对象可以先关闭
+            self._file.close()
+            try:
+                self._map.close()
+            except BufferError:
+                logger.debug("PCM 缓存映射仍在使用，延迟关闭")
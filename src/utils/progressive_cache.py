@@ -0,0 +1,264 @@
+"""
+渐进式文件缓存
+
+边下载边写入的缓存文件，记录已下载的字节区间。下载中断后保留已下载的
+部分，下次只需通过 HTTP Range 请求补齐缺失区间；读取方可以在下载进行中
+读取已经存在的数据。
+
+磁盘上的文件:
+    <路径>.part     按原始偏移写入的数据
+    <路径>.ranges   JSON 元数据: 文件总大小和已下载区间
+下载完成后 .part 被重命名为最终路径，.ranges 被删除。
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger("ProgressiveCache")
+
+
+class RangeSet:
+    """有序、不重叠的半开区间集合 [start, end)"""
+
+    def __init__(self, ranges: Optional[List[Tuple[int, int]]] = None):
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        for start, end in ranges or []:
+            self.add(start, end)
+
+    def add(self, start: int, end: int):
+        """加入区间，与相邻或重叠的区间合并"""
+        if end <= start:
+            return
+        # 找到所有与 [start, end] 相交或相邻的区间
+        lo = bisect.bisect_left(self._ends, start)
+        hi = bisect.bisect_right(self._starts, end)
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            end = max(end, self._ends[hi - 1])
+        self._starts[lo:hi] = [start]
+        self._ends[lo:hi] = [end]
+
+    def end_of(self, offset: int) -> Optional[int]:
+        """offset 所在区间的结束位置，不在任何区间内时返回 None"""
+        i = bisect.bisect_right(self._starts, offset) - 1
+        if i >= 0 and offset < self._ends[i]:
+            return self._ends[i]
+        return None
+
+    def missing(self, total: int) -> List[Tuple[int, int]]:
+        """[0, total) 中尚未覆盖的区间"""
+        gaps = []
+        position = 0
+        for start, end in zip(self._starts, self._ends):
+            if start > position:
+                gaps.append((position, min(start, total)))
+            position = max(position, end)
+            if position >= total:
+                break
+        if position < total:
+            gaps.append((position, total))
+        return [(s, e) for s, e in gaps if e > s]
+
+    @property
+    def covered(self) -> int:
+        return sum(e - s for s, e in zip(self._starts, self._ends))
+
+    def to_list(self) -> List[List[int]]:
+        return [[s, e] for s, e in zip(self._starts, self._ends)]
+
+
+class ProgressiveCacheFile:
+    """可并发写入和读取的渐进式缓存文件"""
+
+    # 每写入这么多字节保存一次区间元数据
+    META_SAVE_INTERVAL = 256 * 1024
+
+    def __init__(self, path: str):
+        self.path = path
+        self.part_path = path + ".part"
+        self.meta_path = path + ".ranges"
+        self.total_size: Optional[int] = None
+        self.ranges = RangeSet()
+        self._file = None
+        self._cond = threading.Condition()
+        self._writer_done = False
+        self._finalized = False  # 数据已移动到最终路径
+        self._unsaved = 0
+        self._load_meta()
+
+    def _load_meta(self):
+        if not (os.path.exists(self.meta_path) and os.path.exists(self.part_path)):
+            return
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self.total_size = meta.get("total_size")
+            self.ranges = RangeSet([tuple(r) for r in meta.get("ranges", [])])
+            # 数据文件比记录的短说明元数据不可信
+            ranges = self.ranges.to_list()
+            if ranges and ranges[-1][1] > os.path.getsize(self.part_path):
+                raise ValueError("缓存数据不完整")
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"缓存元数据无效，重新下载: {e}")
+            self.total_size = None
+            self.ranges = RangeSet()
+
+    def _save_meta(self):
+        meta = {"total_size": self.total_size, "ranges": self.ranges.to_list()}
+        temp_path = self.meta_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(temp_path, self.meta_path)
+        self._unsaved = 0
+
+    def _ensure_open(self):
+        """打开 .part 文件用于写入，不存在时创建"""
+        if self._file is None:
+            mode = "r+b" if os.path.exists(self.part_path) else "w+b"
+            self._file = open(self.part_path, mode)
+
+    def _ensure_readable(self):
+        """打开已有的数据文件用于读取，读取方不会创建文件"""
+        if self._file is None:
+            if self._finalized:
+                self._file = open(self.path, "rb")
+            else:
+                self._file = open(self.part_path, "r+b")
+
+    def set_total_size(self, total_size: Optional[int]):
+        """设置文件总大小，与已缓存的大小不一致时丢弃旧数据"""
+        with self._cond:
+            if (total_size and self.total_size and total_size != self.total_size):
+                logger.info("远端文件大小已变化，丢弃已缓存的数据")
+                self.ranges = RangeSet()
+                if self._file:
+                    self._file.truncate(0)
+            if total_size:
+                self.total_size = total_size
+            self._ensure_open()
+            self._save_meta()
+
+    @property
+    def complete(self) -> bool:
+        with self._cond:  # Condition 默认使用可重入锁
+            return bool(self.total_size) and self.ranges.covered >= self.total_size
+
+    @property
+    def cached_bytes(self) -> int:
+        with self._cond:
+            return self.ranges.covered
+
+    def missing_ranges(self) -> Optional[List[Tuple[int, int]]]:
+        """尚未下载的区间；总大小未知时返回 None"""
+        with self._cond:
+            if not self.total_size:
+                return None
+            return self.ranges.missing(self.total_size)
+
+    def write(self, offset: int, data: bytes):
+        """把数据写入指定偏移并记录区间"""
+        with self._cond:
+            self._ensure_open()
+            self._file.seek(offset)
+            self._file.write(data)
+            self._file.flush()
+            self.ranges.add(offset, offset + len(data))
+            self._unsaved += len(data)
+            if self._unsaved >= self.META_SAVE_INTERVAL:
+                self._save_meta()
+            self._cond.notify_all()
+
+    def read(self, offset: int, size: int, timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        读取 offset 处最多 size 字节，数据尚未下载时等待
+
+        返回 b"" 表示已到文件末尾或下载已结束且该位置没有数据，
+        超时返回 None。
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self.total_size and offset >= self.total_size:
+                    return b""
+                end = self.ranges.end_of(offset)
+                if end is not None:
+                    self._ensure_readable()
+                    self._file.seek(offset)
+                    return self._file.read(min(size, end - offset))
+                if self._writer_done:
+                    return b""
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def begin_write(self):
+        """开始新一轮下载"""
+        with self._cond:
+            self._writer_done = False
+
+    def end_write(self, finished: bool = False):
+        """
+        下载结束，保存进度并唤醒读取方
+
+        finished 表示数据流正常读到了末尾，此时总大小未知的文件以
+        实际下载的长度作为总大小。
+        """
+        with self._cond:
+            self._writer_done = True
+            ranges = self.ranges.to_list()
+            if (finished and not self.total_size
+                    and len(ranges) == 1 and ranges[0][0] == 0):
+                self.total_size = ranges[0][1]
+            if self._file is not None:
+                self._save_meta()
+            self._cond.notify_all()
+
+    def finalize(self) -> bool:
+        """数据完整时把缓存文件移动到最终路径"""
+        with self._cond:
+            if not self.complete:
+                return False
+            if self._finalized:
+                return True
+            self._close_file()
+            os.replace(self.part_path, self.path)
+            self._finalized = True
+            try:
+                os.remove(self.meta_path)
+            except OSError:
+                pass
+            # 解码线程可能仍在读取，从最终路径继续
+            self._file = open(self.path, "rb")
+            return True
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        with self._cond:
+            if self._file is not None and not self._finalized:
+                self._save_meta()
+            self._close_file()
+            self._writer_done = True
+            self._cond.notify_all()
+
+    def discard(self):
+        """删除缓存数据"""
+        with self._cond:
+            self._close_file()
+            for path in (self.part_path, self.meta_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.ranges = RangeSet()
+            self.total_size = None
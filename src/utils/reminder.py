@@ -2,146 +2,140 @@ import logging
 import threading
 import time
 from datetime import datetime, timedelta
-import re
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List
 import os
-from winotify import Notification, audio
+
+from src.utils.notification_dispatcher import NotificationDispatcher
+from src.utils.reminder_scheduler import ReminderScheduler
+from src.utils.reminder_store import ReminderStore
+from src.utils.time_parser import ParsedReminder, parse_reminder
 
 # 配置日志
 logger = logging.getLogger(__name__)
 
 class ReminderManager:
-    """提醒管理工具类"""
+    """
+    提醒管理工具类
+    
+    提醒保存在 ReminderStore 中，重启后由 restore() 恢复调度，已过期的提醒
+    立即触发。_active_reminders 只是已调度提醒的内存视图，两个提醒前端
+    （src/iot/things 与 src/things 中的 ReminderThing）共用这一份状态。
+    """
+    
+    # 提醒数据库位置
+    STORE_PATH = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "data", "reminders.sqlite3"
+    )
     
     # 存储当前活跃的提醒
     _active_reminders = {}
-    _reminder_counter = 0
+    _lock = threading.Lock()
+    _scheduler: Optional[ReminderScheduler] = None
+    _store: Optional[ReminderStore] = None
     
     @staticmethod
-    def _parse_time_string(time_str: str) -> Tuple[int, str]:
+    def _show_notification(title: str, message: str):
         """
-        解析时间字符串，如"3分钟"、"5秒"、"1小时30分钟"等
+        发送提醒通知
+        
+        通知交给 NotificationDispatcher 后立即返回，由各通知渠道在自己的线程中
+        显示，调度线程不会等待桌面弹窗或语音播报。
         
         Args:
-            time_str: 时间字符串
-            
-        Returns:
-            Tuple[int, str]: (秒数, 单位描述)
+            title: 通知标题
+            message: 通知内容
         """
-        # 移除所有空格和"后"字
-        time_str = time_str.replace(" ", "").replace("后", "").lower()
-        logger.info(f"解析时间字符串: {time_str}")
-        
-        # 定义正则表达式模式匹配时间
-        patterns = [
-            # 小时
-            (r'(\d+)(?:小时|h|hour|hours)', 3600),
-            # 分钟
-            (r'(\d+)(?:分钟|分|min|minute|minutes|m)', 60),
-            # 秒钟
-            (r'(\d+)(?:秒钟|秒|s|sec|second|seconds)', 1)
-        ]
-        
-        total_seconds = 0
-        unit_description = []
-        
-        # 检查每种时间单位
-        for pattern, multiplier in patterns:
-            matches = re.findall(pattern, time_str, re.IGNORECASE)
-            for match in matches:
-                try:
-                    value = int(match)
-                    total_seconds += value * multiplier
-                    
-                    # 构建单位描述
-                    if multiplier == 3600:
-                        unit_description.append(f"{value}小时")
-                    elif multiplier == 60:
-                        unit_description.append(f"{value}分钟")
-                    else:
-                        unit_description.append(f"{value}秒")
-                        
-                except ValueError:
-                    continue
-        
-        # 如果没有匹配到任何时间单位，尝试将整个字符串解析为秒数
-        if total_seconds == 0:
-            try:
-                # 移除非数字字符
-                digits_only = re.sub(r'\D', '', time_str)
-                if digits_only:
-                    total_seconds = int(digits_only)
-                    unit_description = [f"{total_seconds}秒"]
-            except ValueError:
-                pass
-        
-        logger.info(f"解析结果: {total_seconds}秒, 描述: {''.join(unit_description)}")
-        return total_seconds, "".join(unit_description)
+        NotificationDispatcher.get_instance().notify(title, message)
+        logger.info(f"已发送通知: {title} - {message}")
+        return True
+    
+    @staticmethod
+    def _get_scheduler() -> ReminderScheduler:
+        """获取共享的提醒调度器，所有提醒都在它的一个工作线程中触发"""
+        if ReminderManager._scheduler is None:
+            ReminderManager._scheduler = ReminderScheduler()
+        return ReminderManager._scheduler
     
     @staticmethod
-    def _show_notification(title: str, message: str, duration: str = "long"):
+    def _get_store() -> ReminderStore:
+        """获取提醒存储，第一次使用时打开数据库并恢复未完成的提醒"""
+        ReminderManager.restore()
+        return ReminderManager._store
+    
+    @staticmethod
+    def restore() -> int:
         """
-        显示Windows系统通知
+        从存储中恢复未完成的提醒，只在第一次调用时执行
         
-        Args:
-            title: 通知标题
-            message: 通知内容
-            duration: 通知持续时间
+        已过期的提醒（程序未运行期间到期）立即触发。
+        
+        Returns:
+            int: 本次恢复的提醒数量
         """
-        try:
-            toast = Notification(
-                app_id="提醒助手",
-                title=title,
-                msg=message,
-                duration=duration
-            )
-            toast.set_audio(audio.Default, loop=False)
-            toast.show()
-            
-            logger.info(f"已显示通知: {title} - {message}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"显示通知失败: {str(e)}", exc_info=True)
-            return False
+        with ReminderManager._lock:
+            if ReminderManager._store is not None:
+                return 0
+            store = ReminderStore(ReminderManager.STORE_PATH)
+            pending = store.pending()
+            now = time.time()
+            for reminder in pending:
+                reminder["time"] = datetime.fromtimestamp(reminder.pop("due"))
+                reminder["status"] = "active"
+                ReminderManager._schedule(reminder, reminder["time"].timestamp() - now)
+            ReminderManager._store = store
+        
+        if pending:
+            overdue = sum(1 for reminder in pending if reminder["time"].timestamp() <= now)
+            logger.info(f"已恢复 {len(pending)} 个提醒，其中 {overdue} 个已过期将立即触发")
+        return len(pending)
+    
+    @staticmethod
+    def _schedule(reminder: Dict[str, Any], delay: float):
+        """把提醒加入调度器和内存视图，调用方持有 _lock"""
+        reminder_id = reminder["id"]
+        reminder["handle"] = ReminderManager._get_scheduler().schedule(
+            delay,
+            lambda: ReminderManager._fire_reminder(reminder_id),
+            interval=reminder["repeat_interval"]
+        )
+        ReminderManager._active_reminders[reminder_id] = reminder
     
     @staticmethod
-    def _reminder_thread(reminder_id: int, delay_seconds: int, title: str, message: str, repeat: bool = False, repeat_interval: int = 0):
+    def active_count() -> int:
+        """当前活跃的提醒数量"""
+        ReminderManager.restore()
+        return len(ReminderManager._active_reminders)
+    
+    @staticmethod
+    def _fire_reminder(reminder_id: int):
         """
-        提醒线程，等待指定时间后显示通知
+        提醒到期时由调度线程调用，显示通知
         
         Args:
             reminder_id: 提醒ID
-            delay_seconds: 延迟秒数
-            title: 通知标题
-            message: 通知内容
-            repeat: 是否重复提醒
-            repeat_interval: 重复间隔（秒）
         """
-        logger.info(f"设置提醒: ID={reminder_id}, 延迟={delay_seconds}秒, 标题='{title}', 内容='{message}'")
+        with ReminderManager._lock:
+            reminder = ReminderManager._active_reminders.get(reminder_id)
+            if reminder is None:
+                return
+            first = reminder["fired"] == 0
+            reminder["fired"] += 1
+            repeat = reminder["repeat_interval"] > 0
+            if repeat:
+                reminder["time"] = datetime.now() + timedelta(seconds=reminder["repeat_interval"])
+                # 先记录下次到期时间，通知过程中崩溃也不会重复触发本次提醒
+                ReminderManager._store.update(
+                    reminder_id, reminder["time"].timestamp(), reminder["fired"]
+                )
         
-        try:
-            # 等待指定时间
-            time.sleep(delay_seconds)
-            
-            # 显示通知
-            ReminderManager._show_notification("⏰ 提醒时间到了", message)
-            
-            # 如果设置了重复提醒，继续循环
-            while repeat and reminder_id in ReminderManager._active_reminders:
-                time.sleep(repeat_interval)
-                ReminderManager._show_notification(title, message)
-                
-        except Exception as e:
-            logger.error(f"提醒线程出错: {str(e)}", exc_info=True)
-        finally:
-            # 如果不是重复提醒，或者提醒已被取消，从活跃提醒中移除
-            if not repeat or reminder_id not in ReminderManager._active_reminders:
-                ReminderManager._remove_reminder(reminder_id)
-                
-            # 更新提醒状态为已完成
-            if reminder_id in ReminderManager._active_reminders:
-                ReminderManager._active_reminders[reminder_id]["status"] = "completed"
+        # 首次触发使用统一标题，之后的重复提醒使用提醒自己的标题
+        title = "⏰ 提醒时间到了" if first else reminder["title"]
+        ReminderManager._show_notification(title, reminder["message"])
+        
+        # 单次提醒触发后移除，重复提醒保留到被取消
+        if not repeat:
+            ReminderManager._remove_reminder(reminder_id)
     
     @staticmethod
     def _remove_reminder(reminder_id: int) -> bool:
@@ -154,66 +148,88 @@ class ReminderManager:
         Returns:
             bool: 操作是否成功
         """
-        if reminder_id in ReminderManager._active_reminders:
-            logger.info(f"移除提醒: ID={reminder_id}")
-            ReminderManager._active_reminders.pop(reminder_id, None)
-            return True
-        return False
+        store = ReminderManager._get_store()
+        with ReminderManager._lock:
+            reminder = ReminderManager._active_reminders.pop(reminder_id, None)
+        if reminder is None:
+            return False
+        logger.info(f"移除提醒: ID={reminder_id}")
+        # 从调度器中取消，立即生效，不会再触发
+        ReminderManager._get_scheduler().cancel(reminder["handle"])
+        store.remove(reminder_id)
+        return True
     
     @staticmethod
-    def set_reminder(time_str: str, message: str, title: str = "提醒") -> Dict[str, Any]:
+    def set_reminder(time_str: str, message: str, title: str = "提醒",
+                     repeat_interval: int = 0) -> Dict[str, Any]:
         """
         设置一个提醒
         
         Args:
-            time_str: 时间字符串，如"3分钟"、"5秒"、"1小时30分钟"
+            time_str: 时间字符串，如"3分钟"、"1小时30分钟"、"明天早上8点"、"每天9点"
             message: 提醒内容
             title: 提醒标题
+            repeat_interval: 重复间隔（秒），0 表示按时间字符串决定是否重复
             
         Returns:
             Dict: 包含设置结果的字典
         """
-        try:
-            # 解析时间字符串
-            seconds, time_description = ReminderManager._parse_time_string(time_str)
+        parsed = parse_reminder(time_str)
+        if parsed is None or parsed.delay <= 0:
+            logger.error(f"无效的时间字符串: {time_str}")
+            return {
+                "status": "error",
+                "message": f"无效的时间设置: {time_str}"
+            }
+        if repeat_interval > 0:
+            parsed.repeat_interval = repeat_interval
+        return ReminderManager.set_parsed_reminder(parsed, message, title)
+    
+    @staticmethod
+    def set_parsed_reminder(parsed: ParsedReminder, message: str,
+                            title: str = "提醒") -> Dict[str, Any]:
+        """
+        按 time_parser 的解析结果设置提醒
+        
+        Args:
+            parsed: parse_reminder() 的返回值
+            message: 提醒内容
+            title: 提醒标题
             
-            if seconds <= 0:
-                logger.error(f"无效的时间字符串: {time_str}")
+        Returns:
+            Dict: 包含设置结果的字典
+        """
+        try:
+            if parsed.delay <= 0:
                 return {
                     "status": "error",
-                    "message": f"无效的时间设置: {time_str}"
+                    "message": f"提醒时间已过: {parsed.description}"
                 }
             
-            # 生成提醒ID
-            ReminderManager._reminder_counter += 1
-            reminder_id = ReminderManager._reminder_counter
+            reminder_time = parsed.due
+            repeat_interval = parsed.repeat_interval
             
-            # 计算提醒时间
-            reminder_time = datetime.now() + timedelta(seconds=seconds)
+            store = ReminderManager._get_store()
+            with ReminderManager._lock:
+                # 先写入存储并以存储分配的ID作为提醒ID，再加入调度器
+                reminder_id = store.add(
+                    message, title, reminder_time.timestamp(), repeat_interval
+                )
+                ReminderManager._schedule({
+                    "id": reminder_id,
+                    "message": message,
+                    "title": title,
+                    "time": reminder_time,
+                    "repeat_interval": repeat_interval,
+                    "fired": 0,
+                    "status": "active"
+                }, parsed.delay)
             
-            # 创建并启动提醒线程
-            reminder_thread = threading.Thread(
-                target=ReminderManager._reminder_thread,
-                args=(reminder_id, seconds, title, message),
-                daemon=True
-            )
-            reminder_thread.start()
-            
-            # 存储提醒信息
-            ReminderManager._active_reminders[reminder_id] = {
-                "id": reminder_id,
-                "message": message,
-                "title": title,
-                "time": reminder_time,
-                "thread": reminder_thread,
-                "status": "active"
-            }
-            
-            logger.info(f"成功设置提醒: ID={reminder_id}, 时间={time_description}后, 内容='{message}'")
+            logger.info(f"成功设置提醒: ID={reminder_id}, 时间={parsed.description}, 内容='{message}'")
             
             return {
                 "status": "success",
-                "message": f"已设置{time_description}后提醒: {message}",
+                "message": f"已设置{parsed.description}提醒: {message}",
                 "reminder_id": reminder_id,
                 "reminder_time": reminder_time.strftime("%Y-%m-%d %H:%M:%S")
             }
@@ -269,7 +285,11 @@ class ReminderManager:
             reminders = []
             now = datetime.now()
             
-            for reminder_id, reminder in ReminderManager._active_reminders.items():
+            ReminderManager.restore()
+            with ReminderManager._lock:
+                active = list(ReminderManager._active_reminders.items())
+            
+            for reminder_id, reminder in active:
                 remaining_seconds = (reminder["time"] - now).total_seconds()
                 
                 if remaining_seconds > 0 or reminder["status"] == "completed":
@@ -0,0 +1,162 @@
+"""
+提醒调度器
+
+所有提醒保存在一个按到期时间排序的最小堆中，由一个工作线程等待最早到期的
+提醒，不再为每个提醒创建一个睡眠的线程。插入 O(log n)；取消只做标记，
+立即生效，被标记的条目在出堆时跳过，堆中作废条目过多时整体重建。
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger("ReminderScheduler")
+
+
+class ScheduledReminder:
+    """调度器返回的提醒句柄，用于取消或查询下次触发时间"""
+
+    __slots__ = ("due", "interval", "callback", "cancelled", "pending")
+
+    def __init__(self, due: float, interval: float, callback: Callable[[], None]):
+        self.due = due  # 下次触发的 time.monotonic() 时间
+        self.interval = interval  # 重复间隔（秒），0 表示只触发一次
+        self.callback = callback
+        self.cancelled = False
+        self.pending = True  # 仍在堆中等待触发
+
+    @property
+    def remaining(self) -> float:
+        """距离下次触发的秒数"""
+        return max(0.0, self.due - time.monotonic())
+
+
+class ReminderScheduler:
+    """单线程的最小堆提醒调度器"""
+
+    # 作废条目超过该数量且超过堆大小一半时重建堆
+    COMPACT_THRESHOLD = 64
+
+    def __init__(self, name: str = "reminder_scheduler"):
+        self.name = name
+        self._heap: List[Tuple[float, int, ScheduledReminder]] = []
+        self._counter = itertools.count()  # 到期时间相同时按加入顺序触发
+        self._cond = threading.Condition()
+        self._cancelled = 0  # 堆中已取消的条目数
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def __len__(self) -> int:
+        """等待触发的提醒数量"""
+        with self._cond:
+            return len(self._heap) - self._cancelled
+
+    def schedule(self, delay: float, callback: Callable[[], None],
+                 interval: float = 0.0) -> ScheduledReminder:
+        """
+        delay 秒后在调度线程中执行 callback
+
+        Args:
+            delay: 延迟秒数
+            callback: 到期时执行的函数，应尽快返回，耗时操作交给其他线程
+            interval: 重复间隔（秒），大于 0 时之后每隔 interval 秒再次执行
+
+        Returns:
+            ScheduledReminder: 提醒句柄
+        """
+        reminder = ScheduledReminder(time.monotonic() + max(0.0, delay), interval, callback)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("调度器已关闭")
+            self._push(reminder)
+            self._ensure_thread()
+        return reminder
+
+    def cancel(self, reminder: ScheduledReminder) -> bool:
+        """
+        取消提醒，立即生效
+
+        Returns:
+            bool: 提醒是否仍在等待触发
+        """
+        with self._cond:
+            if reminder.cancelled or not reminder.pending:
+                reminder.cancelled = True
+                return False
+            reminder.cancelled = True
+            self._cancelled += 1
+            if (self._cancelled > self.COMPACT_THRESHOLD
+                    and self._cancelled * 2 > len(self._heap)):
+                self._compact()
+            # 被取消的可能是最早到期的提醒，唤醒工作线程重新计算等待时间
+            self._cond.notify()
+            return True
+
+    def close(self):
+        """停止调度线程，未触发的提醒被丢弃"""
+        with self._cond:
+            self._closed = True
+            self._heap.clear()
+            self._cancelled = 0
+            self._cond.notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+    def _push(self, reminder: ScheduledReminder):
+        # 调用方持有锁
+        entry = (reminder.due, next(self._counter), reminder)
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry:
+            self._cond.notify()
+
+    def _compact(self):
+        # 调用方持有锁
+        self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+        heapq.heapify(self._heap)
+        self._cancelled = 0
+
+    def _ensure_thread(self):
+        # 调用方持有锁
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _next_due(self) -> Optional[ScheduledReminder]:
+        """弹出已到期的提醒，没有时等待；返回 None 表示调度器已关闭"""
+        with self._cond:
+            while not self._closed:
+                heap = self._heap
+                while heap and heap[0][2].cancelled:
+                    heapq.heappop(heap)[2].pending = False
+                    self._cancelled -= 1
+                if not heap:
+                    self._cond.wait()
+                    continue
+                wait = heap[0][0] - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                reminder = heapq.heappop(heap)[2]
+                reminder.pending = False
+                return reminder
+        return None
+
+    def _run(self):
+        while True:
+            reminder = self._next_due()
+            if reminder is None:
+                return
+            try:
+                reminder.callback()
+            except Exception as e:
+                logger.error(f"执行提醒回调出错: {str(e)}", exc_info=True)
+            if reminder.interval > 0:
+                with self._cond:
+                    if not reminder.cancelled and not self._closed:
+                        # 按上次的到期时间推算，避免回调耗时造成累积漂移
+                        reminder.due = max(reminder.due + reminder.interval, time.monotonic())
+                        reminder.pending = True
+                        self._push(reminder)
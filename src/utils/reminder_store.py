@@ -0,0 +1,182 @@
+"""
+提醒持久化存储
+
+用 SQLite 保存所有未完成的提醒（内容、到期时间、重复间隔、已触发次数），
+到期时间上建有索引，启动时按到期顺序读出即可恢复调度。每次修改都在一个
+事务中完成，进程崩溃或被杀死后重启不会丢失提醒；已经过期的提醒由调用方
+在恢复时立即触发。
+
+删除的提醒会在数据库中留下空闲页，累计删除足够多后在后台线程中整理
+（合并 WAL 并在空闲页过多时 VACUUM），不阻塞设置和触发提醒。
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("ReminderStore")
+
+
+class ReminderStore:
+    """提醒存储（线程安全）"""
+
+    # 累计删除多少条提醒后触发一次后台整理
+    COMPACT_EVERY = 256
+    # 空闲页超过总页数的该比例时执行 VACUUM
+    VACUUM_RATIO = 0.25
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            isolation_level=None  # 手动管理事务
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS reminders ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " message TEXT NOT NULL,"
+            " title TEXT NOT NULL,"
+            " due REAL NOT NULL,"
+            " repeat_interval REAL NOT NULL DEFAULT 0,"
+            " fired INTEGER NOT NULL DEFAULT 0,"
+            " created REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS reminders_due ON reminders (due)"
+        )
+        self._deleted = 0
+        self._compact_thread: Optional[threading.Thread] = None
+
+    def _transaction(self):
+        return _Transaction(self._db, self._lock)
+
+    def add(self, message: str, title: str, due: float, repeat_interval: float = 0) -> int:
+        """
+        保存一个提醒
+
+        Args:
+            message: 提醒内容
+            title: 提醒标题
+            due: 到期时间（time.time() 时间戳）
+            repeat_interval: 重复间隔（秒），0 表示只提醒一次
+
+        Returns:
+            int: 提醒ID，删除后也不会被重新分配
+        """
+        with self._transaction() as db:
+            cursor = db.execute(
+                "INSERT INTO reminders (message, title, due, repeat_interval, fired, created)"
+                " VALUES (?, ?, ?, ?, 0, ?)",
+                (message, title, due, repeat_interval, time.time())
+            )
+            return cursor.lastrowid
+
+    def update(self, reminder_id: int, due: float, fired: int):
+        """记录重复提醒的下次到期时间和已触发次数"""
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE reminders SET due = ?, fired = ? WHERE id = ?",
+                (due, fired, reminder_id)
+            )
+
+    def remove(self, reminder_id: int) -> bool:
+        """
+        删除提醒（完成或取消）
+
+        Returns:
+            bool: 提醒是否存在
+        """
+        with self._transaction() as db:
+            removed = db.execute(
+                "DELETE FROM reminders WHERE id = ?", (reminder_id,)
+            ).rowcount > 0
+            if removed:
+                self._deleted += 1
+                compact = self._deleted >= self.COMPACT_EVERY
+        if removed and compact:
+            self._compact_in_background()
+        return removed
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """按到期时间顺序返回所有未完成的提醒"""
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT id, message, title, due, repeat_interval, fired"
+                " FROM reminders ORDER BY due"
+            ).fetchall()
+        return [
+            {
+                "id": row[0],
+                "message": row[1],
+                "title": row[2],
+                "due": row[3],
+                "repeat_interval": row[4],
+                "fired": row[5],
+            }
+            for row in rows
+        ]
+
+    def __len__(self) -> int:
+        with self._transaction() as db:
+            return db.execute("SELECT COUNT(*) FROM reminders").fetchone()[0]
+
+    def compact(self):
+        """合并 WAL，空闲页过多时重建数据库文件"""
+        with self._lock:
+            self._deleted = 0
+            free = self._db.execute("PRAGMA freelist_count").fetchone()[0]
+            pages = self._db.execute("PRAGMA page_count").fetchone()[0]
+            if pages and free / pages > self.VACUUM_RATIO:
+                self._db.execute("VACUUM")
+                logger.info(f"提醒存储已整理，释放 {free} 个空闲页")
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _compact_in_background(self):
+        if self._compact_thread and self._compact_thread.is_alive():
+            return
+        self._compact_thread = threading.Thread(
+            target=self._run_compact, name="reminder_store_compact", daemon=True
+        )
+        self._compact_thread.start()
+
+    def _run_compact(self):
+        try:
+            self.compact()
+        except sqlite3.Error as e:
+            logger.warning(f"整理提醒存储失败: {e}")
+
+    def close(self):
+        if self._compact_thread:
+            self._compact_thread.join(timeout=5)
+        with self._lock:
+            self._db.close()
+
+
+class _Transaction:
+    """持有存储锁并在一个 SQLite 事务中执行，异常时回滚"""
+
+    def __init__(self, db: sqlite3.Connection, lock: threading.Lock):
+        self._db = db
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        self._db.execute("BEGIN IMMEDIATE")
+        return self._db
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self._db.execute("COMMIT")
+            else:
+                self._db.execute("ROLLBACK")
+        finally:
+            self._lock.release()
+        return False
@@ -0,0 +1,189 @@
+"""
+启动耗时分析工具
+
+记录模块导入耗时（与 python -X importtime 的输出格式一致）以及启动阶段耗时，
+用于发现启动速度的回退。通过 main.py 的 --startup-report 参数或环境变量
+XIAOZHI_STARTUP_REPORT=1 启用。
+"""
+
+import logging
+import sys
+import threading
+import time
+from importlib.abc import MetaPathFinder
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger("StartupProfiler")
+
+
+class _TimedLoader:
+    """包装模块加载器，记录 exec_module 的耗时"""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        return create(spec) if create else None
+
+    def exec_module(self, module):
+        self._profiler._enter_import()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit_import(
+                module.__name__, time.perf_counter() - start
+            )
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(MetaPathFinder):
+    """位于 sys.meta_path 首位的查找器，为找到的模块套上计时加载器"""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path=None, target=None):
+        # 防止在委托查找时递归进入自身
+        if getattr(self._local, "busy", False):
+            return None
+        self._local.busy = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(spec.loader, self._profiler)
+                    return spec
+            return None
+        finally:
+            self._local.busy = False
+
+
+class StartupProfiler:
+    """启动耗时分析器（单例）"""
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = StartupProfiler()
+        return cls._instance
+
+    def __init__(self):
+        self.enabled = False
+        self.start_time = time.perf_counter()
+        self._finder = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # (模块名, 自身耗时, 累计耗时, 嵌套深度)
+        self.imports: List[Tuple[str, float, float, int]] = []
+        # (阶段名, 相对启动的时间点)
+        self.marks: List[Tuple[str, float]] = []
+        # (步骤名, 相对启动的开始时间, 耗时, 线程名, 状态)
+        self.steps: List[Tuple[str, float, float, str, str]] = []
+
+    def enable(self):
+        """开始记录模块导入耗时"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.start_time = time.perf_counter()
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def disable(self):
+        """停止记录模块导入耗时"""
+        if self._finder and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter_import(self):
+        # 每一层记录子模块的累计耗时，用于计算自身耗时
+        self._stack().append(0.0)
+
+    def _exit_import(self, name: str, elapsed: float):
+        stack = self._stack()
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        with self._lock:
+            self.imports.append((name, elapsed - children, elapsed, len(stack)))
+
+    def mark(self, stage: str):
+        """记录启动阶段的时间点"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.marks.append((stage, time.perf_counter() - self.start_time))
+
+    def record_step(self, name: str, start: float, duration: float,
+                    thread_name: str = "", status: str = "done"):
+        """记录一个初始化步骤，start 为 time.perf_counter() 时间点"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.steps.append(
+                (name, start - self.start_time, duration, thread_name, status)
+            )
+
+    def format_report(self, top: int = 15) -> str:
+        """生成启动报告文本"""
+        with self._lock:
+            imports = list(self.imports)
+            marks = list(self.marks)
+            steps = sorted(self.steps, key=lambda item: item[1])
+
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for name, self_time, cumulative, depth in imports:
+            lines.append(
+                f"import time: {int(self_time * 1e6):>9} | "
+                f"{int(cumulative * 1e6):>10} | {'  ' * depth}{name}"
+            )
+
+        if imports:
+            lines.append("")
+            lines.append(f"===== 导入耗时最多的 {top} 个顶层模块 =====")
+            roots = [item for item in imports if item[3] == 0]
+            for name, _, cumulative, _ in sorted(
+                    roots, key=lambda item: item[2], reverse=True)[:top]:
+                lines.append(f"{cumulative * 1000:>9.1f} ms  {name}")
+            total = sum(item[2] for item in roots)
+            lines.append(f"{total * 1000:>9.1f} ms  (导入合计)")
+
+        if marks:
+            lines.append("")
+            lines.append("===== 启动阶段 =====")
+            for stage, offset in marks:
+                lines.append(f"{offset * 1000:>9.1f} ms  {stage}")
+
+        if steps:
+            lines.append("")
+            lines.append("===== 初始化步骤（开始时间 / 耗时） =====")
+            for name, offset, duration, thread_name, status in steps:
+                flag = "" if status == "done" else f" ({status})"
+                lines.append(
+                    f"{offset * 1000:>9.1f} ms  {duration * 1000:>8.1f} ms  "
+                    f"{name}{flag} [{thread_name}]"
+                )
+        return "\n".join(lines)
+
+    def report(self, stream: Optional[object] = None):
+        """把启动报告输出到 stderr（与 -X importtime 一致）"""
+        if not self.enabled:
+            return
+        print(self.format_report(), file=stream or sys.stderr)
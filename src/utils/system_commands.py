@@ -3,15 +3,17 @@ import logging
 import os
 from typing import Optional, Dict, Any, List
 import sys
-import winreg
 import json
 import time
-import win32com.client
 from distutils.spawn import find_executable
+from src.utils.app_index import AppIndex
 from src.utils.reminder import ReminderManager
 from src.utils.reminder_commands import process_reminder_command, process_countdown_command
 import re
 
+if os.name == "nt":
+    import winreg
+
 logger = logging.getLogger(__name__)
 
 class SystemCommands:
@@ -41,67 +43,24 @@ class SystemCommands:
             if program.lower().endswith('.exe'):
                 program_name_no_ext = program[:-4]
             
-            # 第一步：搜索开始菜单中的快捷方式（最优先，因为能找到用户实际安装的程序）
-            start_menu_paths = [
-                os.path.join(os.environ.get("ProgramData", ""), "Microsoft", "Windows", "Start Menu", "Programs"),
-                os.path.join(os.environ.get("APPDATA", ""), "Microsoft", "Windows", "Start Menu", "Programs"),
-                # 添加桌面路径
-                os.path.join(os.environ.get("USERPROFILE", ""), "Desktop"),
-                os.path.join(os.environ.get("PUBLIC", ""), "Desktop")
-            ]
-            
-            # 尝试找到正确的快捷方式
-            for start_menu_path in start_menu_paths:
-                if os.path.exists(start_menu_path):
-                    # 使用多级目录遍历寻找所有快捷方式
-                    logger.debug(f"搜索目录: {start_menu_path}")
-                    for root, dirs, files in os.walk(start_menu_path):
-                        # 检查文件名是否匹配
-                        name_matches = []
-                        for file in files:
-                            file_lower = file.lower()
-                            if file_lower.endswith('.lnk'):
-                                # 提取快捷方式名称（不含扩展名）
-                                shortcut_name = os.path.splitext(file)[0].lower()
-                                program_lower = program_name_no_ext.lower()
-                                
-                                # 检查完全匹配
-                                if shortcut_name == program_lower:
-                                    name_matches.append((file, 100))  # 完全匹配得分100
-                                # 检查程序名是否包含在快捷方式名称中
-                                elif program_lower in shortcut_name:
-                                    name_matches.append((file, 80))  # 部分匹配得分80
-                                # 检查快捷方式名称是否包含在程序名中
-                                elif shortcut_name in program_lower:
-                                    name_matches.append((file, 60))  # 反向包含得分60
-                        
-                        # 按匹配度排序
-                        name_matches.sort(key=lambda x: x[1], reverse=True)
-                        
-                        # 处理找到的匹配项
-                        for file, score in name_matches:
-                            shortcut_path = os.path.join(root, file)
-                            logger.info(f"找到可能的快捷方式: {shortcut_path}，匹配度: {score}")
-                            
-                            try:
-                                # 解析快捷方式文件获取目标路径
-                                shell = win32com.client.Dispatch("WScript.Shell")
-                                shortcut = shell.CreateShortCut(shortcut_path)
-                                target_path = shortcut.Targetpath
-                                
-                                # 额外检查目标路径是否包含程序名的关键部分（防止误匹配）
-                                if os.path.isfile(target_path):
-                                    target_filename = os.path.basename(target_path).lower()
-                                    if (program_name_no_ext.lower() in target_filename or 
-                                        target_filename in program_name_no_ext.lower() or
-                                        score == 100):
-                                        logger.info(f"快捷方式目标路径: {target_path}")
-                                        return target_path
-                                    else:
-                                        logger.debug(f"快捷方式目标不匹配程序名: {target_path}")
-                            except Exception as e:
-                                logger.error(f"解析快捷方式失败: {e}")
-                                continue
+            # 第一步：在应用程序索引中查找开始菜单和桌面的快捷方式（最优先，因为能找到用户实际安装的程序）
+            index = AppIndex.get_instance()
+            # 与原先的遍历一致：快捷方式名称包含程序名即可，再用目标文件名确认
+            match = index.search(program_name_no_ext, sources=("start_menu", "desktop"), contains=True)
+            if match:
+                logger.info(f"找到可能的快捷方式: {match['path']}，匹配度: {match['match_score']}")
+                target_path = index.resolve(match)
+                
+                # 额外检查目标路径是否包含程序名的关键部分（防止误匹配）
+                if target_path and os.path.isfile(target_path):
+                    target_filename = os.path.basename(target_path).lower()
+                    if (program_name_no_ext.lower() in target_filename or 
+                        target_filename in program_name_no_ext.lower() or
+                        match['match_score'] == 100):
+                        logger.info(f"快捷方式目标路径: {target_path}")
+                        return target_path
+                    else:
+                        logger.debug(f"快捷方式目标不匹配程序名: {target_path}")
             
             # 第二步：按照不同类型的应用程序特别处理
             # 添加.exe后缀（如果没有）
@@ -118,16 +77,17 @@ class SystemCommands:
                     logger.info(f"在PATH中找到程序: {exe_file}")
                     return exe_file
             
-            # 查询注册表中的App Paths
-            try:
-                logger.debug("在注册表App Paths中查找程序")
-                key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths\\" + program_with_ext)
-                path, _ = winreg.QueryValueEx(key, None)
-                if os.path.isfile(path):
-                    logger.info(f"在注册表App Paths中找到程序: {path}")
-                    return path
-            except WindowsError:
-                logger.debug(f"在注册表中未找到程序: {program_with_ext}")
+            # 查询注册表中的App Paths（仅Windows）
+            if os.name == "nt":
+                try:
+                    logger.debug("在注册表App Paths中查找程序")
+                    key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths\\" + program_with_ext)
+                    path, _ = winreg.QueryValueEx(key, None)
+                    if os.path.isfile(path):
+                        logger.info(f"在注册表App Paths中找到程序: {path}")
+                        return path
+                except OSError:
+                    logger.debug(f"在注册表中未找到程序: {program_with_ext}")
             
             # 第三步：根据程序名特殊处理常见应用的路径
             # 微信
@@ -705,6 +665,8 @@ class SystemCommands:
                     logger.info(f"特殊处理应用路径 '{term}': {app_name}")
                     break
         
+        launch_command = None
+        
         # 检查是否是完整路径
         if os.path.exists(app_name) and os.access(app_name, os.X_OK):
             program_path = app_name
@@ -724,14 +686,15 @@ class SystemCommands:
                 # 尝试在系统路径中查找可执行文件
                 program_path = find_executable(app_name)
                 
-                # 如果找不到，则尝试在开始菜单中搜索快捷方式
-                if not program_path and os.name == 'nt':  # 仅在Windows系统下执行
-                    from src.utils.app_finder import find_app_in_start_menu
-                    search_result = find_app_in_start_menu(app_name)
+                # 如果找不到，则在应用程序索引中搜索（Windows 为开始菜单快捷方式，Linux 为 .desktop 文件）
+                if not program_path:
+                    from src.utils.app_finder import search_app
+                    search_result = search_app(app_name)
                     
-                    if search_result and search_result['executable_path']:
+                    if search_result and search_result.get('executable_path'):
                         program_path = search_result['executable_path']
-                        logger.info(f"在开始菜单中找到应用程序: {program_path} (匹配度: {search_result['match_score']}%)")
+                        launch_command = search_result.get('command')
+                        logger.info(f"在应用程序索引中找到应用程序: {program_path} (匹配度: {search_result['match_score']}%)")
         
         # 如果找到了程序路径，则尝试打开
         if program_path:
@@ -753,7 +716,8 @@ class SystemCommands:
                     if os.name == 'nt':  # Windows
                         subprocess.Popen(f'start "" "{program_path}"', shell=True)
                     else:  # Linux/Mac
-                        subprocess.Popen([program_path])
+                        # .desktop 文件的 Exec 可能带有参数
+                        subprocess.Popen(launch_command or [program_path])
                 
                 logger.info(f"已成功启动应用程序: {app_name}")
                 return True
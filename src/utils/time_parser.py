@@ -0,0 +1,307 @@
+"""
+提醒时间解析
+
+把"明天早上8点提醒我开会"、"1小时30分钟后提醒我喝水"、"每周一9点提醒我写周报"
+这样的口语命令解析为到期时间、重复间隔和提醒内容。
+
+所有词法规则合并为一个预编译的正则，对命令只扫描一遍：每个匹配的词元按类型
+（相对时长、日期、星期、时段、钟点、重复、引导词）归入时间表达式，
+其余没有被匹配的文本就是提醒内容。已经出现时间表达式后遇到"提醒我"这样的
+引导词，之后的文本整体作为提醒内容，其中的"明天"、"周一"不再当作时间。
+"""
+
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+# 阿拉伯数字或中文数字（支持到"九百九十九"）
+_NUM = r"(?:\d+|[零一二两三四五六七八九十百]+)"
+
+_UNIT_SECONDS = {
+    "周": 604800, "星期": 604800, "礼拜": 604800,
+    "天": 86400,
+    "小时": 3600, "钟头": 3600, "h": 3600, "hr": 3600, "hrs": 3600,
+    "hour": 3600, "hours": 3600,
+    "分钟": 60, "分": 60, "m": 60, "min": 60, "mins": 60,
+    "minute": 60, "minutes": 60,
+    "秒钟": 1, "秒": 1, "s": 1, "sec": 1, "secs": 1,
+    "second": 1, "seconds": 1,
+}
+
+# 长的单位在前，保证"分钟"不会被当成"分"
+_UNITS = "|".join(sorted((re.escape(u) for u in _UNIT_SECONDS), key=len, reverse=True))
+
+# 英文单位后不能紧跟字母，避免把"5mg"解析成 5 分钟
+_DURATION_UNIT = rf"(?:{_UNITS})(?![a-z])"
+
+_PERIODS = {
+    "凌晨": 0, "早上": 8, "早晨": 8, "上午": 9, "中午": 12,
+    "下午": 15, "傍晚": 18, "晚上": 20, "夜里": 22,
+}
+
+_DAYS = {
+    "今天": (0, None), "今日": (0, None), "明天": (1, None), "明日": (1, None),
+    "后天": (2, None), "大后天": (3, None),
+    "今早": (0, "早上"), "今晚": (0, "晚上"), "明早": (1, "早上"), "明晚": (1, "晚上"),
+}
+
+_WEEKDAYS = {"一": 0, "二": 1, "三": 2, "四": 3, "五": 4, "六": 5, "日": 6, "天": 6,
+             "1": 0, "2": 1, "3": 2, "4": 3, "5": 4, "6": 5, "7": 6}
+
+# 词元可能的首字符。放在整个正则前面作为前瞻，扫描时不可能开始词元的位置
+# 只做一次字符集判断，不必逐个尝试下面的分支
+_TOKEN_START = "[0-9零一二两三四五六七八九十百每在于下这本周星礼今明后大凌早上中傍晚夜过半请帮记倒并提通告叫]"
+
+_TOKEN_RE = re.compile(
+    f"(?={_TOKEN_START})(?:" + "|".join([
+        # 引导词，不计入提醒内容；f_cue 之后是提醒内容
+        r"(?P<filler>请|帮我|倒计时|(?P<f_cue>记得|并?(?:提醒|通知|告诉|叫)我?))",
+        # 相对时长：3分钟后 / 过两个小时 / 一个半小时以后 / 半小时后
+        rf"(?P<duration>过?(?:(?P<d_num>{_NUM})个?(?P<d_half>半)?|半)个?"
+        rf"\s*(?P<d_unit>{_DURATION_UNIT})(?P<d_after>以后|之后|后)?)",
+        # 钟点：8点 / 8点半 / 8点一刻 / 8点30分 / 20:30
+        r"(?P<clock_hm>(?:在|于)?(?P<c_hh>\d{1,2})[:：](?P<c_mm>\d{2}))",
+        rf"(?P<clock>(?:在|于)?(?P<c_hour>{_NUM})(?:点|时)钟?"
+        rf"(?:(?P<c_half>半)|(?P<c_quarter>[一三])刻|(?P<c_min>{_NUM})分?)?)",
+        # 日期：今天 / 明晚 / 大后天
+        rf"(?P<day>(?:在|于)?(?:{'|'.join(sorted(_DAYS, key=len, reverse=True))}))",
+        # 时段：早上 / 下午
+        rf"(?P<period>(?:在|于)?(?:{'|'.join(_PERIODS)}))",
+        # 星期：周三 / 下周一 / 星期天
+        r"(?P<weekday>(?:在|于)?(?P<w_next>下个?|这个?|本)?(?:周|星期|礼拜)(?P<w_day>[一二三四五六日天1-7]))",
+        # 重复：每天 / 每晚 / 每周一 / 每隔30分钟 / 每小时
+        r"(?P<every_day>每(?:天|日))",
+        r"(?P<every_night>每(?:晚|早))",
+        r"(?P<every_week>每个?(?:周|星期|礼拜)(?P<ew_day>[一二三四五六日天1-7]))",
+        rf"(?P<every>每隔?(?P<e_num>{_NUM})?个?(?P<e_unit>小时|钟头|分钟|秒钟?|天|周|星期))",
+        # 不带单位的数字，只有命令以它开头或调用方指定了默认单位时才算时间
+        r"(?P<bare>\d+)",
+    ]) + ")",
+    re.IGNORECASE,
+)
+
+_CN_DIGITS = {"零": 0, "一": 1, "二": 2, "两": 2, "三": 3, "四": 4,
+              "五": 5, "六": 6, "七": 7, "八": 8, "九": 9}
+
+# 提醒内容首尾需要去掉的标点和空白
+_MESSAGE_STRIP = " \t\r\n,，.。!！:：;；、"
+
+
+def parse_number(text: str) -> int:
+    """
+    解析阿拉伯数字或中文数字
+
+    Args:
+        text: 如 "12"、"十二"、"两"、"一百零五"
+
+    Returns:
+        int: 数值
+    """
+    if text.isdigit():
+        return int(text)
+    total, current = 0, 0
+    for char in text:
+        if char == "百":
+            total += (current or 1) * 100
+            current = 0
+        elif char == "十":
+            total += (current or 1) * 10
+            current = 0
+        else:
+            current = _CN_DIGITS[char]
+    return total + current
+
+
+class ParsedReminder:
+    """解析结果：到期时间、重复间隔和提醒内容"""
+
+    __slots__ = ("due", "delay", "repeat_interval", "message", "description")
+
+    def __init__(self, due: datetime, delay: float, repeat_interval: int,
+                 message: str, description: str):
+        self.due = due
+        self.delay = delay  # 距离到期的秒数
+        self.repeat_interval = repeat_interval  # 重复间隔（秒），0 表示不重复
+        self.message = message  # 提醒内容，命令中没有时为空字符串
+        self.description = description  # 如 "3分钟后"、"明天08:00"、"每天08:00"
+
+    @property
+    def recurring(self) -> bool:
+        return self.repeat_interval > 0
+
+    def __repr__(self):
+        return (f"ParsedReminder(due={self.due:%Y-%m-%d %H:%M:%S}, "
+                f"repeat_interval={self.repeat_interval}, message={self.message!r})")
+
+
+def format_duration(seconds: int) -> str:
+    """把秒数格式化为"1小时30分钟"这样的描述"""
+    days, rest = divmod(int(seconds), 86400)
+    hours, rest = divmod(rest, 3600)
+    minutes, secs = divmod(rest, 60)
+    parts = []
+    for value, unit in ((days, "天"), (hours, "小时"), (minutes, "分钟"), (secs, "秒")):
+        if value:
+            parts.append(f"{value}{unit}")
+    return "".join(parts) or "0秒"
+
+
+def parse_reminder(query: str, now: Optional[datetime] = None,
+                   default_unit: int = 0) -> Optional[ParsedReminder]:
+    """
+    一次扫描解析提醒命令
+
+    Args:
+        query: 提醒命令，如"明天早上8点提醒我开会"
+        now: 当前时间，默认 datetime.now()
+        default_unit: 不带单位的数字按多少秒计算（如倒计时传 1），
+            为 0 时只有以数字开头的命令（"10 提醒我起床"）按秒计算
+
+    Returns:
+        ParsedReminder: 解析结果，命令中没有时间表达式时返回 None
+    """
+    now = (now or datetime.now()).replace(microsecond=0)
+    relative = 0
+    day_offset: Optional[int] = None
+    weekday: Optional[Tuple[int, bool]] = None  # (星期几, 是否"下周")
+    period: Optional[str] = None
+    clock: Optional[Tuple[int, int]] = None
+    repeat = 0
+    repeat_label = ""
+    bare: Optional[re.Match] = None
+    found = False
+    spans: List[Tuple[int, int]] = []  # 不属于提醒内容的区间
+
+    for match in _TOKEN_RE.finditer(query):
+        kind = match.lastgroup
+        if kind == "bare":
+            # 先当作内容保留，最后没有其他时间表达式时再决定
+            if bare is None and (default_unit or not query[:match.start()].strip()):
+                bare = match
+            continue
+        spans.append(match.span())
+        if kind == "filler":
+            if found and match.group("f_cue"):
+                # "10分钟后提醒我明天回家"：时间已经说完，其余都是提醒内容
+                break
+            continue
+        found = True
+        if kind == "duration":
+            num = match.group("d_num")
+            value = parse_number(num) if num else 0
+            if match.group("d_half") or not num:
+                value += 0.5
+            relative += int(value * _UNIT_SECONDS[match.group("d_unit").lower()])
+        elif kind == "clock":
+            minute = 0
+            if match.group("c_half"):
+                minute = 30
+            elif match.group("c_quarter"):
+                minute = 15 if match.group("c_quarter") == "一" else 45
+            elif match.group("c_min"):
+                minute = parse_number(match.group("c_min"))
+            clock = (parse_number(match.group("c_hour")), minute)
+        elif kind == "clock_hm":
+            clock = (int(match.group("c_hh")), int(match.group("c_mm")))
+        elif kind == "period":
+            period = match.group("period").lstrip("在于")
+        elif kind == "day":
+            day_offset, day_period = _DAYS[match.group("day").lstrip("在于")]
+            period = day_period or period
+        elif kind == "weekday":
+            weekday = (_WEEKDAYS[match.group("w_day")], (match.group("w_next") or "").startswith("下"))
+        elif kind == "every_day":
+            repeat, repeat_label = 86400, "每天"
+        elif kind == "every_night":
+            repeat, repeat_label = 86400, "每天"
+            period = "晚上" if match.group("every_night").endswith("晚") else "早上"
+        elif kind == "every_week":
+            repeat, repeat_label = 604800, "每周" + match.group("ew_day")
+            weekday = (_WEEKDAYS[match.group("ew_day")], False)
+        elif kind == "every":
+            num = match.group("e_num")
+            unit = match.group("e_unit")
+            repeat = (parse_number(num) if num else 1) * _UNIT_SECONDS[unit]
+            repeat_label = "每" + format_duration(repeat)
+
+    if not found:
+        if bare is None:
+            return None
+        relative = int(bare.group("bare")) * (default_unit or 1)
+        spans = sorted(spans + [bare.span()])
+    if clock is not None and (clock[0] > 24 or clock[1] > 59):
+        return None
+
+    parts, last = [], 0
+    for start, end in spans:
+        parts.append(query[last:start])
+        last = end
+    parts.append(query[last:])
+    message = "".join(parts).strip(_MESSAGE_STRIP)
+
+    absolute = day_offset is not None or weekday is not None or clock is not None or period is not None
+    if absolute:
+        due = _resolve_absolute(now, day_offset, weekday, period, clock, bool(repeat))
+    elif repeat and not relative:
+        # "每30分钟提醒我" 从现在起一个间隔后第一次提醒
+        due = now + timedelta(seconds=repeat)
+    else:
+        due = now
+    due += timedelta(seconds=relative)
+
+    if repeat_label:
+        description = repeat_label + (due.strftime("%H:%M") if absolute else "")
+    elif absolute:
+        description = _describe_day(now, due) + due.strftime("%H:%M")
+    else:
+        description = format_duration(relative) + "后"
+
+    return ParsedReminder(due, (due - now).total_seconds(), repeat, message, description)
+
+
+def _resolve_absolute(now: datetime, day_offset: Optional[int], weekday: Optional[Tuple[int, bool]],
+                      period: Optional[str], clock: Optional[Tuple[int, int]],
+                      recurring: bool) -> datetime:
+    """根据日期、星期、时段和钟点计算到期时间"""
+    if clock is not None:
+        hour, minute = clock
+        if hour == 12 and period in ("晚上", "夜里", "凌晨"):
+            # "晚上12点"、"凌晨12点" 指第二天 0 点
+            hour = 24
+        elif period in ("下午", "傍晚", "晚上", "夜里") and hour < 12:
+            hour += 12
+        elif period == "中午" and hour < 3:
+            hour += 12
+    elif period is not None:
+        hour, minute = _PERIODS[period], 0
+    else:
+        # 只说了"明天"、"周三"，默认上午9点
+        hour, minute = 9, 0
+
+    base = now.replace(hour=0, minute=0, second=0)
+    if weekday is not None:
+        target, next_week = weekday
+        days = target - now.weekday()
+        if next_week:
+            days += 7
+        elif days < 0:
+            days += 7
+        base += timedelta(days=days)
+    elif day_offset is not None:
+        base += timedelta(days=day_offset)
+
+    due = base + timedelta(hours=hour, minutes=minute)
+    if due > now or (day_offset is not None and day_offset > 0):
+        return due
+    if weekday is not None:
+        return due + timedelta(days=7)
+    if period is None and clock is not None and hour < 12 and due + timedelta(hours=12) > now \
+            and not recurring:
+        # 没有说上午下午，上午的钟点已过就理解为下午（14点说"3点"指15点）
+        return due + timedelta(hours=12)
+    return due + timedelta(days=1)
+
+
+def _describe_day(now: datetime, due: datetime) -> str:
+    days = (due.date() - now.date()).days
+    return {0: "今天", 1: "明天", 2: "后天"}.get(days, due.strftime("%m月%d日"))
@@ -0,0 +1,111 @@
+"""
+持久化的 TTL 缓存
+
+保存接口查询结果（如歌曲名 -> 歌曲ID、歌曲ID -> 歌词），过期的条目在
+读取时丢弃。数据以 JSON 保存在磁盘上，写入时先写临时文件再替换，
+进程重启后仍然有效。
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger("TTLCache")
+
+
+class PersistentTTLCache:
+    """线程安全的持久化 TTL 缓存，超过 max_entries 时丢弃最久未使用的条目"""
+
+    # 两次写盘之间的最小间隔（秒），避免频繁写入
+    SAVE_INTERVAL = 2.0
+
+    def __init__(self, path: str, ttl: float, max_entries: int = 1000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, list]" = OrderedDict()  # key -> [过期时间, 值]
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # 串行化写盘
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"缓存文件 {self.path} 无效，已忽略: {e}")
+            return
+        now = time.time()
+        for key, entry in data.items():
+            if isinstance(entry, list) and len(entry) == 2 and entry[0] > now:
+                self._entries[key] = entry
+
+    def get(self, key: str) -> Optional[Any]:
+        """获取未过期的值，不存在或已过期时返回 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                self._dirty = True
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """写入值，ttl 为空时使用默认有效期；值必须可以被 JSON 序列化"""
+        with self._lock:
+            self._entries[key] = [time.time() + (ttl or self.ttl), value]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._schedule_save()
+
+    def delete(self, key: str):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._schedule_save()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _schedule_save(self):
+        # 调用方持有锁；合并一段时间内的多次修改为一次写盘
+        self._dirty = True
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.SAVE_INTERVAL, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """立即把修改写入磁盘"""
+        with self._save_lock:
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            data = dict(self._entries)
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"保存缓存文件失败: {e}")
@@ -1,18 +1,18 @@
-import opuslib
-import asyncio
-from edge_tts import Communicate
-import soundfile as sf
 import io
-from pydub import AudioSegment
-import numpy as np
 
 
 class TtsUtility:
+    """文本转语音工具
+
+    edge_tts、pydub、soundfile 等依赖较重，只在实际合成语音时导入。
+    """
+
     def __init__(self, audio_config):
         self.audio_config = audio_config
 
     async def generate_tts(self, text: str) -> bytes:
         """使用 Edge TTS 生成语音"""
+        from edge_tts import Communicate
         communicate = Communicate(text, "zh-CN-XiaoxiaoNeural")
         audio_data = b""
         async for chunk in communicate.stream():
@@ -22,6 +22,10 @@ class TtsUtility:
 
     async def text_to_opus_audio(self, text: str) -> list:
         """将文本转换为 Opus 音频"""
+        import numpy as np
+        import opuslib
+        import soundfile as sf
+        from pydub import AudioSegment
 
         # 1. 生成 TTS 语音
         audio_data = await self.generate_tts(text)
@@ -3,6 +3,159 @@ import platform
 import subprocess
 import re
 import shutil
+import threading
+import time
+
+logger = logging.getLogger("VolumeController")
+
+# 音量 "65%" / "[65%]"
+_PERCENT_RE = re.compile(r'(\d+)%')
+
+
+class _PactlMonitor:
+    """
+    通过一个常驻的 pactl subscribe 进程跟踪 PulseAudio 音量变化
+
+    只在收到 sink/server 变化事件时查询一次音量，读取音量直接返回缓存值。
+    """
+
+    # 收到事件后稍作等待，合并同一批事件
+    EVENT_COALESCE = 0.05
+
+    def __init__(self, on_volume, fallback_query):
+        self._on_volume = on_volume
+        self._fallback_query = fallback_query
+        self._process = None
+        self._changed = threading.Event()
+        self._running = False
+
+    def start(self):
+        self._process = subprocess.Popen(
+            ["pactl", "subscribe"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        self._running = True
+        threading.Thread(target=self._read_events, daemon=True,
+                         name="pactl_subscribe").start()
+        threading.Thread(target=self._refresh_loop, daemon=True,
+                         name="pactl_refresh").start()
+        self._changed.set()  # 启动时读取一次当前音量
+
+    def _read_events(self):
+        for line in self._process.stdout:
+            # 例: Event 'change' on sink #0 / Event 'change' on server
+            if "'change'" in line and (" sink " in line or " server" in line):
+                self._changed.set()
+        if self._running:
+            logger.warning("pactl subscribe 进程已退出，音量变化将不再自动同步")
+
+    def _refresh_loop(self):
+        while self._running:
+            self._changed.wait()
+            if not self._running:
+                break
+            time.sleep(self.EVENT_COALESCE)
+            self._changed.clear()
+            volume = self.query()
+            if volume is not None:
+                self._on_volume(volume)
+
+    def query(self):
+        """查询默认 sink 的音量"""
+        try:
+            result = subprocess.run(
+                ["pactl", "get-sink-volume", "@DEFAULT_SINK@"],
+                capture_output=True,
+                text=True
+            )
+            if result.returncode == 0:
+                match = _PERCENT_RE.search(result.stdout)
+                if match:
+                    return int(match.group(1))
+        except Exception as e:
+            logger.debug(f"通过pactl获取音量失败: {e}")
+        # 旧版本 pactl 没有 get-sink-volume
+        return self._fallback_query()
+
+    def close(self):
+        self._running = False
+        self._changed.set()
+        if self._process and self._process.poll() is None:
+            self._process.terminate()
+
+
+class _AmixerSession:
+    """
+    常驻的 amixer -s 进程，从标准输入读取命令
+
+    设置和查询音量都写入同一个进程，不再为每次调用创建子进程。
+    amixer 输出中的音量百分比会更新缓存。
+    """
+
+    # 没有变化事件可订阅，定期通过常驻进程查询一次
+    POLL_INTERVAL = 2.0
+
+    def __init__(self, on_volume):
+        self._on_volume = on_volume
+        self._process = None
+        self._lock = threading.Lock()
+        self._running = False
+
+    def start(self):
+        cmd = ["amixer", "-s"]
+        # amixer 输出到管道时是块缓冲，借助 stdbuf 改为行缓冲以便及时读到结果
+        can_read = shutil.which("stdbuf") is not None
+        if can_read:
+            cmd = ["stdbuf", "-oL"] + cmd
+        self._process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE if can_read else subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        self._running = True
+        if can_read:
+            threading.Thread(target=self._read_output, daemon=True,
+                             name="amixer_output").start()
+            threading.Thread(target=self._poll_loop, daemon=True,
+                             name="amixer_poll").start()
+
+    def _read_output(self):
+        for line in self._process.stdout:
+            # 例: Front Left: Playback 42 [65%] [on]
+            match = re.search(r'\[(\d+)%\]', line)
+            if match:
+                self._on_volume(int(match.group(1)))
+
+    def _poll_loop(self):
+        while self._running:
+            self.send("sget Master")
+            time.sleep(self.POLL_INTERVAL)
+
+    def send(self, command):
+        with self._lock:
+            if not self._process or self._process.poll() is not None:
+                raise RuntimeError("amixer 进程已退出")
+            self._process.stdin.write(command + "\n")
+            self._process.stdin.flush()
+
+    def set_volume(self, volume):
+        self.send(f"sset Master {volume}%")
+
+    def close(self):
+        self._running = False
+        if self._process and self._process.poll() is None:
+            try:
+                self._process.stdin.close()
+            except Exception:
+                pass
+            self._process.terminate()
+
 
 class VolumeController:
     """跨平台音量控制器"""
@@ -11,6 +164,15 @@ class VolumeController:
         self.logger = logging.getLogger("VolumeController")
         self.system = platform.system()
         self.is_arm = platform.machine().startswith(('arm', 'aarch'))
+
+        # 缓存的当前音量，由常驻后端的变化事件保持最新
+        self._volume = None
+        self._backend = None
+        # 合并写入：只保留最新的目标音量，由写入线程依次应用
+        self._pending_volume = None
+        self._write_lock = threading.Lock()
+        self._write_event = threading.Event()
+        self._writer_thread = None
         
         # 初始化特定平台的控制器
         if self.system == "Windows":
@@ -72,9 +234,40 @@ class VolumeController:
             raise Exception("未找到可用的Linux音量控制工具")
         
         self.logger.debug(f"Linux音量控制初始化成功，使用: {self.linux_tool}")
+        self._start_linux_backend()
+
+    def _start_linux_backend(self):
+        """启动常驻的音量后端，失败时退回到每次调用命令行工具"""
+        try:
+            if self.linux_tool == "pactl":
+                backend = _PactlMonitor(self._on_backend_volume, self._get_pactl_volume)
+                backend.start()
+                # 先同步读取一次，保证 get_volume 立即可用
+                self._volume = backend.query()
+            elif self.linux_tool == "amixer":
+                backend = _AmixerSession(self._on_backend_volume)
+                backend.start()
+                self._volume = self._get_amixer_volume()
+            else:
+                return
+            self._backend = backend
+            self.logger.debug(f"已启动常驻音量后端: {self.linux_tool}")
+        except Exception as e:
+            self.logger.warning(f"启动常驻音量后端失败，将按需调用 {self.linux_tool}: {e}")
+
+    def _on_backend_volume(self, volume):
+        # 还有未写入的音量时忽略外部读数，避免滑块回跳
+        if self._pending_volume is None:
+            self._volume = volume
     
     def get_volume(self):
         """获取当前音量 (0-100)"""
+        with self._write_lock:
+            # 设置的音量尚未写入系统时，系统的读数还是旧值
+            if self._pending_volume is not None:
+                return self._volume
+        if self._backend is not None and self._volume is not None:
+            return self._volume
         if self.system == "Windows":
             return self._get_windows_volume()
         elif self.system == "Darwin":
@@ -84,10 +277,48 @@ class VolumeController:
         return 70  # 默认音量
     
     def set_volume(self, volume):
-        """设置音量 (0-100)"""
+        """设置音量 (0-100)，立即返回，连续的设置会被合并为最后一次"""
         # 确保音量在有效范围内
         volume = max(0, min(100, volume))
-        
+
+        with self._write_lock:
+            self._volume = volume
+            self._pending_volume = volume
+            if self._writer_thread is None or not self._writer_thread.is_alive():
+                self._writer_thread = threading.Thread(
+                    target=self._write_loop, daemon=True, name="volume_writer"
+                )
+                self._writer_thread.start()
+        self._write_event.set()
+
+    def _write_loop(self):
+        """写入线程：每次只应用最新的目标音量"""
+        while True:
+            if not self._write_event.wait(5):
+                with self._write_lock:
+                    if self._pending_volume is None:
+                        # 空闲时退出，下次设置时重新创建
+                        self._writer_thread = None
+                        return
+                continue
+            self._write_event.clear()
+            with self._write_lock:
+                volume = self._pending_volume
+            if volume is None:
+                continue
+            try:
+                self._apply_volume(volume)
+            except Exception as e:
+                self.logger.warning(f"设置音量失败: {e}")
+            with self._write_lock:
+                if self._pending_volume == volume:
+                    self._pending_volume = None
+
+    def _apply_volume(self, volume):
+        """把音量写入系统"""
+        if isinstance(self._backend, _AmixerSession):
+            self._backend.set_volume(volume)
+            return
         if self.system == "Windows":
             self._set_windows_volume(volume)
         elif self.system == "Darwin":
@@ -225,6 +456,12 @@ class VolumeController:
         except Exception as e:
             self.logger.warning(f"通过alsamixer设置音量失败: {e}")
 
+    def close(self):
+        """关闭常驻的音量后端"""
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
+
     @staticmethod
     def check_dependencies():
         """检查并报告缺少的依赖"""
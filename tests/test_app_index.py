@@ -0,0 +1,196 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from src.utils.app_index import AppIndex, get_name_similarity
+
+
+def _write(path, text=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _desktop(name, exec_line, extra=""):
+    return f"[Desktop Entry]\nType=Application\nName={name}\nExec={exec_line}\n{extra}"
+
+
+class TestAppIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        root = self.tmp_dir.name
+        self.apps = os.path.join(root, "applications")
+        self.bin = os.path.join(root, "bin")
+        self.index_path = os.path.join(root, "cache", "app_index.json")
+
+        _write(os.path.join(self.apps, "firefox.desktop"),
+               _desktop("Firefox Web Browser", "/usr/bin/firefox %u",
+                        "Name[zh_CN]=火狐浏览器\n[Desktop Action new-window]\nName=New Window\n"))
+        _write(os.path.join(self.apps, "hidden.desktop"),
+               _desktop("Hidden Tool", "hidden", "NoDisplay=true\n"))
+        _write(os.path.join(self.apps, "office", "writer.desktop"),
+               _desktop("LibreOffice Writer", "libreoffice --writer %F"))
+        tool = os.path.join(self.bin, "mytool")
+        _write(tool, "#!/bin/sh\n")
+        os.chmod(tool, 0o755)
+        _write(os.path.join(self.bin, "readme.txt"))
+        # Windows 桌面上的程序（.exe 直接作为目标，不需要解析快捷方式）
+        self.shortcuts = os.path.join(root, "Desktop")
+        for name in ("Google Chrome", "WeChat for Windows", "Visual Studio Code", "QQ"):
+            _write(os.path.join(self.shortcuts, name + ".exe"))
+
+        self.index = self._make_index()
+        self.index.refresh()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _make_index(self):
+        return AppIndex(
+            path=self.index_path,
+            roots=[(self.apps, "desktop_file", True), (self.bin, "path", False)],
+            scan_registry=False,
+        )
+
+    def test_parses_desktop_files(self):
+        result = self.index.search("火狐浏览器")
+        self.assertEqual(result["match_score"], 100)
+        self.assertEqual(result["source"], "desktop_file")
+        self.assertEqual(result["command"], ["/usr/bin/firefox"])
+        self.assertEqual(result["name"], "火狐浏览器")
+        # Action 小节不会覆盖主条目的名称
+        self.assertIsNone(self.index.search("New Window", min_score=100))
+        self.assertIsNone(self.index.search("Hidden Tool", min_score=90))
+
+    def test_indexes_subdirectories_and_path(self):
+        writer = self.index.search("LibreOffice Writer")
+        self.assertEqual(writer["command"][1:], ["--writer"])
+        tool = self.index.search("mytool", sources=("path",))
+        self.assertEqual(tool["target"], os.path.join(self.bin, "mytool"))
+        self.assertIsNone(self.index.search("readme.txt", min_score=100))
+
+    def test_fuzzy_search(self):
+        result = self.index.search("firefox browser")
+        self.assertEqual(result["path"], os.path.join(self.apps, "firefox.desktop"))
+        self.assertLess(result["match_score"], 100)
+        self.assertIsNone(self.index.search("完全不相关的名称"))
+
+    def test_persists_and_loads(self):
+        self.assertTrue(os.path.exists(self.index_path))
+        loaded = self._make_index()
+        self.assertTrue(loaded.load())
+        self.assertTrue(loaded.ready.is_set())
+        self.assertEqual(len(loaded), len(self.index))
+        self.assertEqual(loaded.search("火狐浏览器")["command"], ["/usr/bin/firefox"])
+        # 加载后没有变化的目录不需要重新扫描
+        self.assertEqual(loaded.refresh(), 0)
+
+    def test_refresh_rescans_only_changed_directories(self):
+        self.assertEqual(self.index.refresh(), 0)
+
+        _write(os.path.join(self.apps, "office", "calc.desktop"),
+               _desktop("LibreOffice Calc", "libreoffice --calc"))
+        office = os.path.join(self.apps, "office")
+        future = time.time() + 10
+        os.utime(office, (future, future))
+
+        self.assertEqual(self.index.refresh(), 1)
+        self.assertEqual(self.index.search("LibreOffice Calc")["match_score"], 100)
+
+        os.remove(os.path.join(self.apps, "firefox.desktop"))
+        os.utime(self.apps, (future + 10, future + 10))
+        self.assertEqual(self.index.refresh(), 1)
+        self.assertIsNone(self.index.search("火狐浏览器", min_score=100))
+
+    def test_search_finds_apps_installed_while_running(self):
+        self.index.MISS_REFRESH_INTERVAL = 0
+        _write(os.path.join(self.apps, "office", "inkscape.desktop"),
+               _desktop("Inkscape", "inkscape %F"))
+        future = time.time() + 10
+        os.utime(os.path.join(self.apps, "office"), (future, future))
+
+        # 找不到时先增量刷新再查一次
+        result = self.index.search("Inkscape")
+        self.assertEqual(result["match_score"], 100)
+        self.assertEqual(self.index.last_refresh["rescanned"], 1)
+
+    def test_fuzzy_hit_does_not_wait_for_refresh(self):
+        self.index.MISS_REFRESH_INTERVAL = 0
+        with mock.patch.object(self.index, "refresh_async") as refresh_async:
+            result = self.index.search("firefox browser")
+        self.assertLess(result["match_score"], 100)
+        refresh_async.assert_not_called()
+
+    def test_miss_waits_only_briefly_for_refresh(self):
+        self.index.MISS_REFRESH_INTERVAL = 0
+        self.index.MISS_REFRESH_WAIT = 0.05
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def slow_refresh():
+            release.wait(2)
+            return 0
+
+        with mock.patch.object(self.index, "refresh", slow_refresh):
+            start = time.perf_counter()
+            self.assertIsNone(self.index.search("完全不相关的名称"))
+            self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_stale_index_refreshes_in_background(self):
+        self.index.REFRESH_INTERVAL = 0
+        tool = os.path.join(self.bin, "newtool")
+        _write(tool, "#!/bin/sh\n")
+        os.chmod(tool, 0o755)
+        future = time.time() + 10
+        os.utime(self.bin, (future, future))
+
+        # 命中时不等待刷新，刷新结束后新程序可以查到
+        self.assertIsNotNone(self.index.search("mytool"))
+        self.index.refresh_async().join(2)
+        self.index.MISS_REFRESH_INTERVAL = 3600
+        self.assertEqual(self.index.search("newtool", sources=("path",))["match_score"], 100)
+
+    def test_contains_matches_part_of_the_name(self):
+        index = AppIndex(
+            path=self.index_path,
+            roots=[(self.shortcuts, "desktop", False)],
+            scan_registry=False,
+        )
+        index.refresh()
+        self.assertIsNone(index.search("chrome"))
+        chrome = index.search("chrome", contains=True)
+        self.assertEqual(chrome["name"], "Google Chrome")
+        self.assertEqual(chrome["match_score"], 80)
+        self.assertEqual(index.search("wechat", contains=True)["name"], "WeChat for Windows")
+        self.assertEqual(index.search("code", contains=True)["name"], "Visual Studio Code")
+        # 查询词包含快捷方式名称
+        qq = index.search("qq音乐播放器", contains=True)
+        self.assertEqual((qq["name"], qq["match_score"]), ("QQ", 60))
+        self.assertEqual(index.search("Google Chrome", contains=True)["match_score"], 100)
+
+    def test_program_path_for_partial_shortcut_name(self):
+        from src.utils.system_commands import SystemCommands
+
+        index = AppIndex(
+            path=self.index_path,
+            roots=[(self.shortcuts, "desktop", False)],
+            scan_registry=False,
+        )
+        index.refresh()
+        with mock.patch.object(AppIndex, "_instance", index):
+            self.assertEqual(SystemCommands._get_program_path("chrome"),
+                             os.path.join(self.shortcuts, "Google Chrome.exe"))
+            self.assertEqual(SystemCommands._get_program_path("wechat"),
+                             os.path.join(self.shortcuts, "WeChat for Windows.exe"))
+
+    def test_name_similarity(self):
+        self.assertEqual(get_name_similarity("微信", "微信客户端"), 100)
+        self.assertEqual(get_name_similarity("QQ音乐", "qq音乐"), 100)
+        self.assertLessEqual(get_name_similarity("网易云音乐", "网易"), 90)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import struct
+import tempfile
+import time
+import unittest
+import wave
+
+from src.audio_codecs.audio_backend import (
+    FileAudioBackend, NullAudioBackend, create_audio_backend
+)
+
+
+class TestFileAudioBackend(unittest.TestCase):
+    def setUp(self):
+        """生成一秒钟的16kHz单声道测试音频"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.tmp_dir.name, "input.wav")
+        self.samples = [i % 1000 for i in range(16000)]
+        with wave.open(self.input_path, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(struct.pack(f"<{len(self.samples)}h", *self.samples))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_file_roundtrip(self):
+        """非实时模式下输入文件原样写入输出文件"""
+        output_path = os.path.join(self.tmp_dir.name, "output.wav")
+        backend = FileAudioBackend(self.input_path, output_path, realtime=False)
+        input_stream = backend.open_input(16000, 1, 320)
+        output_stream = backend.open_output(16000, 1, 320)
+
+        while not input_stream.at_eof():
+            self.assertEqual(input_stream.get_read_available(), 320)
+            output_stream.write(input_stream.read(320))
+        output_stream.close()
+
+        with wave.open(output_path, "rb") as wf:
+            self.assertEqual(wf.getnframes(), 16000)
+            data = wf.readframes(16000)
+        self.assertEqual(list(struct.unpack("<16000h", data)), self.samples)
+        self.assertEqual(input_stream.get_read_available(), 0)
+
+    def test_realtime_pacing(self):
+        """实时模式下读取速度与采样率一致"""
+        backend = FileAudioBackend(self.input_path, realtime=True)
+        input_stream = backend.open_input(16000, 1, 320)
+        start = time.monotonic()
+        for _ in range(10):  # 10 x 20ms
+            input_stream.read(320)
+        self.assertGreaterEqual(time.monotonic() - start, 0.18)
+
+    def test_sample_rate_mismatch(self):
+        backend = FileAudioBackend(self.input_path)
+        with self.assertRaises(ValueError):
+            backend.open_input(24000, 1, 480)
+
+    def test_null_backend(self):
+        backend = NullAudioBackend(realtime=False)
+        input_stream = backend.open_input(16000, 1, 320)
+        output_stream = backend.open_output(24000, 1, 480)
+        self.assertEqual(input_stream.read(320), b"\x00" * 640)
+        output_stream.write(b"\x01\x00" * 480)
+        self.assertEqual(output_stream.frames_written, 480)
+        self.assertFalse(input_stream.at_eof())
+
+    def test_create_from_config(self):
+        backend = create_audio_backend({"TYPE": "file", "REALTIME": False})
+        self.assertIsInstance(backend, FileAudioBackend)
+        self.assertFalse(backend.realtime)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from src.audio_codecs.audio_mixer import AudioMixer, DuckingEnvelope
+
+
+def pcm(value, frames):
+    return np.full(frames, value, dtype=np.int16).tobytes()
+
+
+def samples(data):
+    return np.frombuffer(data, dtype=np.int16)
+
+
+class TestAudioMixer(unittest.TestCase):
+    def setUp(self):
+        self.written = []
+        self.mixer = AudioMixer(self.written.append, rate=1000, channels=1, frame_size=100)
+
+    def tearDown(self):
+        self.mixer.close()
+
+    def test_sums_buses_and_pads_short_input(self):
+        self.mixer.bus("music").write(pcm(1000, 100))
+        self.mixer.bus("effects").write(pcm(200, 50))
+        out = samples(self.mixer.mix(100))
+        self.assertTrue((out[:50] == 1200).all())
+        self.assertTrue((out[50:] == 1000).all())
+        self.assertIsNone(self.mixer.mix(100))
+
+    def test_clips_to_int16(self):
+        self.mixer.bus("music").write(pcm(30000, 10))
+        self.mixer.bus("effects").write(pcm(30000, 10))
+        self.assertTrue((samples(self.mixer.mix(10)) == 32767).all())
+
+    def test_music_ducks_under_tts_and_recovers(self):
+        self.mixer.add_ducking("music", "tts", duck_gain=0.2, attack=0.05, release=0.1, hold=0.05)
+        music = self.mixer.bus("music")
+        music.write(pcm(10000, 100))
+        self.mixer.bus("tts").write(pcm(0, 100))
+        out = samples(self.mixer.mix(100))
+        # attack 50 个采样内降到 duck_gain，之后保持
+        self.assertLess(out[10], 10000)
+        self.assertTrue((out[50:] == 2000).all())
+
+        # TTS 结束后先保持 hold，再在 release 内恢复
+        music.write(pcm(10000, 200))
+        out = samples(self.mixer.mix(200))
+        self.assertTrue((out[:50] == 2000).all())
+        self.assertTrue((np.diff(out[50:150].astype(np.int32)) >= 0).all())
+        self.assertTrue((out[150:] == 10000).all())
+
+    def test_envelope_recovers_while_idle(self):
+        envelope = DuckingEnvelope(1000, duck_gain=0.5, attack=0.01, release=0.1, hold=0.0)
+        envelope.render(np.ones(50, dtype=bool))
+        self.assertAlmostEqual(envelope.gain, 0.5)
+        envelope.render(np.zeros(200, dtype=bool))
+        self.assertAlmostEqual(envelope.gain, 1.0)
+
+    def test_played_bytes_tracks_consumed_data_minus_latency(self):
+        music = self.mixer.bus("music")
+        music.write(pcm(1, 200))
+        self.assertEqual((music.written, music.played_bytes), (400, 0))
+        self.mixer.mix(100)
+        self.assertEqual(music.played_bytes, 200)
+
+        # 输出延迟 50ms（50 帧）内的数据还没有播放出来
+        self.mixer.output_latency = 0.05
+        self.assertEqual(music.played_bytes, 100)
+
+        # 丢弃的数据与写入位置保持对应
+        music.clear()
+        start = music.written
+        music.write(pcm(1, 100))
+        self.mixer.mix(100)
+        self.assertEqual(music.played_bytes - start, 100)
+
+    def test_write_blocks_when_bus_is_full(self):
+        bus = self.mixer.add_bus("test", capacity=20)
+        self.assertTrue(bus.write(b"\x01\x00" * 10))
+        self.assertFalse(bus.write(b"\x01\x00", timeout=0.05))
+
+        # 混音线程取走数据后写入方继续
+        done = threading.Event()
+        threading.Thread(
+            target=lambda: bus.write(b"\x01\x00" * 10) and done.set(), daemon=True
+        ).start()
+        self.mixer.start()
+        self.assertTrue(done.wait(2.0))
+        self.assertTrue(bus.wait_empty(2.0))
+        self.assertTrue(self.written)
+
+    def test_close_releases_blocked_writers(self):
+        bus = self.mixer.add_bus("test", capacity=2)
+        bus.write(b"\x00\x00")
+        result = []
+        writer = threading.Thread(target=lambda: result.append(bus.write(b"\x00\x00")))
+        writer.start()
+        time.sleep(0.05)
+        self.mixer.close()
+        writer.join(1.0)
+        self.assertEqual(result, [False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import threading
+import time
+import unittest
+
+from src.utils.byte_buffer import BoundedByteBuffer
+
+
+class TestBoundedByteBuffer(unittest.TestCase):
+    def test_read_exact_sizes(self):
+        buffer = BoundedByteBuffer(1024)
+        buffer.write(b"abc")
+        buffer.write(b"defg")
+        self.assertEqual(buffer.read(4), b"abcd")
+        buffer.close()
+        # 写入结束后返回剩余数据，然后是 EOF
+        self.assertEqual(buffer.read(4), b"efg")
+        self.assertEqual(buffer.read(4), b"")
+
+    def test_writer_blocks_when_full(self):
+        buffer = BoundedByteBuffer(8)
+        done = threading.Event()
+
+        def writer():
+            buffer.write(b"x" * 32)
+            done.set()
+
+        threading.Thread(target=writer, daemon=True).start()
+        time.sleep(0.05)
+        self.assertFalse(done.is_set())
+        self.assertLessEqual(len(buffer), 8)
+
+        received = b""
+        while len(received) < 32:
+            received += buffer.read(8, timeout=1)
+        self.assertTrue(done.wait(1))
+        self.assertEqual(received, b"x" * 32)
+
+    def test_read_timeout(self):
+        buffer = BoundedByteBuffer(16)
+        self.assertIsNone(buffer.read(4, timeout=0.01))
+
+    def test_abort_wakes_waiters(self):
+        buffer = BoundedByteBuffer(4)
+        results = []
+        reader = threading.Thread(target=lambda: results.append(buffer.read(4)))
+        reader.start()
+        time.sleep(0.02)
+        buffer.abort()
+        reader.join(1)
+        self.assertEqual(results, [None])
+        self.assertFalse(buffer.write(b"data"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import threading
+import time
+import unittest
+
+from src.utils.init_graph import InitGraph
+
+
+class TestInitGraph(unittest.TestCase):
+    def test_independent_steps_run_concurrently(self):
+        """互不依赖的步骤并行执行，总耗时接近最慢的一步"""
+        graph = InitGraph("test", max_workers=4)
+        for name in ("a", "b", "c"):
+            graph.add_step(name, lambda: time.sleep(0.2))
+        start = time.perf_counter()
+        graph.start()
+        self.assertTrue(graph.completed.wait(2))
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_dependency_order(self):
+        order = []
+        graph = InitGraph("test")
+        graph.add_step("b", lambda: order.append("b"), deps=("a",))
+        graph.add_step("a", lambda: (time.sleep(0.05), order.append("a")))
+        graph.start()
+        self.assertTrue(graph.completed.wait(2))
+        self.assertEqual(order, ["a", "b"])
+
+    def test_failed_dependency_skips_dependents(self):
+        def fail():
+            raise RuntimeError("boom")
+
+        graph = InitGraph("test")
+        graph.add_step("optional", fail, optional=True)
+        graph.add_step("after", lambda: None, deps=("optional",))
+        graph.add_step("other", lambda: 42)
+        graph.start()
+        self.assertTrue(graph.completed.wait(2))
+        self.assertEqual(graph.steps["optional"].status, "failed")
+        self.assertEqual(graph.steps["after"].status, "skipped")
+        self.assertEqual(graph.wait("other"), 42)
+
+    def test_inline_step_runs_in_caller_thread(self):
+        graph = InitGraph("test")
+        graph.add_step("loop", lambda: time.sleep(0.05))
+        graph.add_step(
+            "ui",
+            lambda: threading.current_thread().name,
+            deps=("loop",),
+            inline=True
+        )
+        graph.start()
+        self.assertEqual(graph.run_inline("ui"), threading.current_thread().name)
+        self.assertTrue(graph.completed.wait(2))
+        self.assertIn("ui", graph.format_trace())
+
+    def test_cycle_rejected(self):
+        graph = InitGraph("test")
+        graph.add_step("a", lambda: None, deps=("b",))
+        graph.add_step("b", lambda: None, deps=("a",))
+        with self.assertRaises(ValueError):
+            graph.start()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import math
+import unittest
+
+from src.utils.lyric_timeline import LyricTimeline
+
+
+class TestLyricTimeline(unittest.TestCase):
+    def setUp(self):
+        self.timeline = LyricTimeline([(10.0, "第三句"), (0.5, "第一句"), (5.0, "第二句")])
+
+    def test_sorts_lines_into_parallel_arrays(self):
+        self.assertEqual(self.timeline.times, [0.5, 5.0, 10.0])
+        self.assertEqual(self.timeline.texts, ["第一句", "第二句", "第三句"])
+        self.assertFalse(LyricTimeline())
+
+    def test_cursor_moves_forward_and_reports_next_time(self):
+        self.assertEqual(self.timeline.index_at(0.0), 0)
+        self.assertEqual(self.timeline.next_time, 0.5)
+        self.assertEqual(self.timeline.index_at(5.0), 1)
+        self.assertEqual(self.timeline.next_time, 10.0)
+        self.assertEqual(self.timeline.index_at(30.0), 2)
+        self.assertEqual(self.timeline.next_time, math.inf)
+
+    def test_seek_backwards_uses_bisect(self):
+        self.timeline.index_at(30.0)
+        self.assertEqual(self.timeline.index_at(6.0), 1)
+        self.assertEqual(self.timeline.next_time, 10.0)
+        self.assertEqual(self.timeline.index_at(0.1), 0)
+        self.assertEqual(self.timeline.next_time, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
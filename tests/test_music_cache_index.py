@@ -0,0 +1,84 @@
+import os
+import tempfile
+import time
+import unittest
+
+from src.utils.music_cache_index import MusicCacheIndex
+
+
+class TestMusicCacheIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _make_file(self, name: str, size: int) -> str:
+        path = os.path.join(self.cache_dir, name)
+        with open(path, "wb") as f:
+            f.write(b"\0" * size)
+        return path
+
+    def test_lru_evicts_least_recently_used(self):
+        index = MusicCacheIndex(self.cache_dir, max_bytes=250, policy="lru")
+        index.add("a", self._make_file("a.mp3", 100))
+        time.sleep(0.01)
+        index.add("b", self._make_file("b.mp3", 100))
+        time.sleep(0.01)
+        self.assertIsNotNone(index.lookup("a"))  # a 比 b 更近被访问
+
+        evicted = index.add("c", self._make_file("c.mp3", 100))
+        self.assertEqual(evicted, ["b"])
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, "b.mp3")))
+        self.assertEqual(index.total_bytes, 200)
+        index.close()
+
+    def test_lfu_evicts_least_hit_and_respects_protect(self):
+        index = MusicCacheIndex(self.cache_dir, max_bytes=250, policy="lfu")
+        index.add("a", self._make_file("a.mp3", 100))
+        index.add("b", self._make_file("b.mp3", 100))
+        index.lookup("b")
+        index.lookup("b")
+
+        evicted = index.add("c", self._make_file("c.mp3", 100), protect=["a"])
+        self.assertEqual(evicted, ["b"])
+        index.close()
+
+    def test_partial_entries_and_hit_rate_persist(self):
+        index = MusicCacheIndex(self.cache_dir)
+        part = self._make_file("a.mp3.part", 50)
+        index.add("a", part, complete=False)
+        self.assertIsNone(index.lookup("a"))  # 只有部分数据，不算命中
+
+        os.replace(part, os.path.join(self.cache_dir, "a.mp3"))
+        index.add("a", os.path.join(self.cache_dir, "a.mp3"))
+        self.assertIsNotNone(index.lookup("a"))
+        self.assertIsNone(index.lookup("missing"))
+        index.close()
+
+        # 重新打开后统计仍然保留
+        index = MusicCacheIndex(self.cache_dir)
+        stats = index.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 2, 1))
+        self.assertAlmostEqual(index.hit_rate, 1 / 3)
+        index.close()
+
+    def test_scan_registers_existing_files(self):
+        self._make_file("old.mp3", 100)
+        self._make_file("half.mp3.part", 40)
+        self._make_file("half.mp3.ranges", 10)
+        index = MusicCacheIndex(self.cache_dir)
+        index.scan()
+        self.assertTrue(index.contains("old"))
+        self.assertFalse(index.contains("half"))
+        self.assertEqual(index.total_bytes, 140)
+
+        os.remove(os.path.join(self.cache_dir, "old.mp3"))
+        self.assertIsNone(index.lookup("old"))  # 被外部删除的文件自动移出索引
+        self.assertEqual(index.stats()["entries"], 1)
+        index.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from src.audio_codecs.music_decoder import (
+    CacheStreamReader,
+    PyAVDecodeStream,
+    create_decode_stream,
+)
+from src.utils.progressive_cache import ProgressiveCacheFile
+
+try:
+    import av
+    import numpy as np
+except ImportError:
+    av = None
+
+
+def write_mp3(path, seconds=1.0, rate=44100):
+    with av.open(path, "w") as container:
+        stream = container.add_stream("mp3", rate=rate)
+        stream.layout = "mono"
+        t = np.arange(int(seconds * rate)) / rate
+        wave = (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16)
+        for start in range(0, len(wave), 1152):
+            frame = av.AudioFrame.from_ndarray(
+                wave[start:start + 1152].reshape(1, -1), format="s16", layout="mono"
+            )
+            frame.rate = rate
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+
+class TestCacheStreamReader(unittest.TestCase):
+    def test_reads_sequentially_until_stopped(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ProgressiveCacheFile(os.path.join(tmp_dir, "song.mp3"))
+            cache.set_total_size(None)
+            cache.begin_write()
+            cache.write(0, b"abcdef")
+            stop_event = threading.Event()
+            reader = CacheStreamReader(cache, stop_event)
+            self.assertEqual(reader.read(4), b"abcd")
+            self.assertEqual(reader.read(4), b"ef")
+            stop_event.set()
+            self.assertEqual(reader.read(4), b"")
+            cache.end_write()
+            cache.close()
+
+
+@unittest.skipUnless(av, "需要 PyAV")
+class TestPyAVDecodeStream(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "song.mp3")
+        write_mp3(self.path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_auto_prefers_in_process_decoder(self):
+        decoder = create_decode_stream(self.path, 24000, 1, decoder_type="auto")
+        self.assertIsInstance(decoder, PyAVDecodeStream)
+
+    def test_decodes_and_resamples_file(self):
+        decoder = PyAVDecodeStream(self.path, 24000, 1)
+        chunks = list(decoder.chunks(1920))
+        self.assertTrue(decoder.completed)
+        self.assertTrue(all(len(chunk) == 1920 for chunk in chunks[:-1]))
+        # 1 秒 44.1kHz 重采样到 24kHz，允许编码器的首尾填充
+        samples = sum(len(chunk) for chunk in chunks) // 2
+        self.assertAlmostEqual(samples / 24000, 1.0, delta=0.1)
+
+    def test_decodes_while_downloading(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        cache = ProgressiveCacheFile(os.path.join(self.tmp_dir.name, "stream.mp3"))
+        cache.set_total_size(len(data))
+        cache.begin_write()
+
+        def download():
+            for start in range(0, len(data), 1000):
+                cache.write(start, data[start:start + 1000])
+            cache.end_write(finished=True)
+
+        threading.Thread(target=download).start()
+        decoder = PyAVDecodeStream(CacheStreamReader(cache, threading.Event()), 24000, 1)
+        total = sum(len(chunk) for chunk in decoder.chunks(1920))
+        self.assertTrue(decoder.completed)
+        self.assertGreater(total, 24000 * 2 * 0.9)
+        cache.close()
+
+    def test_close_stops_decoding(self):
+        decoder = PyAVDecodeStream(self.path, 24000, 1)
+        chunks = decoder.chunks(1920)
+        next(chunks)
+        decoder.close()
+        self.assertEqual(list(chunks), [])
+        self.assertFalse(decoder.completed)
+
+
+if __name__ == "__main__":
+    unittest.main()
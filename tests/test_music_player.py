@@ -0,0 +1,262 @@
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+from unittest import mock
+
+import requests
+
+from src.audio_codecs.audio_mixer import AudioMixer
+from src.audio_codecs.music_decoder import DecodeStream
+from src.constants.constants import AudioConfig
+from src.utils.cancel_token import CancelToken
+from src.utils.config_manager import ConfigManager
+from src.utils.pcm_cache import PcmCacheWriter
+
+
+def fake_song_info(player, track):
+    track.title = track.query.upper()
+    track.duration = 10
+    return track.query, "http://example.com/" + track.query
+
+
+class StalledResponse:
+    """返回一部分数据后阻塞在网络读取上，直到连接被关闭"""
+
+    status_code = 200
+    headers = {"content-length": str(10 * 1024 * 1024)}
+
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for _ in range(8):
+            yield b"\0" * chunk_size
+        self.closed.wait()
+        raise requests.exceptions.ConnectionError("连接已关闭")
+
+    def close(self):
+        self.closed.set()
+
+
+class StalledSession:
+    def get(self, url, **kwargs):
+        return StalledResponse()
+
+
+class FakeDecodeStream(DecodeStream):
+    """每读到一块输入产生若干帧PCM，输入读完即结束"""
+
+    name = "fake"
+    FRAMES_PER_READ = 20
+
+    def chunks(self, size):
+        while True:
+            data = self.source.read(4096)
+            if not data:
+                self.completed = True
+                return
+            for _ in range(self.FRAMES_PER_READ):
+                yield b"\1" * size
+
+    def close(self):
+        pass
+
+
+class FakeConfig:
+    def get_config(self, path, default=None):
+        return default
+
+
+class FakeApp:
+    aborted = False
+    is_tts_playing = False
+    device_state = None
+    display = None
+
+    def __init__(self):
+        # 按实时速度消费混音结果，与真实声卡的节奏一致
+        frame_seconds = AudioConfig.OUTPUT_FRAME_SIZE / AudioConfig.OUTPUT_SAMPLE_RATE
+        self.mixer = AudioMixer(
+            lambda data: time.sleep(frame_seconds),
+            AudioConfig.OUTPUT_SAMPLE_RATE, AudioConfig.CHANNELS, AudioConfig.OUTPUT_FRAME_SIZE
+        )
+        self.audio_codec = types.SimpleNamespace(mixer=self.mixer)
+
+    def schedule(self, callback):
+        pass
+
+    def set_device_state(self, state):
+        pass
+
+
+class TestCancelToken(unittest.TestCase):
+    def test_cancel_runs_callbacks_once_and_propagates_to_children(self):
+        parent = CancelToken()
+        child = parent.child()
+        calls = []
+        child.on_cancel(lambda: calls.append("child"))
+        removed = child.on_cancel(lambda: calls.append("removed"))
+        child.remove(removed)
+        self.assertTrue(parent.cancel())
+        self.assertFalse(parent.cancel())
+        self.assertTrue(child.is_set())
+        self.assertEqual(calls, ["child"])
+        # 已取消的令牌立即执行新登记的回调
+        child.on_cancel(lambda: calls.append("late"))
+        self.assertEqual(calls, ["child", "late"])
+
+
+class TestMusicPlayerSwitch(unittest.TestCase):
+    """切歌和停止不等待线程超时，50ms 内完成"""
+
+    SWITCH_LIMIT = 0.05
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        application = types.ModuleType("src.application")
+        application.Application = types.SimpleNamespace(get_instance=lambda: self.app)
+        patches = [
+            mock.patch.dict(sys.modules, {"src.application": application}),
+            mock.patch.object(ConfigManager, "_instance", FakeConfig()),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.app = FakeApp()
+        self.app.mixer.start()
+        sys.modules.pop("src.iot.things.music_player", None)
+        from src.iot.things.music_player import MusicPlayer
+
+        cache_patch = mock.patch.object(MusicPlayer, "CACHE_DIR", self.tmp_dir.name)
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+        info_patch = mock.patch.object(MusicPlayer, "_get_song_info", fake_song_info)
+        info_patch.start()
+        self.addCleanup(info_patch.stop)
+
+        self.player = MusicPlayer()
+        # 每首歌 10 秒，全部来自预解码PCM缓存，不访问网络
+        frame = AudioConfig.OUTPUT_FRAME_SIZE * AudioConfig.CHANNELS * 2
+        for name in ("a", "b", "c"):
+            key = self.player._pcm_cache_key(name)
+            writer = PcmCacheWriter(self.player._get_pcm_path(key))
+            writer.write(name.encode() * frame * 170)
+            writer.commit()
+            self.player.pcm_index.add(key, writer.path)
+
+    def tearDown(self):
+        self.player._stop_playback()
+        if self.player.play_thread:
+            self.player.play_thread.join(1.0)
+        self.app.mixer.close()
+        self.player.cache_index.close()
+        self.player.pcm_index.close()
+        self.tmp_dir.cleanup()
+
+    def _wait_until(self, condition, timeout=2.0):
+        deadline = time.perf_counter() + timeout
+        while not condition():
+            if time.perf_counter() > deadline:
+                self.fail("等待超时")
+            time.sleep(0.001)
+        return time.perf_counter()
+
+    def _playing(self, title):
+        bus = self.app.mixer.bus("music")
+        return lambda: (self.player.current_song == title and self.player.playing
+                        and bus.written > self.player.track_start_byte)
+
+    def test_track_switch_is_instant(self):
+        for name in ("a", "b", "c"):
+            self.player._enqueue(name)
+        self._wait_until(self._playing("A"))
+        time.sleep(0.2)  # 让音乐总线写满，播放线程阻塞在写入上
+
+        start = time.perf_counter()
+        self.player._next()
+        self.assertLess(self._wait_until(self._playing("B")) - start, self.SWITCH_LIMIT)
+
+        start = time.perf_counter()
+        self.player._jump(0)
+        self.assertLess(self._wait_until(self._playing("A")) - start, self.SWITCH_LIMIT)
+
+    def test_pause_and_restart_are_instant(self):
+        self.player._enqueue("a")
+        self._wait_until(self._playing("A"))
+
+        start = time.perf_counter()
+        self.player._pause()
+        self.assertLess(time.perf_counter() - start, self.SWITCH_LIMIT)
+        self.assertFalse(self.player.play_thread.is_alive())
+
+        start = time.perf_counter()
+        self.player._jump(0)
+        self.assertLess(self._wait_until(self._playing("A")) - start, self.SWITCH_LIMIT)
+
+    def test_play_url_request_is_hedged(self):
+        calls = []
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def request(url):
+            calls.append(url)
+            if len(calls) == 1:
+                release.wait(2)  # 第一个请求卡住
+                return ""
+            return "http://cdn.example.com/song.mp3"
+
+        self.player.PLAY_URL_HEDGE_DELAY = 0.05
+        self.player._request_play_url = request
+        start = time.perf_counter()
+        self.assertEqual(self.player._get_play_url("42"), "http://cdn.example.com/song.mp3")
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(len(calls), 2)
+
+        # 全部失败时每个接口最多请求 PLAY_URL_ATTEMPTS 次
+        calls.clear()
+        self.player._request_play_url = lambda url: calls.append(url) or ""
+        self.assertEqual(self.player._get_play_url("42"), "")
+        self.assertEqual(len(calls), self.player.PLAY_URL_ATTEMPTS)
+
+    def test_switch_with_stalled_download_and_decoder(self):
+        # 没有PCM缓存的歌曲走边下载边解码的路径，下载线程阻塞在网络读取上
+        module = sys.modules["src.iot.things.music_player"]
+        decoder_patch = mock.patch.object(
+            module, "create_decode_stream", lambda source, rate, channels:
+            FakeDecodeStream(source, rate, channels))
+        decoder_patch.start()
+        self.addCleanup(decoder_patch.stop)
+        self.player.download_session = StalledSession()
+
+        for name in ("x", "y"):
+            self.player._enqueue(name)
+        self._wait_until(self._playing("X"))
+        time.sleep(0.2)
+
+        start = time.perf_counter()
+        self.player._next()
+        self.assertLess(self._wait_until(self._playing("Y")) - start, self.SWITCH_LIMIT)
+
+        start = time.perf_counter()
+        self.player._pause()
+        self.assertLess(time.perf_counter() - start, self.SWITCH_LIMIT)
+
+        start = time.perf_counter()
+        self.player._jump(0)
+        self.assertLess(self._wait_until(self._playing("X")) - start, self.SWITCH_LIMIT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import threading
+import time
+import unittest
+
+from src.utils.notification_dispatcher import NotificationDispatcher, NotificationSink
+
+
+class RecordingSink(NotificationSink):
+    def __init__(self, name, delay=0.0, min_interval=0.0):
+        self.name = name
+        self.delay = delay
+        self.min_interval = min_interval
+        self.batches = []
+        self.times = []
+        self.delivered = threading.Event()
+
+    def deliver(self, batch):
+        time.sleep(self.delay)
+        self.batches.append([n.message for n in batch])
+        self.times.append(time.monotonic())
+        self.delivered.set()
+
+
+class TestNotificationDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.dispatcher = NotificationDispatcher(batch_window=0.05)
+
+    def tearDown(self):
+        self.dispatcher.close()
+
+    def _wait_for(self, sink, count, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while sum(len(b) for b in sink.batches) < count:
+            if time.monotonic() > deadline:
+                self.fail("等待通知超时")
+            time.sleep(0.005)
+
+    def test_sink_without_deliver_cannot_be_created(self):
+        class IncompleteSink(NotificationSink):
+            name = "incomplete"
+
+        with self.assertRaises(TypeError):
+            IncompleteSink()
+
+    def test_notify_never_blocks_on_slow_sink(self):
+        slow = RecordingSink("slow", delay=0.3)
+        fast = RecordingSink("fast")
+        self.dispatcher.add_sink(slow)
+        self.dispatcher.add_sink(fast)
+
+        start = time.perf_counter()
+        for i in range(100):
+            self.dispatcher.notify("提醒", str(i))
+        self.assertLess(time.perf_counter() - start, 0.05)
+        # 慢渠道不影响快渠道
+        self.assertTrue(fast.delivered.wait(0.2))
+        self.assertFalse(slow.delivered.is_set())
+
+    def test_simultaneous_notifications_are_batched(self):
+        sink = RecordingSink("batch")
+        self.dispatcher.add_sink(sink)
+        for message in ("a", "b", "c"):
+            self.dispatcher.notify("提醒", message)
+        self._wait_for(sink, 3)
+        self.assertEqual(sink.batches, [["a", "b", "c"]])
+
+    def test_rate_limit_merges_instead_of_dropping(self):
+        sink = RecordingSink("limited", min_interval=0.3)
+        self.dispatcher.add_sink(sink)
+        self.dispatcher.notify("提醒", "first")
+        self._wait_for(sink, 1)
+        for message in ("second", "third"):
+            time.sleep(0.08)
+            self.dispatcher.notify("提醒", message)
+        self._wait_for(sink, 3)
+        self.assertEqual(sink.batches, [["first"], ["second", "third"]])
+        self.assertGreaterEqual(sink.times[1] - sink.times[0], 0.29)
+
+    def test_close_flushes_pending(self):
+        sink = RecordingSink("flush", min_interval=5)
+        self.dispatcher.add_sink(sink)
+        self.assertFalse(self.dispatcher.add_sink(RecordingSink("flush")))
+        self.dispatcher.notify("提醒", "first")
+        self._wait_for(sink, 1)
+        self.dispatcher.notify("提醒", "pending")
+        self.dispatcher.close()
+        self.assertEqual(sink.batches, [["first"], ["pending"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
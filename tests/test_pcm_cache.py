@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from src.utils.pcm_cache import MappedPcmReader, PcmCacheWriter
+
+
+class TestPcmCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "pcm", "song.pcm")
+        self.data = bytes(range(256)) * 8
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_writer_only_publishes_committed_file(self):
+        writer = PcmCacheWriter(self.path)
+        writer.write(self.data[:100])
+        writer.discard()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(writer.temp_path))
+
+        writer = PcmCacheWriter(self.path)
+        writer.write(self.data)
+        self.assertTrue(writer.commit())
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+
+    def test_reader_matches_buffer_interface(self):
+        writer = PcmCacheWriter(self.path)
+        writer.write(self.data)
+        writer.commit()
+
+        reader = MappedPcmReader(self.path)
+        chunks = []
+        while True:
+            chunk = reader.read(300)
+            if not chunk:
+                break
+            chunks.append(bytes(chunk))
+        self.assertEqual(b"".join(chunks), self.data)
+        self.assertEqual(reader.read(300), b"")
+
+        reader.seek(0)
+        self.assertEqual(len(reader), len(self.data))
+        chunk = reader.read(4)
+        reader.abort()
+        self.assertTrue(reader.aborted)
+        self.assertIsNone(reader.read(4))
+        # 中止前取出的切片仍然可用
+        self.assertEqual(bytes(chunk), self.data[:4])
+        del chunk
+        reader.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
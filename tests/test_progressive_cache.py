@@ -0,0 +1,121 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from src.utils.progressive_cache import ProgressiveCacheFile, RangeSet
+
+
+class TestRangeSet(unittest.TestCase):
+    def test_merge_and_missing(self):
+        ranges = RangeSet()
+        ranges.add(0, 10)
+        ranges.add(20, 30)
+        ranges.add(10, 15)  # 与前一个区间相邻，合并
+        self.assertEqual(ranges.to_list(), [[0, 15], [20, 30]])
+        self.assertEqual(ranges.missing(40), [(15, 20), (30, 40)])
+        self.assertEqual(ranges.end_of(5), 15)
+        self.assertIsNone(ranges.end_of(17))
+        ranges.add(12, 25)
+        self.assertEqual(ranges.to_list(), [[0, 30]])
+        self.assertEqual(ranges.covered, 30)
+
+
+class TestProgressiveCacheFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "song.mp3")
+        self.data = bytes(range(256)) * 40  # 10240 字节
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_resume_after_interruption(self):
+        cache = ProgressiveCacheFile(self.path)
+        cache.set_total_size(len(self.data))
+        cache.write(0, self.data[:9000])
+        cache.end_write()
+        cache.close()
+
+        # 重新打开时只缺少尾部
+        cache = ProgressiveCacheFile(self.path)
+        self.assertEqual(cache.missing_ranges(), [(9000, len(self.data))])
+        self.assertEqual(cache.read(0, 100), self.data[:100])
+        cache.write(9000, self.data[9000:])
+        self.assertTrue(cache.finalize())
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertFalse(os.path.exists(cache.meta_path))
+
+    def test_reader_waits_for_writer(self):
+        cache = ProgressiveCacheFile(self.path)
+        cache.set_total_size(len(self.data))
+        cache.begin_write()
+        received = []
+
+        def reader():
+            offset = 0
+            while True:
+                chunk = cache.read(offset, 4096, timeout=2)
+                if not chunk:
+                    break
+                received.append(chunk)
+                offset += len(chunk)
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        for start in range(0, len(self.data), 1000):
+            cache.write(start, self.data[start:start + 1000])
+            time.sleep(0.001)
+        cache.end_write(finished=True)
+        thread.join(2)
+        self.assertEqual(b"".join(received), self.data)
+
+    def test_reader_continues_after_finalize(self):
+        cache = ProgressiveCacheFile(self.path)
+        cache.set_total_size(len(self.data))
+        cache.begin_write()
+        first_read = threading.Event()
+        downloaded = threading.Event()
+        received = []
+
+        def reader():
+            # 解码方比下载慢：读到第一块后等下载完成并改名再继续
+            offset = 0
+            while True:
+                chunk = cache.read(offset, 1000, timeout=2)
+                if not chunk:
+                    break
+                received.append(chunk)
+                offset += len(chunk)
+                first_read.set()
+                downloaded.wait(2)
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        cache.write(0, self.data[:1000])
+        self.assertTrue(first_read.wait(2))
+        for start in range(1000, len(self.data), 1000):
+            cache.write(start, self.data[start:start + 1000])
+        cache.end_write(finished=True)
+        self.assertTrue(cache.finalize())
+        downloaded.set()
+        thread.join(2)
+        cache.close()
+
+        self.assertEqual(b"".join(received), self.data)
+        self.assertFalse(os.path.exists(cache.part_path))
+        self.assertFalse(os.path.exists(cache.meta_path))
+
+    def test_unfinished_stream_is_not_complete(self):
+        cache = ProgressiveCacheFile(self.path)
+        cache.set_total_size(None)
+        cache.write(0, self.data[:100])
+        cache.end_write(finished=False)
+        self.assertFalse(cache.complete)
+        self.assertEqual(cache.read(100, 10), b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import threading
+import time
+import unittest
+
+from src.utils.reminder_scheduler import ReminderScheduler
+
+
+class TestReminderScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = ReminderScheduler()
+
+    def tearDown(self):
+        self.scheduler.close()
+
+    def test_fires_in_due_order_on_one_thread(self):
+        fired = []
+        threads = set()
+        done = threading.Event()
+
+        def callback(name):
+            fired.append(name)
+            threads.add(threading.current_thread().name)
+            if len(fired) == 3:
+                done.set()
+
+        self.scheduler.schedule(0.06, lambda: callback("c"))
+        self.scheduler.schedule(0.02, lambda: callback("a"))
+        self.scheduler.schedule(0.04, lambda: callback("b"))
+        self.assertTrue(done.wait(1.0))
+        self.assertEqual(fired, ["a", "b", "c"])
+        self.assertEqual(threads, {self.scheduler.name})
+
+    def test_cancel_takes_effect_immediately(self):
+        fired = []
+        later = threading.Event()
+        first = self.scheduler.schedule(0.02, lambda: fired.append("first"))
+        self.scheduler.schedule(0.05, later.set)
+        self.assertTrue(self.scheduler.cancel(first))
+        self.assertFalse(self.scheduler.cancel(first))
+        self.assertEqual(len(self.scheduler), 1)
+        self.assertTrue(later.wait(1.0))
+        self.assertEqual(fired, [])
+
+    def test_repeat_until_cancelled(self):
+        count = []
+        handle = self.scheduler.schedule(0.01, lambda: count.append(1), interval=0.01)
+        deadline = time.monotonic() + 1.0
+        while len(count) < 3 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.scheduler.cancel(handle)
+        fired = len(count)
+        self.assertGreaterEqual(fired, 3)
+        time.sleep(0.05)
+        self.assertLessEqual(len(count), fired + 1)
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_compacts_cancelled_entries(self):
+        handles = [self.scheduler.schedule(60, lambda: None) for _ in range(1000)]
+        for handle in handles[:900]:
+            self.scheduler.cancel(handle)
+        self.assertEqual(len(self.scheduler), 100)
+        self.assertLess(len(self.scheduler._heap), 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from src.utils.reminder_store import ReminderStore
+
+
+class TestReminderStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "reminders.sqlite3")
+        self.store = ReminderStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_survives_reopen_in_due_order(self):
+        now = time.time()
+        late = self.store.add("晚", "提醒", now + 60)
+        early = self.store.add("早", "提醒", now + 10, repeat_interval=30)
+        self.store.update(early, now + 40, fired=1)
+        self.store.close()
+
+        self.store = ReminderStore(self.path)
+        pending = self.store.pending()
+        self.assertEqual([r["id"] for r in pending], [early, late])
+        self.assertEqual(pending[0]["fired"], 1)
+        self.assertEqual(pending[0]["repeat_interval"], 30)
+
+    def test_ids_are_not_reused_after_remove(self):
+        first = self.store.add("a", "提醒", time.time())
+        self.assertTrue(self.store.remove(first))
+        self.assertFalse(self.store.remove(first))
+        self.assertGreater(self.store.add("b", "提醒", time.time()), first)
+
+    def test_compacts_in_background_after_many_removals(self):
+        ids = [self.store.add("x" * 200, "提醒", time.time()) for _ in range(self.store.COMPACT_EVERY)]
+        for reminder_id in ids:
+            self.store.remove(reminder_id)
+        self.store._compact_thread.join(5)
+        self.assertEqual(len(self.store), 0)
+        self.assertEqual(self.store._deleted, 0)
+
+
+class TestReminderManagerRecovery(unittest.TestCase):
+    """重启后恢复提醒，已过期的立即触发"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        from src.utils.reminder import ReminderManager
+
+        self.manager = ReminderManager
+        self.notifications = []
+        self.fired = threading.Event()
+
+        def show(title, message, duration="long"):
+            self.notifications.append((title, message))
+            self.fired.set()
+
+        for name, value in (("STORE_PATH", os.path.join(self.tmp_dir.name, "reminders.sqlite3")),
+                            ("_show_notification", staticmethod(show))):
+            patch = mock.patch.object(ReminderManager, name, value)
+            patch.start()
+            self.addCleanup(patch.stop)
+        self._restart()
+
+    def tearDown(self):
+        self._restart()
+        self.tmp_dir.cleanup()
+
+    def _restart(self):
+        """丢弃内存状态，模拟进程重启"""
+        if self.manager._scheduler:
+            self.manager._scheduler.close()
+        if self.manager._store:
+            self.manager._store.close()
+        self.manager._scheduler = None
+        self.manager._store = None
+        self.manager._active_reminders = {}
+
+    def test_overdue_reminder_fires_after_restart(self):
+        result = self.manager.set_reminder("1小时", "喝水")
+        self.assertEqual(result["status"], "success")
+        self._restart()
+
+        # 程序未运行期间提醒已到期
+        store = ReminderStore(self.manager.STORE_PATH)
+        store.update(result["reminder_id"], time.time() - 60, fired=0)
+        store.close()
+
+        self.assertEqual(self.manager.restore(), 1)
+        self.assertEqual(self.manager.restore(), 0)  # 只恢复一次，不重复调度
+        self.assertTrue(self.fired.wait(1.0))
+        self.assertEqual(self.notifications, [("⏰ 提醒时间到了", "喝水")])
+        deadline = time.monotonic() + 1.0
+        while self.manager.active_count() and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertEqual(self.manager.active_count(), 0)
+        self.assertEqual(len(self.manager._store), 0)
+
+    def test_cancelled_reminder_is_not_restored(self):
+        result = self.manager.set_reminder("5分钟", "开会")
+        self.manager.cancel_reminder(result["reminder_id"])
+        self._restart()
+        self.assertEqual(self.manager.restore(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import threading
+import time
+import unittest
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from src.iot.thing_executor import ThingExecutor
+
+
+class TestThingExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = ThingExecutor(max_workers=4)
+
+    def tearDown(self):
+        self.executor.shutdown(wait=True)
+
+    def test_same_lane_runs_in_order(self):
+        order = []
+        lock = threading.Lock()
+
+        def call(i):
+            time.sleep(0.01)
+            with lock:
+                order.append(i)
+            return i
+
+        futures = [self.executor.submit("Lamp", call, i) for i in range(10)]
+        self.assertEqual([f.result(2) for f in futures], list(range(10)))
+        self.assertEqual(order, list(range(10)))
+
+    def test_lanes_run_in_parallel(self):
+        start = time.perf_counter()
+        futures = [
+            self.executor.submit(name, time.sleep, 0.2)
+            for name in ("Lamp", "Camera", "MusicPlayer")
+        ]
+        for future in futures:
+            future.result(2)
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_timeout_does_not_block_other_lanes(self):
+        slow = self.executor.submit("Camera", time.sleep, 0.5, timeout=0.05)
+        fast = self.executor.submit("Lamp", lambda: "ok")
+        self.assertEqual(fast.result(1), "ok")
+        with self.assertRaises(FutureTimeoutError):
+            slow.result(1)
+
+    def test_exception_propagates(self):
+        def fail():
+            raise ValueError("boom")
+
+        future = self.executor.submit("Lamp", fail)
+        with self.assertRaises(ValueError):
+            future.result(1)
+        # 出错后通道仍可继续使用
+        self.assertEqual(self.executor.submit("Lamp", lambda: 1).result(1), 1)
+
+    def test_shutdown_cancels_queued_calls(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(1)
+            return "done"
+
+        running = self.executor.submit("Lamp", block)
+        queued = [self.executor.submit("Lamp", lambda: 1) for _ in range(3)]
+        self.assertTrue(started.wait(1))
+        self.executor.shutdown(wait=False)
+        release.set()
+
+        self.assertEqual(running.result(1), "done")
+        self.assertTrue(all(f.cancelled() for f in queued))
+        with self.assertRaises(RuntimeError):
+            self.executor.submit("Lamp", lambda: 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+import json
+import os
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+from unittest import mock
+
+from src.iot import thing_manager
+from src.iot.thing import Parameter, Property, Thing, ValueType
+from src.iot.thing_manager import LazyThing, ThingManager
+
+THING_SOURCE = textwrap.dedent('''
+    from src.iot.thing import Thing
+
+    created = []
+
+
+    class HeavyThing(Thing):
+        def __init__(self):
+            super().__init__("Heavy", "测试用的重设备")
+            created.append(self)
+            self.power = False
+            self.add_property("power", "是否打开", lambda: self.power)
+            self.add_method("TurnOn", "打开", [], lambda params: self._turn_on())
+
+        def _turn_on(self):
+            self.power = True
+            return {"status": "success"}
+''')
+
+
+class TestLazyThing(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmp_dir.name, "fake_heavy_thing.py"), "w",
+                  encoding="utf-8") as f:
+            f.write(THING_SOURCE)
+        sys.path.insert(0, self.tmp_dir.name)
+        self.cache_patch = mock.patch.object(
+            thing_manager, "DESCRIPTOR_CACHE_FILE",
+            os.path.join(self.tmp_dir.name, "cache", "iot_descriptors.json")
+        )
+        self.cache_patch.start()
+
+    def tearDown(self):
+        self.cache_patch.stop()
+        sys.path.remove(self.tmp_dir.name)
+        sys.modules.pop("fake_heavy_thing", None)
+        self.tmp_dir.cleanup()
+
+    def test_first_run_builds_and_caches(self):
+        manager = ThingManager()
+        thing = manager.add_lazy_thing("fake_heavy_thing:HeavyThing")
+        self.assertNotIsInstance(thing, LazyThing)
+        self.assertTrue(os.path.exists(thing_manager.DESCRIPTOR_CACHE_FILE))
+
+    def test_cached_descriptor_defers_creation(self):
+        ThingManager().add_lazy_thing("fake_heavy_thing:HeavyThing")
+        module = sys.modules["fake_heavy_thing"]
+        module.created.clear()
+
+        manager = ThingManager()
+        lazy = manager.add_lazy_thing("fake_heavy_thing:HeavyThing")
+        self.assertIsInstance(lazy, LazyThing)
+        self.assertIn('"Heavy"', manager.get_descriptors_json())
+        self.assertIn('"power": false', manager.get_states_json())
+        self.assertEqual(module.created, [])
+
+        result = manager.invoke({"name": "Heavy", "method": "TurnOn"})
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(len(module.created), 1)
+        self.assertIs(manager.things[0], module.created[0])
+        self.assertIn('"power": true', manager.get_states_json())
+
+    def test_cache_invalidated_when_thing_base_changes(self):
+        ThingManager().add_lazy_thing("fake_heavy_thing:HeavyThing")
+        self.assertIsInstance(
+            ThingManager().add_lazy_thing("fake_heavy_thing:HeavyThing"), LazyThing)
+
+        # 缓存格式升级
+        with mock.patch.object(thing_manager, "DESCRIPTOR_CACHE_VERSION",
+                               thing_manager.DESCRIPTOR_CACHE_VERSION + 1):
+            self.assertNotIsInstance(
+                ThingManager().add_lazy_thing("fake_heavy_thing:HeavyThing"), LazyThing)
+
+        # Thing 基类源文件被修改
+        base_file = os.path.join(self.tmp_dir.name, "thing.py")
+        with open(base_file, "w", encoding="utf-8") as f:
+            f.write("")
+        with mock.patch.object(thing_manager, "THING_SOURCE_FILE", base_file):
+            ThingManager().add_lazy_thing("fake_heavy_thing:HeavyThing")
+            future = time.time() + 10
+            os.utime(base_file, (future, future))
+            self.assertNotIsInstance(
+                ThingManager().add_lazy_thing("fake_heavy_thing:HeavyThing"), LazyThing)
+
+
+
+class TestThingManagerRegistry(unittest.TestCase):
+    def _make_thing(self, name):
+        thing = Thing(name, "测试设备")
+        thing.add_method(
+            "Echo", "返回参数",
+            [Parameter("text", "内容", ValueType.STRING, True)],
+            lambda params: params["text"].get_value()
+        )
+        return thing
+
+    def test_invoke_by_name(self):
+        manager = ThingManager()
+        for i in range(100):
+            manager.add_thing(self._make_thing(f"T{i}"))
+        result = manager.invoke(
+            {"name": "T99", "method": "Echo", "parameters": {"text": "hi"}}
+        )
+        self.assertEqual(result, "hi")
+        with self.assertRaises(ValueError):
+            manager.invoke({"name": "missing", "method": "Echo"})
+
+    def test_descriptor_cache_invalidated_on_add(self):
+        manager = ThingManager()
+        manager.add_thing(self._make_thing("A"))
+        first = manager.get_descriptors_json()
+        self.assertIs(first, manager.get_descriptors_json())
+        self.assertEqual(manager.get_descriptors_bytes(), first.encode("utf-8"))
+
+        manager.add_thing(self._make_thing("B"))
+        self.assertIn('"B"', manager.get_descriptors_json())
+
+    def test_changed_states_only(self):
+        manager = ThingManager()
+        values = {"A": 0, "B": 0}
+        getter_calls = []
+        for name in values:
+            thing = Thing(name, "测试设备")
+            thing.add_property("value", "数值", lambda n=name: values[n])
+            thing.add_property("label", "标签", lambda: "fixed")
+            thing.properties["value"].getter = (
+                lambda n=name: getter_calls.append(n) or values[n]
+            )
+            manager.add_thing(thing)
+
+        self.assertEqual(len(json.loads(manager.get_changed_states_json())), 2)
+        self.assertIsNone(manager.get_changed_states_json())
+
+        values["A"] = 5
+        getter_calls.clear()
+        changes = json.loads(manager.get_changed_states_json(["A"]))
+        self.assertEqual(changes, [{"name": "A", "state": {"value": 5}}])
+        self.assertEqual(getter_calls, ["A"])
+
+        manager.reset_states()
+        self.assertEqual(len(json.loads(manager.get_changed_states_json())), 2)
+
+    def test_invoke_does_not_mutate_parameters(self):
+        thing = self._make_thing("A")
+        thing.invoke({"method": "Echo", "parameters": {"text": "hi"}})
+        self.assertIsNone(thing.methods["Echo"].parameters["text"].get_value())
+        # 上一次调用的取值不能满足本次的必需参数
+        with self.assertRaises(ValueError):
+            thing.invoke({"method": "Echo", "parameters": {}})
+
+
+
+class TestProperty(unittest.TestCase):
+    def test_explicit_type_skips_getter(self):
+        calls = []
+        prop = Property("value", "数值", lambda: calls.append(1) or 1,
+                        ValueType.NUMBER)
+        self.assertEqual(calls, [])
+        self.assertEqual(prop.get_descriptor_json()["type"], ValueType.NUMBER)
+
+    def test_ttl_cache(self):
+        calls = []
+        prop = Property("value", "数值", lambda: calls.append(1) or len(calls),
+                        ValueType.NUMBER, ttl=60)
+        self.assertEqual(prop.get_state_value(), 1)
+        self.assertEqual(prop.get_state_value(), 1)
+        prop.invalidate()
+        self.assertEqual(prop.get_state_value(), 2)
+        self.assertEqual(prop.get_stats()["calls"], 2)
+
+    def test_slow_getter_served_from_cache(self):
+        def slow():
+            time.sleep(0.06)
+            return 7
+
+        prop = Property("value", "数值", slow, ValueType.NUMBER)
+        self.assertEqual(prop.get_state_value(), 7)
+        self.assertTrue(prop.slow)
+
+        start = time.perf_counter()
+        self.assertEqual(prop.get_state_value(), 7)
+        self.assertLess(time.perf_counter() - start, 0.03)
+
+
+if __name__ == "__main__":
+    unittest.main()
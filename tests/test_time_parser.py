@@ -0,0 +1,85 @@
+import unittest
+from datetime import datetime
+
+from src.utils.time_parser import format_duration, parse_number, parse_reminder
+
+# 2026-10-19 是星期一
+NOW = datetime(2026, 10, 19, 14, 0, 0)
+
+DAY = 86400
+WEEK = 7 * DAY
+
+# (命令, 到期时间, 重复间隔, 提醒内容, 描述)
+CASES = [
+    # 相对时间
+    ("3分钟后提醒我起床", datetime(2026, 10, 19, 14, 3), 0, "起床", "3分钟后"),
+    ("提醒我1小时30分钟后喝水", datetime(2026, 10, 19, 15, 30), 0, "喝水", "1小时30分钟后"),
+    ("一个半小时后提醒我关火", datetime(2026, 10, 19, 15, 30), 0, "关火", "1小时30分钟后"),
+    ("半小时后叫我", datetime(2026, 10, 19, 14, 30), 0, "", "30分钟后"),
+    ("过两个小时提醒我收衣服", datetime(2026, 10, 19, 16, 0), 0, "收衣服", "2小时后"),
+    ("10s后提醒我", datetime(2026, 10, 19, 14, 0, 10), 0, "", "10秒后"),
+    ("5 min后记得拿快递", datetime(2026, 10, 19, 14, 5), 0, "拿快递", "5分钟后"),
+    ("两天后提醒我还书", datetime(2026, 10, 21, 14, 0), 0, "还书", "2天后"),
+    ("10 提醒我起床", datetime(2026, 10, 19, 14, 0, 10), 0, "起床", "10秒后"),
+    # 绝对时间
+    ("明天早上8点提醒我开会", datetime(2026, 10, 20, 8, 0), 0, "开会", "明天08:00"),
+    ("提醒我明晚8点半看球赛", datetime(2026, 10, 20, 20, 30), 0, "看球赛", "明天20:30"),
+    ("今晚十点一刻提醒我睡觉", datetime(2026, 10, 19, 22, 15), 0, "睡觉", "今天22:15"),
+    ("20:30提醒我看新闻", datetime(2026, 10, 19, 20, 30), 0, "看新闻", "今天20:30"),
+    ("下午4点提醒我开会", datetime(2026, 10, 19, 16, 0), 0, "开会", "今天16:00"),
+    ("3点提醒我接孩子", datetime(2026, 10, 19, 15, 0), 0, "接孩子", "今天15:00"),
+    ("早上7点叫我", datetime(2026, 10, 20, 7, 0), 0, "", "明天07:00"),
+    ("后天中午12点提醒我吃饭", datetime(2026, 10, 21, 12, 0), 0, "吃饭", "后天12:00"),
+    ("下周三下午3点三刻提醒我交报告", datetime(2026, 10, 28, 15, 45), 0, "交报告", "10月28日15:45"),
+    ("周五提醒我买菜", datetime(2026, 10, 23, 9, 0), 0, "买菜", "10月23日09:00"),
+    ("明天提醒我", datetime(2026, 10, 20, 9, 0), 0, "", "明天09:00"),
+    ("今晚12点提醒我关灯", datetime(2026, 10, 20, 0, 0), 0, "关灯", "明天00:00"),
+    ("晚上12点提醒我关灯", datetime(2026, 10, 20, 0, 0), 0, "关灯", "明天00:00"),
+    ("凌晨12点提醒我备份", datetime(2026, 10, 20, 0, 0), 0, "备份", "明天00:00"),
+    ("明天夜里12点提醒我抢票", datetime(2026, 10, 21, 0, 0), 0, "抢票", "后天00:00"),
+    # 引导词之后的时间词属于提醒内容
+    ("10分钟后提醒我给妈妈打电话说明天回家", datetime(2026, 10, 19, 14, 10), 0,
+     "给妈妈打电话说明天回家", "10分钟后"),
+    ("半小时后提醒我看周一的报告", datetime(2026, 10, 19, 14, 30), 0, "看周一的报告", "30分钟后"),
+    ("10分钟后提醒我每天吃药", datetime(2026, 10, 19, 14, 10), 0, "每天吃药", "10分钟后"),
+    # 重复提醒
+    ("每天8点提醒我吃药", datetime(2026, 10, 20, 8, 0), DAY, "吃药", "每天08:00"),
+    ("每晚9点提醒我洗漱", datetime(2026, 10, 19, 21, 0), DAY, "洗漱", "每天21:00"),
+    ("每周一9点提醒我写周报", datetime(2026, 10, 26, 9, 0), WEEK, "写周报", "每周一09:00"),
+    ("每隔30分钟提醒我站起来", datetime(2026, 10, 19, 14, 30), 1800, "站起来", "每30分钟"),
+    ("每小时提醒我喝水", datetime(2026, 10, 19, 15, 0), 3600, "喝水", "每1小时"),
+]
+
+
+class TestParseReminder(unittest.TestCase):
+    def test_table(self):
+        for query, due, repeat, message, description in CASES:
+            with self.subTest(query=query):
+                parsed = parse_reminder(query, now=NOW)
+                self.assertIsNotNone(parsed)
+                self.assertEqual(parsed.due, due)
+                self.assertEqual(parsed.delay, (due - NOW).total_seconds())
+                self.assertEqual(parsed.repeat_interval, repeat)
+                self.assertEqual(parsed.message, message)
+                self.assertEqual(parsed.description, description)
+
+    def test_no_time_expression(self):
+        for query in ("提醒我吃饭", "提醒我吃5mg药", "买3个苹果", "25点提醒我"):
+            with self.subTest(query=query):
+                self.assertIsNone(parse_reminder(query, now=NOW))
+
+    def test_default_unit_for_bare_numbers(self):
+        parsed = parse_reminder("倒计时60并提醒我泡面", now=NOW, default_unit=1)
+        self.assertEqual(parsed.delay, 60)
+        self.assertEqual(parsed.message, "泡面")
+
+    def test_numbers_and_durations(self):
+        for text, value in (("8", 8), ("十", 10), ("十二", 12), ("二十", 20),
+                            ("两", 2), ("一百零五", 105)):
+            with self.subTest(text=text):
+                self.assertEqual(parse_number(text), value)
+        self.assertEqual(format_duration(5430), "1小时30分钟30秒")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import time
+import unittest
+
+from src.utils.ttl_cache import PersistentTTLCache
+
+
+class TestPersistentTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "cache.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_persist_and_reload(self):
+        cache = PersistentTTLCache(self.path, ttl=60)
+        cache.set("晴天", {"song_id": "123", "duration": 269})
+        cache.set("lyrics", [[0.5, "第一句"]])
+        cache.flush()
+
+        reloaded = PersistentTTLCache(self.path, ttl=60)
+        self.assertEqual(reloaded.get("晴天"), {"song_id": "123", "duration": 269})
+        self.assertEqual(reloaded.get("lyrics"), [[0.5, "第一句"]])
+        self.assertIsNone(reloaded.get("missing"))
+
+    def test_expired_entries_are_dropped(self):
+        cache = PersistentTTLCache(self.path, ttl=60)
+        cache.set("short", "value", ttl=0.05)
+        cache.set("long", "value")
+        cache.flush()
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("short"))
+        self.assertEqual(PersistentTTLCache(self.path, ttl=60).get("long"), "value")
+        self.assertEqual(len(PersistentTTLCache(self.path, ttl=60)), 1)
+
+    def test_evicts_least_recently_used_beyond_max_entries(self):
+        cache = PersistentTTLCache(self.path, ttl=60, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        cache.delete("a")
+        cache.flush()
+        self.assertIsNone(PersistentTTLCache(self.path, ttl=60).get("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
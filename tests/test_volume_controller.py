@@ -0,0 +1,72 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from src.utils.volume_controller import VolumeController
+
+
+def _fake_init_linux(self):
+    self.linux_tool = "pactl"
+
+
+class TestVolumeController(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch("platform.system", return_value="Linux"),
+            mock.patch.object(VolumeController, "_init_linux", _fake_init_linux),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.applied = []
+        self.done = threading.Event()
+
+        def slow_apply(controller, volume):
+            time.sleep(0.05)
+            self.applied.append(volume)
+            if volume == 99:
+                self.done.set()
+
+        patch = mock.patch.object(VolumeController, "_apply_volume", slow_apply)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_writes_are_coalesced(self):
+        controller = VolumeController()
+        start = time.perf_counter()
+        for volume in range(50, 100):
+            controller.set_volume(volume)
+        # 设置音量不阻塞调用方
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertTrue(self.done.wait(2))
+        self.assertEqual(self.applied[-1], 99)
+        self.assertLess(len(self.applied), 5)
+
+    def test_cached_read_after_set(self):
+        controller = VolumeController()
+        controller._backend = object()
+        controller.set_volume(30)
+        self.assertEqual(controller.get_volume(), 30)
+        controller.set_volume(150)
+        self.assertEqual(controller.get_volume(), 100)
+
+
+    def test_pending_write_is_read_back_without_backend(self):
+        # Windows/macOS 没有常驻后端，写入完成前读到的也是刚设置的音量
+        controller = VolumeController()
+        with mock.patch.object(VolumeController, "_get_linux_volume", return_value=70) as query:
+            for volume in range(50, 100):
+                controller.set_volume(volume)
+                self.assertEqual(controller.get_volume(), volume)
+            query.assert_not_called()
+            self.assertTrue(self.done.wait(2))
+            deadline = time.perf_counter() + 1
+            while controller._pending_volume is not None and time.perf_counter() < deadline:
+                time.sleep(0.001)
+            # 写入完成后重新读取系统音量
+            self.assertEqual(controller.get_volume(), 70)
+
+
+if __name__ == "__main__":
+    unittest.main()